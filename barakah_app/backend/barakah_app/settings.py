@@ -14,6 +14,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # Initialize environment variables
 env = environ.Env()
@@ -27,6 +28,24 @@ MIDTRANS_MERCHANT_ID = env('MIDTRANS_MERCHANT_ID')
 MIDTRANS_CLIENT_KEY = env('MIDTRANS_CLIENT_KEY')
 MIDTRANS_SERVER_KEY = env('MIDTRANS_SERVER_KEY')
 MIDTRANS_SANDBOX = env('MIDTRANS_SANDBOX', cast=bool)
+
+# Midtrans HTTP client (see payments/gateway.py)
+# Point both base URLs at `manage.py fake_midtrans` to run against a local fake server
+MIDTRANS_SNAP_BASE_URL = env('MIDTRANS_SNAP_BASE_URL', default='')
+MIDTRANS_API_BASE_URL = env('MIDTRANS_API_BASE_URL', default='')
+MIDTRANS_CONNECT_TIMEOUT = env.float('MIDTRANS_CONNECT_TIMEOUT', default=3.05)  # seconds
+MIDTRANS_READ_TIMEOUT = env.float('MIDTRANS_READ_TIMEOUT', default=10)  # seconds
+MIDTRANS_MAX_RETRIES = env.int('MIDTRANS_MAX_RETRIES', default=2)
+MIDTRANS_RETRY_BACKOFF = env.float('MIDTRANS_RETRY_BACKOFF', default=0.3)  # seconds, doubled per retry
+MIDTRANS_POOL_SIZE = env.int('MIDTRANS_POOL_SIZE', default=10)  # keep-alive connections per host
+MIDTRANS_CIRCUIT_FAILURES = env.int('MIDTRANS_CIRCUIT_FAILURES', default=5)  # consecutive failures to open
+MIDTRANS_CIRCUIT_RESET = env.float('MIDTRANS_CIRCUIT_RESET', default=30)  # seconds before a trial call
+MIDTRANS_SNAP_EXPIRY_MINUTES = env.int('MIDTRANS_SNAP_EXPIRY_MINUTES', default=60 * 24)  # Snap token lifetime
+
+# Payment status polling (see payments/status.py)
+PAYMENT_STATUS_CACHE_TTL = env.int('PAYMENT_STATUS_CACHE_TTL', default=10)  # seconds between remote checks per order
+PAYMENT_STATUS_WAIT = 5  # seconds a coalesced poll waits for the in-flight remote check
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -86,6 +105,7 @@ INSTALLED_APPS = [
     'campaigns',
     'donations',
     'payments',
+    'transactions',
 
     'products',
     'wishlists',
@@ -96,6 +116,11 @@ INSTALLED_APPS = [
     'reviews',
     
     'courses',  
+
+    'search',
+    'caching',
+    'home',
+    'reports',
         
 ]
 
@@ -145,6 +170,12 @@ if DEBUG:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Take the write lock when a transaction starts, so concurrent checkouts
+            # queue up instead of failing with "database is locked" on upgrade
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+            # On disk rather than shared-cache memory, so the concurrency tests'
+            # threads wait on the file lock instead of failing with "table is locked"
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
         }
     }
 else:
@@ -159,6 +190,38 @@ else:
         }
     }    
 
+# Cache
+# Any django-environ cache URL, e.g. locmemcache://, filecache:///var/tmp/barakah_cache
+# or rediscache://127.0.0.1:6379/1
+#
+# Response caches are invalidated by bumping a version key (caching/responses.py)
+# and payment status polls are coalesced through it (payments/status.py). Both
+# only work if every process shares the cache: gunicorn workers, admin saves and
+# the process_payment_notifications / reconcile_payments / release_expired_reservations
+# / build_related_products commands. locmem is per process, so outside DEBUG
+# CACHE_URL must point at Redis, memcached or a file cache on a shared disk.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+if not DEBUG and CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+    raise ImproperlyConfigured(
+        'CACHE_URL must name a cache shared by all processes (Redis, memcached or a file cache) '
+        'when DEBUG is off; a process-local cache leaves other workers serving stale data'
+    )
+
+# Public campaign/product/course responses, invalidated on change (see caching/)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=60 * 15)
+CART_CACHE_TIMEOUT = env.int('CART_CACHE_TIMEOUT', default=60 * 5)  # Per-user cart payload
+COUPON_INDEX_TTL = env.int('COUPON_INDEX_TTL', default=60)  # Seconds before a worker reloads its coupon index
+
+# Stock held for an unpaid order before release_expired_reservations gives it back
+STOCK_RESERVATION_MINUTES = env.int('STOCK_RESERVATION_MINUTES', default=60 * 24)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -224,6 +287,7 @@ CORS_ALLOW_HEADERS = [
     'authorization',
     'content-type',
     'dnt',
+    'idempotency-key',  # Midtrans donation checkout retries (payments/snap.py)
     'origin',
     'user-agent',
     'x-csrftoken',
@@ -263,7 +327,14 @@ else:
     MEDIA_ROOT = '/var/www/barakah-economy/barakah_app/backend/media/'
 
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB limit
+# Anything larger is streamed to a temporary file instead of held in memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(2.5 * 1024 * 1024)
+
+# Proof-of-transfer uploads (see donations/uploads.py)
+PROOF_UPLOAD_MAX_SIZE = 10 * 1024 * 1024  # 10MB limit
+PROOF_IMAGE_MAX_SIDE = 1600  # px, longest side after re-encoding
+PROOF_IMAGE_QUALITY = 80
+PROOF_THUMBNAIL_SIDE = 320  # px, admin review thumbnail
 
 CKEDITOR_UPLOAD_PATH = "uploads/"
 CKEDITOR_IMAGE_BACKEND = "pillow"
@@ -32,6 +32,10 @@ urlpatterns = [
     path('api/shippings/', include('shippings.urls')),
     path('api/reviews/', include('reviews.urls')),
 
+    path('api/cache/', include('caching.urls')),
+    path('api/home/', include('home.urls')),
+    path('api/reports/', include('reports.urls')),
+
     path('ckeditor/', include('ckeditor_uploader.urls')),
     path('ckeditor/upload/', ckeditor_views.upload, name='ckeditor_upload'),
     
@@ -0,0 +1,9 @@
+# caching/apps.py
+from django.apps import AppConfig
+
+class CachingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'caching'
+
+    def ready(self):
+        import caching.signals  # Invalidate cached responses when their data changes
@@ -0,0 +1,118 @@
+# caching/responses.py
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+# Every cached endpoint belongs to one namespace; bumping the namespace
+# version makes all of its entries unreachable at once.
+NAMESPACES = ('campaigns', 'products', 'courses', 'home')
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+def _version_key(namespace):
+    return f'response-cache:{namespace}:version'
+
+def _stats_key(namespace, outcome):
+    return f'response-cache:{namespace}:{outcome}'
+
+def _incr(key):
+    cache = get_cache()
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+        return 1
+
+def get_version(namespace):
+    return get_cache().get_or_set(_version_key(namespace), 1, timeout=None)
+
+def invalidate(*namespaces):
+    """Drop every cached response of the given namespaces"""
+    for namespace in namespaces:
+        _incr(_version_key(namespace))
+
+def response_key(namespace, request):
+    """Key on host, path and the sorted query string, under the current version"""
+    query = urlencode(sorted(
+        (name, value) for name, values in request.query_params.lists() for value in values
+    ))
+    return (
+        f'response-cache:{namespace}:v{get_version(namespace)}:'
+        f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    )
+
+def get_stats():
+    """Hit/miss counters per namespace"""
+    cache = get_cache()
+    stats = {}
+    for namespace in NAMESPACES:
+        keys = [_stats_key(namespace, 'hits'), _stats_key(namespace, 'misses')]
+        values = cache.get_many(keys)
+        stats[namespace] = {
+            'hits': values.get(keys[0], 0),
+            'misses': values.get(keys[1], 0),
+            'version': get_version(namespace),
+        }
+    return stats
+
+def compute_etag(data):
+    return '"%s"' % hashlib.md5(JSONRenderer().render(data)).hexdigest()
+
+def _not_modified(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    return bool(if_none_match) and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*')
+
+def _finish(request, data, etag, outcome):
+    """Build the cached/fresh response, answering conditional GETs with 304"""
+    if _not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    response['X-Cache'] = outcome
+    # Let browsers keep the body but revalidate it with If-None-Match
+    patch_cache_control(response, no_cache=True)
+    return response
+
+def cache_response(namespace, timeout=None):
+    """
+    Cache the data of successful GET responses of a DRF view method.
+    Entries are keyed by query params, carry an ETag for conditional GET,
+    and are dropped by invalidate(namespace).
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_method(self, request, *args, **kwargs)
+
+            cache = get_cache()
+            key = response_key(namespace, request)
+            cached = cache.get(key)
+            if cached is not None:
+                _incr(_stats_key(namespace, 'hits'))
+                return _finish(request, cached['data'], cached['etag'], 'HIT')
+
+            _incr(_stats_key(namespace, 'misses'))
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+            etag = compute_etag(response.data)
+            cache.set(
+                key, {'data': response.data, 'etag': etag},
+                timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT,
+            )
+            return _finish(request, response.data, etag, 'MISS')
+        return wrapper
+    return decorator
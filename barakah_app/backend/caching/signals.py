@@ -0,0 +1,58 @@
+# caching/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from campaigns.models import Campaign, Update
+from carts.models import Cart
+from carts.summary import forget_cart
+from products.models import Product
+from reviews.ratings import product_ratings_changed
+from courses.models import Course
+from donations.models import Donation
+from donations.totals import campaign_totals_changed, COUNTED_STATUS
+from .responses import invalidate
+
+def invalidate_on_commit(*namespaces):
+    # Invalidating before commit would let a concurrent request re-cache old data
+    transaction.on_commit(lambda: invalidate(*namespaces))
+
+@receiver(post_save, sender=Campaign)
+@receiver(post_delete, sender=Campaign)
+def invalidate_campaigns(sender, **kwargs):
+    invalidate_on_commit('campaigns', 'home')
+
+@receiver(post_save, sender=Update)
+@receiver(post_delete, sender=Update)
+def invalidate_campaign_updates(sender, **kwargs):
+    invalidate_on_commit('campaigns')
+
+@receiver(campaign_totals_changed)
+def invalidate_campaign_totals(sender, **kwargs):
+    invalidate_on_commit('campaigns', 'home')
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def invalidate_verified_donation(sender, instance, **kwargs):
+    # Detail pages embed verified donors; other statuses are never shown
+    if instance.payment_status == COUNTED_STATUS:
+        invalidate_on_commit('campaigns')
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_products(sender, **kwargs):
+    # Carts embed price, discount and stock too
+    invalidate_on_commit('products', 'home', 'carts')
+
+@receiver(product_ratings_changed)
+def invalidate_product_ratings(sender, **kwargs):
+    invalidate_on_commit('products', 'home')
+
+@receiver(post_save, sender=Cart)
+@receiver(post_delete, sender=Cart)
+def invalidate_cart(sender, instance, **kwargs):
+    transaction.on_commit(lambda: forget_cart(instance.user_id))
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_courses(sender, **kwargs):
+    invalidate_on_commit('courses', 'home')
@@ -3,6 +3,16 @@ from rest_framework import serializers
 from .models import Campaign, Update
 from donations.models import Donation
 
+# Nested collections that are only rendered in detail mode or via ?expand=
+EXPANDABLE_FIELDS = ('donations', 'updates')
+
+def parse_expand(request):
+    """Read ?expand=donations,updates into a set of known expandable fields"""
+    if request is None:
+        return set()
+    requested = request.query_params.get('expand', '')
+    return {name.strip() for name in requested.split(',')} & set(EXPANDABLE_FIELDS)
+
 class DonationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Donation
@@ -13,14 +23,58 @@ class UpdateSerializer(serializers.ModelSerializer):
         model = Update
         fields = ['id', 'title', 'description', 'created_at']   
 
-class CampaignSerializer(serializers.ModelSerializer):
+class ExpandableFieldsMixin:
+    """Drop the nested collections that were not asked for via the expand kwarg"""
+    default_expand = ()
+
+    def __init__(self, *args, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = self.default_expand if expand is None else expand
+        for name in EXPANDABLE_FIELDS:
+            if name not in expand:
+                self.fields.pop(name, None)
+
+class CampaignSummarySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    """Compact campaign card for list views: progress and deadline, no nested rows"""
     donations = DonationSerializer(many=True, read_only=True)
     updates = UpdateSerializer(many=True, read_only=True)
+    progress_percentage = serializers.SerializerMethodField()
+    has_unlimited_deadline = serializers.SerializerMethodField()
+    is_expired = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Campaign
+        fields = [
+            'id', 'title', 'slug', 'category', 'thumbnail', 'target_amount',
+            'current_amount', 'progress_percentage', 'deadline',
+            'has_unlimited_deadline', 'is_expired', 'is_featured', 'is_active',
+            'created_at', 'donations', 'updates',
+        ]
+
+    def get_progress_percentage(self, obj):
+        return round(float(obj.get_progress_percentage()), 2)
+
+    def get_has_unlimited_deadline(self, obj):
+        return obj.deadline is None
+
+    def get_is_expired(self, obj):
+        return obj.is_expired()
+
+class CampaignSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    """Full campaign detail; embeds donations and updates unless told otherwise"""
+    default_expand = EXPANDABLE_FIELDS
+
+    donations = DonationSerializer(many=True, read_only=True)
+    updates = UpdateSerializer(many=True, read_only=True)
+    progress_percentage = serializers.SerializerMethodField()
     has_unlimited_deadline = serializers.SerializerMethodField()
 
     class Meta:
         model = Campaign
         fields = '__all__'
 
+    def get_progress_percentage(self, obj):
+        return round(float(obj.get_progress_percentage()), 2)
+
     def get_has_unlimited_deadline(self, obj):
-        return obj.deadline is None
\ No newline at end of file
+        return obj.deadline is None
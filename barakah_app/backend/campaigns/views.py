@@ -3,27 +3,66 @@ from rest_framework import viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
-from .models import Campaign
-from .serializers import CampaignSerializer
+from search.mixins import RankedSearchMixin
+from caching.responses import cache_response
+from donations.models import Donation
+from .models import Campaign, Update
+from .serializers import (
+    CampaignSerializer, CampaignSummarySerializer, EXPANDABLE_FIELDS, parse_expand
+)
+
+def with_nested_collections(queryset, expand):
+    """Prefetch only the nested collections that will be rendered (one query each)"""
+    lookups = []
+    if 'donations' in expand:
+        lookups.append(Prefetch(
+            'donations',
+            queryset=Donation.objects.filter(payment_status='verified').only(
+                'id', 'campaign_id', 'donor_name', 'amount', 'created_at'
+            ),
+        ))
+    if 'updates' in expand:
+        lookups.append(Prefetch('updates', queryset=Update.objects.order_by('-created_at')))
+    return queryset.prefetch_related(*lookups) if lookups else queryset
     
-class CampaignViewSet(viewsets.ModelViewSet):
+class CampaignViewSet(RankedSearchMixin, viewsets.ModelViewSet):
+    search_kind = 'campaign'
     queryset = Campaign.objects.filter(is_active=True)
     serializer_class = CampaignSerializer
     
+    def get_expand(self):
+        if self.action == 'list':
+            return parse_expand(self.request)
+        return EXPANDABLE_FIELDS
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CampaignSummarySerializer
+        return CampaignSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('expand', self.get_expand())
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         queryset = Campaign.objects.filter(is_active=True)
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search)
-            )
-        return queryset
+        return with_nested_collections(queryset, self.get_expand())
+
+    @cache_response('campaigns')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response('campaigns')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 class CampaignDetailView(APIView):
+    @cache_response('campaigns')
     def get(self, request, slug):
-        campaign = get_object_or_404(Campaign, slug=slug)
+        campaign = get_object_or_404(
+            with_nested_collections(Campaign.objects.all(), EXPANDABLE_FIELDS), slug=slug
+        )
         serializer = CampaignSerializer(campaign)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,41 @@
+# carts/batch.py
+from django.db import transaction
+from products.models import Product
+from .models import Cart
+from .summary import forget_cart
+
+class UnknownProducts(Exception):
+    def __init__(self, product_ids):
+        super().__init__(f"Unknown or inactive products: {', '.join(map(str, product_ids))}")
+        self.product_ids = product_ids
+
+def apply_cart_operations(user, operations):
+    """
+    Set the quantity of every {product_id, quantity} operation in one
+    transaction: quantity 0 removes the product, anything else is upserted.
+    Later operations on the same product win. Costs one product lookup, one
+    bulk upsert and the DELETE, however many operations there are.
+    """
+    quantities = {}
+    for operation in operations:
+        quantities[operation['product_id']] = operation['quantity']
+
+    upserts = {product_id: quantity for product_id, quantity in quantities.items() if quantity > 0}
+    removals = [product_id for product_id, quantity in quantities.items() if quantity == 0]
+
+    with transaction.atomic():
+        if upserts:
+            found = set(Product.objects.filter(pk__in=upserts, is_active=True).values_list('pk', flat=True))
+            missing = sorted(set(upserts) - found)
+            if missing:
+                raise UnknownProducts(missing)
+            Cart.objects.bulk_create(
+                [Cart(user=user, product_id=product_id, quantity=quantity) for product_id, quantity in upserts.items()],
+                update_conflicts=True,
+                unique_fields=['user', 'product'],
+                update_fields=['quantity', 'updated_at'],
+            )
+        if removals:
+            Cart.objects.filter(user=user, product_id__in=removals).delete()
+        # bulk_create sends no post_save, so drop the cached cart here
+        transaction.on_commit(lambda: forget_cart(user.pk))
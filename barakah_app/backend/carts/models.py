@@ -10,8 +10,15 @@ class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            # One row per product; the batch endpoint upserts on it
+            models.UniqueConstraint(fields=['user', 'product'], name='cart_user_product_unique'),
+        ]
+
     def __str__(self):
         return f"{self.user.username}'s cart - {self.product.title}"
 
     def total_price(self):
-        return self.product.price * self.quantity
\ No newline at end of file
+        # Same rule as the cart summary (carts/summary.py): discount per unit, never below zero
+        return (self.product.price - min(self.product.discount, self.product.price)) * self.quantity
\ No newline at end of file
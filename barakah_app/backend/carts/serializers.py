@@ -1,11 +1,34 @@
 # carts/serializers.py
 from rest_framework import serializers
+from products.models import Product
 from .models import Cart
-from products.serializers import ProductSerializer  # Assuming you have a Product serializer
+from .summary import CART_PRODUCT_FIELDS, MONEY
+
+class CartProductSerializer(serializers.ModelSerializer):
+    """Slim product embedded in cart rows"""
+    class Meta:
+        model = Product
+        fields = CART_PRODUCT_FIELDS
 
 class CartSerializer(serializers.ModelSerializer):
-    product = ProductSerializer(read_only=True)
+    product = CartProductSerializer(read_only=True)
+    unit_price = serializers.DecimalField(max_digits=MONEY.max_digits, decimal_places=MONEY.decimal_places, read_only=True)
+    line_total = serializers.DecimalField(max_digits=MONEY.max_digits, decimal_places=MONEY.decimal_places, read_only=True)
 
     class Meta:
         model = Cart
-        fields = ['id', 'product', 'quantity', 'created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'product', 'quantity', 'unit_price', 'line_total', 'created_at', 'updated_at']
+
+class CartSummarySerializer(serializers.Serializer):
+    item_count = serializers.IntegerField()
+    units = serializers.IntegerField()
+    subtotal = serializers.DecimalField(max_digits=MONEY.max_digits, decimal_places=MONEY.decimal_places)
+    discount = serializers.DecimalField(max_digits=MONEY.max_digits, decimal_places=MONEY.decimal_places)
+    grand_total = serializers.DecimalField(max_digits=MONEY.max_digits, decimal_places=MONEY.decimal_places)
+
+class CartOperationSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=0)  # 0 removes the product
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=200)
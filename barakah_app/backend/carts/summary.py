@@ -0,0 +1,63 @@
+# carts/summary.py
+from decimal import Decimal
+from django.conf import settings
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce, Least
+from caching.responses import get_cache, get_version
+from .models import Cart
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+# Only what the cart page shows; the full product comes from the product endpoints
+CART_PRODUCT_FIELDS = ('id', 'title', 'slug', 'thumbnail', 'price', 'discount', 'unit', 'stock', 'is_active')
+
+def unit_discount():
+    # A discount never takes a product below zero
+    return Least(F('product__discount'), F('product__price'))
+
+def unit_price():
+    return ExpressionWrapper(F('product__price') - unit_discount(), output_field=MONEY)
+
+def line_total():
+    return ExpressionWrapper(unit_price() * F('quantity'), output_field=MONEY)
+
+def money_sum(expression):
+    return Coalesce(Sum(expression, output_field=MONEY), Value(Decimal('0')), output_field=MONEY)
+
+def cart_items(user):
+    """The user's cart rows with their products joined in and line totals computed by the DB"""
+    return (
+        Cart.objects.filter(user=user)
+        .select_related('product')
+        .only('id', 'quantity', 'created_at', 'updated_at', 'product_id',
+              *(f'product__{field}' for field in CART_PRODUCT_FIELDS))
+        .annotate(unit_price=unit_price(), line_total=line_total())
+        .order_by('pk')
+    )
+
+def cart_totals(user):
+    """Subtotal, discount and grand total of the cart in one aggregate query"""
+    return Cart.objects.filter(user=user).aggregate(
+        item_count=Count('pk'),
+        units=Coalesce(Sum('quantity'), 0),
+        subtotal=money_sum(F('product__price') * F('quantity')),
+        discount=money_sum(unit_discount() * F('quantity')),
+        grand_total=money_sum(line_total()),
+    )
+
+def cart_key(user_id):
+    # Product changes bump the 'carts' version and orphan every user's entry at once
+    return f"carts:{user_id}:v{get_version('carts')}"
+
+def cached_cart(user, build):
+    """Cart payload of the user, rebuilt with build(user) when missing"""
+    cache = get_cache()
+    key = cart_key(user.pk)
+    data = cache.get(key)
+    if data is None:
+        data = build(user)
+        cache.set(key, data, settings.CART_CACHE_TIMEOUT)
+    return data
+
+def forget_cart(user_id):
+    get_cache().delete(cart_key(user_id))
@@ -1,7 +1,8 @@
 # carts/urls.py
 from django.urls import path
-from .views import CartView
+from .views import CartBatchView, CartView
 
 urlpatterns = [
     path('cart/', CartView.as_view(), name='cart'),
+    path('cart/batch/', CartBatchView.as_view(), name='cart-batch'),
 ]
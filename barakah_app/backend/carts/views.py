@@ -5,17 +5,24 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import Cart
 from products.models import Product
-from .serializers import CartSerializer
+from .batch import UnknownProducts, apply_cart_operations
+from .serializers import CartBatchSerializer, CartSerializer, CartSummarySerializer
+from .summary import cached_cart, cart_items, cart_totals
 from rest_framework.permissions import IsAuthenticated
 
 class CartView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        cart_items = Cart.objects.filter(user=user)
-        serializer = CartSerializer(cart_items, many=True)
-        return Response(serializer.data)
+        # Served from the per-user cache, which cart and product changes invalidate
+        return Response(cached_cart(request.user, self.build_cart))
+
+    @staticmethod
+    def build_cart(user):
+        return {
+            'items': CartSerializer(cart_items(user), many=True).data,
+            'summary': CartSummarySerializer(cart_totals(user)).data,
+        }
 
     def post(self, request):
         user = request.user
@@ -28,7 +35,7 @@ class CartView(APIView):
             cart_item.quantity += int(quantity)
             cart_item.save()
 
-        serializer = CartSerializer(cart_item)
+        serializer = CartSerializer(cart_items(user).get(pk=cart_item.pk))
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete(self, request):
@@ -36,4 +43,19 @@ class CartView(APIView):
         product_id = request.data.get('product_id')
         cart_item = get_object_or_404(Cart, user=user, product_id=product_id)
         cart_item.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class CartBatchView(APIView):
+    """Apply many quantity changes in one request, e.g. when the cart page syncs"""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = CartBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            apply_cart_operations(request.user, serializer.validated_data['operations'])
+        except UnknownProducts as e:
+            return Response(
+                {'message': str(e), 'product_ids': e.product_ids}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(CartView.build_cart(request.user))
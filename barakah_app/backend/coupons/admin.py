@@ -1,3 +1,24 @@
+# coupons/admin.py
 from django.contrib import admin
+from .models import Coupon, CouponRedemption
 
-# Register your models here.
+@admin.register(Coupon)
+class CouponAdmin(admin.ModelAdmin):
+    list_display = ('code', 'discount', 'valid_from', 'valid_to', 'active', 'uses', 'max_uses', 'max_uses_per_user')
+    readonly_fields = ('uses', )
+    list_filter = ('active', )
+    search_fields = ('code', )
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Never write back a stale uses counter over concurrent redemptions
+            obj.save(update_fields=[field.name for field in obj._meta.concrete_fields if field.name not in ('id', 'uses')])
+        else:
+            obj.save()
+
+@admin.register(CouponRedemption)
+class CouponRedemptionAdmin(admin.ModelAdmin):
+    list_display = ('coupon', 'user', 'order', 'amount', 'created_at')
+    list_filter = ('coupon', )
+    raw_id_fields = ('user', 'order')
+    readonly_fields = ('coupon', 'user', 'order', 'sequence', 'amount', 'created_at')
@@ -0,0 +1,78 @@
+# coupons/engine.py
+import threading
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.utils import timezone
+from .models import Coupon
+
+CouponEntry = namedtuple(
+    'CouponEntry', ['id', 'code', 'discount', 'valid_from', 'valid_to', 'active', 'max_uses_per_user']
+)
+
+class CouponRejected(Exception):
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason  # 'not_found', 'not_started', 'expired', 'inactive', 'exhausted' or 'limit_reached'
+
+def normalize_code(code):
+    return str(code or '').strip().upper()
+
+class CouponIndex:
+    """
+    Process-local map of active coupons by normalized code.
+
+    Rebuilt with one query at most once per ttl seconds, and right after a
+    Coupon changes in this process; other processes catch up within the ttl.
+    Lookups between rebuilds never touch the database.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._coupons = None
+        self._loaded_at = 0.0
+
+    def _snapshot(self):
+        # Read the map once: invalidate() may clear it between two reads
+        coupons, loaded_at = self._coupons, self._loaded_at
+        if coupons is None or time.monotonic() - loaded_at >= self.ttl:
+            return None
+        return coupons
+
+    def get(self, code):
+        coupons = self._snapshot()
+        if coupons is None:
+            coupons = self._reload()
+        return coupons.get(normalize_code(code))
+
+    def _reload(self):
+        with self._lock:
+            coupons = self._snapshot()
+            if coupons is not None:
+                return coupons  # Another thread rebuilt it while we waited
+            # Coupons that start later are loaded too, so they switch on without a rebuild
+            rows = Coupon.objects.filter(active=True, valid_to__gte=timezone.now()).values_list(
+                *CouponEntry._fields
+            )
+            coupons = {normalize_code(row[1]): CouponEntry(*row) for row in rows}
+            self._coupons, self._loaded_at = coupons, time.monotonic()
+            return coupons
+
+    def invalidate(self):
+        with self._lock:
+            self._coupons = None
+
+coupon_index = CouponIndex(settings.COUPON_INDEX_TTL)
+
+def check_coupon(code, now=None):
+    """The CouponEntry for code if it can be used at now, else CouponRejected"""
+    coupon = coupon_index.get(code)
+    if coupon is None:
+        raise CouponRejected('not_found', 'Invalid coupon')
+    now = now or timezone.now()
+    # The window is inclusive at both ends
+    if now < coupon.valid_from:
+        raise CouponRejected('not_started', 'This coupon is not valid yet')
+    if now > coupon.valid_to:
+        raise CouponRejected('expired', 'This coupon has expired')
+    return coupon
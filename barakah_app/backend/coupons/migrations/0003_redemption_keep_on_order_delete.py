@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0002_coupon_limits'),
+        ('orders', '0004_order_user_history_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='couponredemption',
+            name='order',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='coupon_redemption', to='orders.order'),
+        ),
+    ]
@@ -7,6 +7,30 @@ class Coupon(models.Model):
     valid_from = models.DateTimeField()
     valid_to = models.DateTimeField()
     active = models.BooleanField(default=True)
+    max_uses = models.PositiveIntegerField(blank=True, null=True)  # Empty for unlimited
+    max_uses_per_user = models.PositiveIntegerField(blank=True, null=True)  # Empty for unlimited
+    uses = models.PositiveIntegerField(default=0)  # Only changed by conditional UPDATEs (coupons/redemption.py)
 
     def __str__(self):
-        return self.code
\ No newline at end of file
+        return self.code
+
+class CouponRedemption(models.Model):
+    """One use of a coupon, tied to the order it discounted"""
+    coupon = models.ForeignKey(Coupon, on_delete=models.CASCADE, related_name='redemptions')
+    user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='coupon_redemptions')
+    # Deleting an order never hands its use back; only release_redemptions does
+    order = models.OneToOneField(
+        'orders.Order', on_delete=models.SET_NULL, blank=True, null=True, related_name='coupon_redemption'
+    )
+    # Which of the user's max_uses_per_user slots this use took; empty when unlimited
+    sequence = models.PositiveIntegerField(blank=True, null=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)  # Taken off the order total
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['coupon', 'user', 'sequence'], name='coupon_redemption_user_slot'),
+        ]
+
+    def __str__(self):
+        return f"{self.coupon} on order {self.order_id}"
\ No newline at end of file
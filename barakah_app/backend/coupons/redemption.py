@@ -0,0 +1,67 @@
+# coupons/redemption.py
+from collections import Counter
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from .engine import CouponRejected
+from .models import Coupon, CouponRedemption
+
+CENT = Decimal('0.01')
+
+def coupon_discount(coupon, total):
+    """The coupon's percentage of total, rounded to the cent"""
+    return (total * coupon.discount / 100).quantize(CENT)
+
+def redeem_coupon(order, coupon, amount):
+    """
+    Count one use of the coupon (a CouponEntry) for the order; call inside
+    the checkout transaction so a rejection rolls the whole order back.
+
+    The global cap is one conditional UPDATE (uses < max_uses), so parallel
+    checkouts can never take a coupon past it. The per-user cap is the unique
+    (coupon, user, sequence) row: parallel redemptions by one user race for
+    the same free slot and only one insert survives.
+    """
+    taken = Coupon.objects.filter(pk=coupon.id, active=True).filter(
+        Q(max_uses__isnull=True) | Q(uses__lt=F('max_uses'))
+    ).update(uses=F('uses') + 1)
+    if not taken:
+        # Deactivated since check_coupon looked at the index
+        if not Coupon.objects.filter(pk=coupon.id, active=True).exists():
+            raise CouponRejected('inactive', 'This coupon is no longer active')
+        raise CouponRejected('exhausted', 'This coupon has been fully used')
+
+    sequence = None
+    if coupon.max_uses_per_user is not None:
+        used = set(
+            CouponRedemption.objects.filter(coupon_id=coupon.id, user_id=order.user_id)
+            .values_list('sequence', flat=True)
+        )
+        free = [slot for slot in range(1, coupon.max_uses_per_user + 1) if slot not in used]
+        if not free:
+            raise CouponRejected('limit_reached', 'You have already used this coupon')
+        sequence = free[0]
+
+    try:
+        # Savepoint: losing the race must not break the surrounding transaction
+        with transaction.atomic():
+            return CouponRedemption.objects.create(
+                coupon_id=coupon.id, user_id=order.user_id, order=order, sequence=sequence, amount=amount,
+            )
+    except IntegrityError:
+        raise CouponRejected('limit_reached', 'You have already used this coupon')
+
+def release_redemptions(order_ids):
+    """Give the coupon uses of cancelled or deleted orders back; safe to call twice"""
+    with transaction.atomic():
+        redemptions = list(
+            CouponRedemption.objects.select_for_update()
+            .filter(order_id__in=order_ids)
+            .values_list('id', 'coupon_id')
+        )
+        if not redemptions:
+            return 0
+        CouponRedemption.objects.filter(pk__in=[pk for pk, _ in redemptions]).delete()
+        for coupon_id, count in sorted(Counter(coupon_id for _, coupon_id in redemptions).items()):
+            Coupon.objects.filter(pk=coupon_id).update(uses=F('uses') - count)
+    return len(redemptions)
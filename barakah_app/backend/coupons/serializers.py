@@ -5,4 +5,4 @@ from .models import Coupon
 class CouponSerializer(serializers.ModelSerializer):
     class Meta:
         model = Coupon
-        fields = ['code', 'discount', 'valid_from', 'valid_to', 'active']
\ No newline at end of file
+        fields = ['code', 'discount', 'valid_from', 'valid_to', 'active', 'max_uses_per_user']
\ No newline at end of file
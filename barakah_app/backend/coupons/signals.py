@@ -0,0 +1,12 @@
+# coupons/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .engine import coupon_index
+from .models import Coupon
+
+@receiver(post_save, sender=Coupon)
+@receiver(post_delete, sender=Coupon)
+def invalidate_coupon_index(sender, **kwargs):
+    # After commit, so the rebuild cannot read the old row back
+    transaction.on_commit(coupon_index.invalidate)
@@ -1,3 +1,151 @@
-from django.test import TestCase
+# coupons/tests.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from accounts.models import User
+from orders.models import Order
+from .engine import CouponRejected, check_coupon, coupon_index
+from .models import Coupon, CouponRedemption
+from .redemption import redeem_coupon
 
-# Create your tests here.
+ONE_SECOND = timedelta(seconds=1)
+
+class CheckCouponWindowTests(TestCase):
+    """The validity window is inclusive at both ends"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now().replace(microsecond=0)
+        cls.coupon = Coupon.objects.create(
+            code='RAMADAN10', discount=10, valid_from=now + timedelta(days=1), valid_to=now + timedelta(days=2),
+        )
+        Coupon.objects.create(
+            code='RETIRED', discount=10, valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=1),
+            active=False,
+        )
+
+    def setUp(self):
+        # The index is process-wide and only invalidated on commit, which TestCase never reaches
+        coupon_index.invalidate()
+        self.addCleanup(coupon_index.invalidate)
+
+    def assertRejected(self, code, at, reason):
+        with self.assertRaises(CouponRejected) as rejected:
+            check_coupon(code, at)
+        self.assertEqual(rejected.exception.reason, reason)
+
+    def test_valid_from_is_inclusive(self):
+        self.assertEqual(check_coupon('ramadan10', self.coupon.valid_from).id, self.coupon.id)
+
+    def test_one_second_before_valid_from_is_not_started(self):
+        self.assertRejected('ramadan10', self.coupon.valid_from - ONE_SECOND, 'not_started')
+
+    def test_one_second_after_valid_from_is_valid(self):
+        self.assertEqual(check_coupon('ramadan10', self.coupon.valid_from + ONE_SECOND).id, self.coupon.id)
+
+    def test_valid_to_is_inclusive(self):
+        self.assertEqual(check_coupon('ramadan10', self.coupon.valid_to).id, self.coupon.id)
+
+    def test_one_second_before_valid_to_is_valid(self):
+        self.assertEqual(check_coupon('ramadan10', self.coupon.valid_to - ONE_SECOND).id, self.coupon.id)
+
+    def test_one_second_after_valid_to_is_expired(self):
+        self.assertRejected('ramadan10', self.coupon.valid_to + ONE_SECOND, 'expired')
+
+    def test_inactive_code_is_not_found(self):
+        self.assertRejected('retired', timezone.now(), 'not_found')
+
+    def test_unknown_code_is_not_found(self):
+        self.assertRejected('nope', timezone.now(), 'not_found')
+
+    def test_deactivated_coupon_drops_out_after_invalidate(self):
+        within = self.coupon.valid_from + ONE_SECOND
+        check_coupon('ramadan10', within)
+        Coupon.objects.filter(pk=self.coupon.pk).update(active=False)
+        coupon_index.invalidate()
+        self.assertRejected('ramadan10', within, 'not_found')
+
+class RedeemCouponTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.user = User.objects.create(username='buyer', email='buyer@example.com')
+        cls.coupon = Coupon.objects.create(
+            code='RAMADAN10', discount=10, valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=1),
+        )
+
+    def setUp(self):
+        coupon_index.invalidate()
+        self.addCleanup(coupon_index.invalidate)
+
+    def test_coupon_deactivated_after_check_is_inactive(self):
+        coupon = check_coupon('ramadan10')
+        Coupon.objects.filter(pk=coupon.id).update(active=False)
+        order = Order.objects.create(user=self.user, total_price=90000)
+        with self.assertRaises(CouponRejected) as rejected:
+            redeem_coupon(order, coupon, 10000)
+        self.assertEqual(rejected.exception.reason, 'inactive')
+
+    def test_used_up_coupon_is_exhausted(self):
+        Coupon.objects.filter(pk=self.coupon.pk).update(max_uses=1, uses=1)
+        order = Order.objects.create(user=self.user, total_price=90000)
+        with self.assertRaises(CouponRejected) as rejected:
+            redeem_coupon(order, check_coupon('ramadan10'), 10000)
+        self.assertEqual(rejected.exception.reason, 'exhausted')
+
+class ConcurrentRedemptionTests(TransactionTestCase):
+    """Parallel redemptions never take a coupon past its global or per-user limit"""
+    applies = 20
+
+    def setUp(self):
+        now = timezone.now()
+        self.coupon = Coupon.objects.create(
+            code='RAMADAN10', discount=10, valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=1),
+        )
+        coupon_index.invalidate()
+        self.addCleanup(coupon_index.invalidate)
+
+    def redeem_in_parallel(self, users):
+        coupon = check_coupon('ramadan10')
+        orders = [Order.objects.create(user=user, total_price=90000) for user in users]
+        barrier = threading.Barrier(len(orders))
+
+        def redeem(order):
+            try:
+                barrier.wait()  # Every redemption hits the coupon at the same moment
+                with transaction.atomic():
+                    redeem_coupon(order, coupon, 10000)
+                return 'redeemed'
+            except CouponRejected as e:
+                return e.reason
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(orders)) as pool:
+            return list(pool.map(redeem, orders))
+
+    def assertRedeemed(self, results, expected):
+        self.coupon.refresh_from_db()
+        self.assertEqual(results.count('redeemed'), expected)
+        self.assertEqual(self.coupon.uses, expected)
+        self.assertEqual(CouponRedemption.objects.filter(coupon=self.coupon).count(), expected)
+
+    def test_global_limit(self):
+        Coupon.objects.filter(pk=self.coupon.pk).update(max_uses=5)
+        users = [
+            User.objects.create(username=f'buyer-{i}', email=f'buyer-{i}@example.com')
+            for i in range(self.applies)
+        ]
+        results = self.redeem_in_parallel(users)
+        self.assertRedeemed(results, 5)
+        self.assertEqual(results.count('exhausted'), self.applies - 5)
+
+    def test_per_user_limit(self):
+        Coupon.objects.filter(pk=self.coupon.pk).update(max_uses=5, max_uses_per_user=2)
+        user = User.objects.create(username='buyer', email='buyer@example.com')
+        results = self.redeem_in_parallel([user] * self.applies)
+        self.assertRedeemed(results, 2)
+        self.assertEqual(results.count('limit_reached'), self.applies - 2)
@@ -2,15 +2,15 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Coupon
+from .engine import CouponRejected, check_coupon
 from .serializers import CouponSerializer
 
 class ApplyCouponView(APIView):
     def post(self, request):
-        code = request.data.get('code')
+        # Answered from the in-memory index: no query per keystroke
         try:
-            coupon = Coupon.objects.get(code=code, active=True)
-            serializer = CouponSerializer(coupon)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Coupon.DoesNotExist:
-            return Response({'error': 'Invalid or expired coupon'}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            coupon = check_coupon(request.data.get('code'))
+        except CouponRejected as e:
+            return Response({'error': str(e), 'reason': e.reason}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = CouponSerializer(coupon)
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -7,3 +7,11 @@ class CourseSerializer(serializers.ModelSerializer):
         model = Course
         fields = '__all__'
 
+class CourseSummarySerializer(serializers.ModelSerializer):
+    """Course card for listings such as the home page"""
+    class Meta:
+        model = Course
+        fields = [
+            'id', 'title', 'instructor', 'category', 'thumbnail', 'price',
+            'discount', 'duration', 'is_featured',
+        ]
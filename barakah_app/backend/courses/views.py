@@ -2,7 +2,16 @@ from django.shortcuts import render
 from rest_framework import viewsets
 from .models import Course
 from .serializers import CourseSerializer
+from caching.responses import cache_response
 
 class CourseViewSet(viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
+
+    @cache_response('courses')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response('courses')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -1,10 +1,17 @@
 # donations/admin.py
 from django.contrib import admin
-from .models import Donation
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from django.utils.html import format_html
+from transactions.ledger import donation_entry, record_event, record_events
+from .models import Donation, ProofUpload
+from .totals import COUNTED_STATUS, recompute_campaign_totals
 
 @admin.register(Donation)
 class DonationAdmin(admin.ModelAdmin):
-    list_display = ('campaign', 'donor', 'donor_name', 'donor_phone','amount', 'payment_status', 'transfer_date')
+    list_display = ('campaign', 'donor', 'donor_name', 'donor_phone','amount', 'payment_status', 'transfer_date', 'proof_thumbnail')
+    list_select_related = ('campaign', 'donor', 'proof_upload')
     list_filter = ('campaign', 'payment_method', 'payment_status')
     search_fields = ('donor_name', )
     date_hierarchy = 'transfer_date'  # Add a date filter for the deadline
@@ -13,8 +20,60 @@ class DonationAdmin(admin.ModelAdmin):
     actions = ['verify_selected_donations']
 
     def verify_selected_donations(self, request, queryset):
-        # Update the payment_status of the selected donations to "verified"
-        queryset.update(payment_status='verified')
-        self.message_user(request, f"{queryset.count()} donations have been verified.")
+        """
+        Verify the selection with a single UPDATE, then fix the totals of the
+        affected campaigns with one grouped aggregate (see donations/totals.py).
+        """
+        with transaction.atomic():
+            to_verify = queryset.exclude(payment_status=COUNTED_STATUS)
+            per_campaign = list(
+                to_verify.order_by()
+                .values('campaign_id', 'campaign__title')
+                .annotate(count=Count('id'), amount=Sum('amount'))
+                .order_by('campaign__title')
+            )
+            verified_ids = list(to_verify.values_list('id', flat=True))
+            updated = Donation.objects.filter(pk__in=verified_ids).update(
+                payment_status=COUNTED_STATUS, updated_at=timezone.now()
+            )
+            recompute_campaign_totals([row['campaign_id'] for row in per_campaign])
+            record_events([
+                donation_entry(donation, 'manual', actor=request.user)
+                for donation in Donation.objects.filter(pk__in=verified_ids).only(
+                    'id', 'campaign_id', 'payment_method', 'payment_status', 'amount'
+                )
+            ])
 
-    verify_selected_donations.short_description = "Verify selected donations"
\ No newline at end of file
+        self.message_user(request, f"{updated} donations have been verified.")
+        for row in per_campaign:
+            self.message_user(
+                request, f"{row['campaign__title']}: {row['count']} donations, Rp {row['amount']:,.0f}"
+            )
+
+    verify_selected_donations.short_description = "Verify selected donations"
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if change and 'payment_status' in form.changed_data:
+                record_event(donation_entry(obj, 'manual', actor=request.user))
+
+    def proof_thumbnail(self, obj):
+        # Small re-encoded preview instead of the full-size proof
+        upload = obj.proof_upload
+        if upload and upload.thumbnail:
+            return format_html(
+                '<a href="{}" target="_blank"><img src="{}" height="48"></a>', upload.file.url, upload.thumbnail.url
+            )
+        if obj.proof_file:
+            return format_html('<a href="{}" target="_blank">View</a>', obj.proof_file.url)
+        return '-'
+
+    proof_thumbnail.short_description = "Proof"
+
+@admin.register(ProofUpload)
+class ProofUploadAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'content_type', 'original_size', 'size', 'status', 'created_at')
+    list_filter = ('status', 'content_type')
+    search_fields = ('sha256', )
+    readonly_fields = ('sha256', 'original_size', 'size', 'processed_at')
@@ -0,0 +1,175 @@
+# donations/management/commands/benchmark_donation_queries.py
+import random
+import statistics
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.db.models import Sum
+from django.utils import timezone
+from accounts.models import User
+from campaigns.models import Campaign
+from donations.models import Donation
+from donations.totals import recompute_campaign_totals
+from donations.views import donor_history
+
+BENCH_PREFIX = 'benchmark-'
+
+# Single-column FK indexes the table had before the composite indexes replaced them
+BASELINE_INDEXES = [
+    models.Index(fields=['campaign'], name='bench_donation_campaign_idx'),
+    models.Index(fields=['donor'], name='bench_donation_donor_idx'),
+]
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large donations table and report query plans and latency of the "
+        "donation hot paths, optionally before and after the composite indexes. "
+        "Meant for a local/staging database: --compare temporarily drops indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Insert this many benchmark donations first')
+        parser.add_argument('--campaigns', type=int, default=50, help='Benchmark campaigns to spread donations over')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='Measure with the Meta indexes dropped (baseline schema), then restored',
+        )
+        parser.add_argument('--cleanup', action='store_true', help='Delete all benchmark rows and exit')
+        parser.add_argument(
+            '--i-know', action='store_true', dest='i_know',
+            help='Allow --seed, --compare and --cleanup with DEBUG off (they write to the configured database)',
+        )
+
+    def handle(self, *args, **options):
+        writes = options['seed'] or options['compare'] or options['cleanup']
+        if writes and not settings.DEBUG and not options['i_know']:
+            raise CommandError(
+                f"Refusing to seed, drop indexes or delete rows on {connection.settings_dict['NAME']} "
+                "with DEBUG off; pass --i-know if this really is a scratch database"
+            )
+        if options['cleanup']:
+            return self.cleanup()
+        if options['seed']:
+            self.seed(options['seed'], options['campaigns'])
+
+        campaign = Campaign.objects.filter(slug__startswith=BENCH_PREFIX).order_by('pk').first()
+        donor = User.objects.filter(username__startswith=BENCH_PREFIX).order_by('pk').first()
+        if campaign is None or donor is None:
+            raise CommandError('No benchmark data found, run with --seed first')
+
+        queries = self.hot_queries(campaign, donor)
+        if options['compare']:
+            self.set_indexes(enabled=False)
+            try:
+                self.report('BEFORE (baseline indexes)', queries, options['repeat'])
+            finally:
+                self.set_indexes(enabled=True)
+        self.report('AFTER (composite/partial indexes)', queries, options['repeat'])
+
+    def hot_queries(self, campaign, donor):
+        verified = Donation.objects.filter(campaign=campaign, payment_status='verified')
+        return {
+            'verified total (campaign SUM)': verified.order_by().values('campaign').annotate(total=Sum('amount')),
+            'donor feed page (20 newest verified)': verified.order_by('-created_at', '-id')[:20],
+            'donor history (DonationView.get)': donor_history(donor),
+            'pending queue (50 newest)': Donation.objects.filter(payment_status='pending')[:50],
+        }
+
+    def report(self, title, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {title} on {connection.vendor}"))
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(self.style.SUCCESS(
+                f"\n{name}: median {statistics.median(timings):.2f} ms, max {max(timings):.2f} ms"
+            ))
+            self.stdout.write(queryset.explain())
+
+    def set_indexes(self, enabled):
+        """Swap between the baseline FK indexes and the Meta composite indexes"""
+        with connection.schema_editor() as editor:
+            if enabled:
+                for index in BASELINE_INDEXES:
+                    editor.remove_index(Donation, index)
+                for index in Donation._meta.indexes:
+                    editor.add_index(Donation, index)
+            else:
+                for index in Donation._meta.indexes:
+                    editor.remove_index(Donation, index)
+                for index in BASELINE_INDEXES:
+                    editor.add_index(Donation, index)
+
+    def seed(self, count, campaign_count, batch_size=5000):
+        self.stdout.write(f"Seeding {count} donations over {campaign_count} campaigns...")
+        started = time.perf_counter()
+        run = int(time.time())
+
+        campaigns = Campaign.objects.bulk_create([
+            Campaign(
+                title=f'Benchmark {run} #{i}', slug=f'{BENCH_PREFIX}{run}-{i}', description='',
+                category='dhuafa', thumbnail='campaign_images/benchmark.jpg', target_amount=10 ** 9,
+                is_active=False,
+            )
+            for i in range(campaign_count)
+        ])
+        donors = User.objects.bulk_create([
+            User(username=f'{BENCH_PREFIX}{run}-{i}', email=f'{BENCH_PREFIX}{run}-{i}@example.com')
+            for i in range(200)
+        ])
+        campaign_ids = [campaign.pk for campaign in campaigns]
+        donor_ids = [donor.pk for donor in donors] + [None] * 800
+        statuses = ['verified'] * 7 + ['pending'] * 2 + ['rejected']
+        now = timezone.now()
+
+        # Heavily skewed towards the first campaigns, like real traffic
+        weights = [1 / (i + 1) for i in range(len(campaign_ids))]
+        inserted = 0
+        while inserted < count:
+            size = min(batch_size, count - inserted)
+            picked = random.choices(campaign_ids, weights=weights, k=size)
+            batch = [
+                Donation(
+                    campaign_id=picked[i],
+                    donor_id=random.choice(donor_ids),
+                    amount=random.choice([5000, 10000, 20000, 50000]),
+                    donor_name='Benchmark', donor_phone='0800000000',
+                    payment_method=random.choice(['bsi', 'bjb', 'midtrans']),
+                    payment_status=random.choice(statuses),
+                )
+                for i in range(size)
+            ]
+            Donation.objects.bulk_create(batch)
+            inserted += size
+
+        # created_at is auto_now_add, so spread it over a year afterwards
+        with connection.cursor() as cursor:
+            table = Donation._meta.db_table
+            cursor.execute(
+                f"SELECT MIN(id), MAX(id) FROM {table} WHERE campaign_id IN ({','.join(map(str, campaign_ids))})"
+            )
+            low, high = cursor.fetchone()
+        span = max(high - low, 1)
+        for start in range(low, high + 1, batch_size):
+            stamp = now - timedelta(days=365 * (1 - (start - low) / span))
+            Donation.objects.filter(pk__gte=start, pk__lt=start + batch_size).update(created_at=stamp)
+
+        recompute_campaign_totals(campaign_ids)
+        self.stdout.write(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    def cleanup(self):
+        campaign_ids = list(Campaign.objects.filter(slug__startswith=BENCH_PREFIX).values_list('pk', flat=True))
+        with connection.cursor() as cursor:
+            if campaign_ids:
+                # Raw DELETE: going through the ORM would fire a signal per row
+                cursor.execute(
+                    f"DELETE FROM {Donation._meta.db_table} WHERE campaign_id IN ({','.join(map(str, campaign_ids))})"
+                )
+        Campaign.objects.filter(pk__in=campaign_ids).delete()
+        User.objects.filter(username__startswith=BENCH_PREFIX).delete()
+        self.stdout.write(self.style.SUCCESS(f"Removed {len(campaign_ids)} benchmark campaigns and their donations."))
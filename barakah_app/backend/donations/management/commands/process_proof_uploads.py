@@ -0,0 +1,37 @@
+# donations/management/commands/process_proof_uploads.py
+import time
+from django.core.management.base import BaseCommand
+from donations.models import ProofUpload
+from donations.uploads import process_proof_upload
+
+class Command(BaseCommand):
+    help = "Downscale, re-encode and thumbnail pending proof-of-transfer uploads"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new uploads instead of exiting when done',
+        )
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.process_batch(options['batch_size'])
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def process_batch(self, batch_size):
+        uploads = list(ProofUpload.objects.filter(status='pending').order_by('pk')[:batch_size])
+        for upload in uploads:
+            try:
+                process_proof_upload(upload)
+                saved = upload.original_size - upload.size
+                self.stdout.write(f"{upload}: {upload.original_size} -> {upload.size} bytes ({saved} saved)")
+            except Exception as e:
+                ProofUpload.objects.filter(pk=upload.pk).update(status='failed')
+                self.stderr.write(f"{upload}: failed ({e})")
+        return len(uploads)
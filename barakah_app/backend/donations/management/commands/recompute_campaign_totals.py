@@ -0,0 +1,32 @@
+# donations/management/commands/recompute_campaign_totals.py
+from django.core.management.base import BaseCommand
+from campaigns.models import Campaign
+from donations.totals import recompute_campaign_totals
+
+class Command(BaseCommand):
+    help = "Recompute Campaign.current_amount from verified donations and fix any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--campaign', action='append', dest='slugs', metavar='SLUG',
+            help='Only reconcile the campaign with this slug (can be repeated)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report the drift without writing anything',
+        )
+
+    def handle(self, *args, **options):
+        campaign_ids = None
+        if options['slugs']:
+            campaign_ids = list(
+                Campaign.objects.filter(slug__in=options['slugs']).values_list('id', flat=True)
+            )
+
+        changed = recompute_campaign_totals(campaign_ids, dry_run=options['dry_run'])
+
+        for campaign, old_amount, new_amount in changed:
+            self.stdout.write(f"{campaign.title}: {old_amount} -> {new_amount}")
+
+        verb = 'would be updated' if options['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(f"{len(changed)} campaign totals {verb}."))
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:25
+
+import django.db.models.deletion
+import donations.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0002_alter_donation_payment_method'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProofUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to=donations.models.proof_upload_path)),
+                ('thumbnail', models.ImageField(blank=True, max_length=255, null=True, upload_to=donations.models.proof_thumbnail_path)),
+                ('content_type', models.CharField(max_length=50)),
+                ('original_size', models.PositiveIntegerField()),
+                ('size', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='donation',
+            name='proof_file',
+            field=models.FileField(blank=True, max_length=255, null=True, upload_to=donations.models.proof_file_path),
+        ),
+        migrations.AddField(
+            model_name='donation',
+            name='proof_upload',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donations', to='donations.proofupload'),
+        ),
+    ]
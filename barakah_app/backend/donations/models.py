@@ -1,6 +1,5 @@
 # donations/models.py
-from django.db import models
-from django.db.models import Sum
+from django.db import models, transaction
 from accounts.models import User
 from campaigns.models import Campaign
 import uuid
@@ -12,6 +11,38 @@ def proof_file_path(instance, filename):
     filename = f"{uuid.uuid4()}.{ext}"
     return os.path.join('donation_proofs', filename)
 
+def proof_upload_path(instance, filename):
+    """Content-addressed path, so identical uploads share one file"""
+    ext = filename.split('.')[-1].lower()
+    return os.path.join('donation_proofs', instance.sha256[:2], f"{instance.sha256}.{ext}")
+
+def proof_thumbnail_path(instance, filename):
+    return os.path.join('donation_proofs', 'thumbnails', f"{instance.sha256}.webp")
+
+class ProofUpload(models.Model):
+    """
+    A deduplicated proof-of-transfer file. Uploads are stored as received and
+    later downscaled/re-encoded by the process_proof_uploads command.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+
+    sha256 = models.CharField(max_length=64, unique=True)  # Of the original upload
+    file = models.FileField(upload_to=proof_upload_path, max_length=255)
+    thumbnail = models.ImageField(upload_to=proof_thumbnail_path, max_length=255, blank=True, null=True)
+    content_type = models.CharField(max_length=50)
+    original_size = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.content_type})"
+
 class Donation(models.Model):
     PAYMENT_METHOD_CHOICES = [
         ('bsi', 'Bank Syariah Indonesia'),
@@ -25,8 +56,9 @@ class Donation(models.Model):
         ('rejected', 'Rejected'),
     ]
     
-    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='donations')
-    donor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='donations')
+    # Indexed through the composite indexes in Meta, which lead with these columns
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name='donations', db_index=False)
+    donor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='donations', db_index=False)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     donor_name = models.CharField(max_length=100)
     donor_phone = models.CharField(max_length=15)
@@ -41,7 +73,8 @@ class Donation(models.Model):
     source_account = models.CharField(max_length=100, blank=True, null=True)
     account_name = models.CharField(max_length=100, blank=True, null=True)
     transfer_date = models.DateField(blank=True, null=True)
-    proof_file = models.FileField(upload_to=proof_file_path, blank=True, null=True)
+    proof_file = models.FileField(upload_to=proof_file_path, max_length=255, blank=True, null=True)
+    proof_upload = models.ForeignKey(ProofUpload, on_delete=models.SET_NULL, null=True, blank=True, related_name='donations')
     
     # WhatsApp confirmation tracking
     whatsapp_sent = models.BooleanField(default=False)
@@ -52,22 +85,33 @@ class Donation(models.Model):
 
     def save(self, *args, **kwargs):
         """
-        Override the save method to update the Campaign's current_amount.
+        Save the donation and its campaign total delta in one transaction.
+        The delta itself is applied by the signals in donations/signals.py.
         """
-        super().save(*args, **kwargs)  # Save the Donation first
-
-        # Calculate the total confirmed/verified donations for the Campaign
-        confirmed_amount = Donation.objects.filter(
-            campaign=self.campaign,
-            payment_status__in=['verified']
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
-        # Update the Campaign's current_amount
-        self.campaign.current_amount = confirmed_amount
-        self.campaign.save(update_fields=['current_amount'])
-            
     def __str__(self):
         return f"{self.donor_name} - {self.amount} - {self.campaign.title}"
     
     class Meta:
-        ordering = ['-created_at']    
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Public donor feed: verified donations of a campaign, newest first
+            models.Index(
+                fields=['campaign', '-created_at', '-id'],
+                condition=models.Q(payment_status='verified'),
+                name='donation_verified_feed_idx',
+            ),
+            # Filtering by campaign and status (admin, exports, bulk verification);
+            # amount makes it covering for the verified SUM behind campaign totals
+            models.Index(fields=['campaign', 'payment_status', 'amount'], name='donation_campaign_status_idx'),
+            # A donor's own donation history
+            models.Index(fields=['donor', '-created_at'], name='donation_donor_created_idx'),
+            # Pending queue (DonationViewSet, reconciliation sweeps)
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(payment_status='pending'),
+                name='donation_pending_created_idx',
+            ),
+        ]    
\ No newline at end of file
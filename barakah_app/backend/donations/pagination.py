@@ -0,0 +1,9 @@
+# donations/pagination.py
+from rest_framework.pagination import CursorPagination
+
+class DonorFeedPagination(CursorPagination):
+    """Newest-first cursor pages; no COUNT(*) and no OFFSET scans on big campaigns"""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,10 +1,12 @@
 # donations/serializers.py
 from rest_framework import serializers
 from .models import Donation
-from campaigns.serializers import CampaignSerializer
+from campaigns.serializers import CampaignSummarySerializer
+
+ANONYMOUS_DONOR_NAME = 'Hamba Allah'
 
 class DonationSerializer(serializers.ModelSerializer):
-    campaign = CampaignSerializer(read_only=True)
+    campaign = CampaignSummarySerializer(read_only=True)
     campaign_title = serializers.CharField(source='campaign.title', read_only=True)
     campaign_slug = serializers.CharField(source='campaign.slug', read_only=True)
     proof_file_url = serializers.SerializerMethodField()
@@ -34,4 +36,16 @@ class DonationSerializer(serializers.ModelSerializer):
         if request:
             # Example: Generate an absolute URL for a field (if needed)
             representation['url'] = request.build_absolute_uri(f'/donations/{instance.id}/')
-        return representation
\ No newline at end of file
+        return representation
+
+class DonorFeedSerializer(serializers.ModelSerializer):
+    """Slim, non-nested row for the public donor list of a campaign"""
+    donor_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Donation
+        fields = ['id', 'donor_name', 'amount', 'message', 'created_at']
+        read_only_fields = fields
+
+    def get_donor_name(self, obj):
+        return ANONYMOUS_DONOR_NAME if obj.is_anonymous else obj.donor_name
@@ -1,20 +1,52 @@
 # donations/signals.py
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum
-from .models import Donation, Campaign
+from .models import Donation
+from .totals import verified_contribution, apply_campaign_delta
+
+@receiver(pre_save, sender=Donation)
+def remember_previous_contribution(sender, instance, raw=False, **kwargs):
+    """
+    Remember what the stored row contributed to its campaign before this save.
+    This is a single primary-key lookup, independent of the campaign size.
+
+    The row stays locked until Donation.save's transaction ends, so a
+    concurrent save of the same donation waits and then sees this save's
+    result instead of applying the same delta twice.
+    """
+    instance._previous_contribution = (None, 0)
+    if raw or instance.pk is None:
+        return
+    previous = Donation.objects.select_for_update().filter(pk=instance.pk).values(
+        'campaign_id', 'payment_status', 'amount'
+    ).first()
+    if previous:
+        instance._previous_contribution = (
+            previous['campaign_id'],
+            verified_contribution(previous['payment_status'], previous['amount']),
+        )
 
 @receiver(post_save, sender=Donation)
-@receiver(post_delete, sender=Donation)
-def update_campaign_current_amount(sender, instance, **kwargs):
+def update_campaign_current_amount(sender, instance, raw=False, **kwargs):
     """
-    Update the current_amount of the Campaign when a Donation is saved or deleted.
+    Apply the change in verified amount to the Campaign's current_amount
+    using F() deltas instead of re-aggregating every donation.
     """
-    campaign = instance.campaign
-    confirmed_amount = Donation.objects.filter(
-        campaign=campaign,
-        payment_status__in=['verified']
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    if raw:
+        return
+    old_campaign_id, old_amount = getattr(instance, '_previous_contribution', (None, 0))
+    new_amount = verified_contribution(instance.payment_status, instance.amount)
+
+    if old_campaign_id == instance.campaign_id:
+        apply_campaign_delta(instance.campaign_id, new_amount - old_amount)
+    else:
+        # The donation moved to another campaign
+        apply_campaign_delta(old_campaign_id, -old_amount)
+        apply_campaign_delta(instance.campaign_id, new_amount)
+    instance._previous_contribution = (instance.campaign_id, new_amount)
 
-    campaign.current_amount = confirmed_amount
-    campaign.save(update_fields=['current_amount'])
\ No newline at end of file
+@receiver(post_delete, sender=Donation)
+def subtract_deleted_donation(sender, instance, **kwargs):
+    """Remove a deleted verified donation from its campaign total"""
+    amount = verified_contribution(instance.payment_status, instance.amount)
+    apply_campaign_delta(instance.campaign_id, -amount)
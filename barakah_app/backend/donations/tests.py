@@ -1,3 +1,40 @@
-from django.test import TestCase
+# donations/tests.py
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from campaigns.models import Campaign
+from .models import Donation
+from .uploads import ProofSizeLimitHandler
 
-# Create your tests here.
+@override_settings(PROOF_UPLOAD_MAX_SIZE=64 * 1024)
+class ProofUploadLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Campaign.objects.create(
+            title='Bantu yatim', slug='bantu-yatim', category='yatim',
+            thumbnail='campaign_images/test.jpg', target_amount=1000000,
+        )
+
+    def post(self, size):
+        proof = SimpleUploadedFile('proof.pdf', b'%PDF-' + b'0' * (size - 5), content_type='application/pdf')
+        return APIClient().post('/api/donations/bantu-yatim/create-donation/', {
+            'amount': '50000', 'donor_name': 'Hamba Allah', 'donor_phone': '0811',
+            'payment_method': 'bsi', 'proof_file': proof,
+        }, format='multipart', secure=True)
+
+    def test_oversized_proof_is_refused_while_streaming(self):
+        chunks = []
+        receive = ProofSizeLimitHandler.receive_data_chunk
+
+        def counting(handler, raw_data, start):
+            chunks.append(len(raw_data))
+            return receive(handler, raw_data, start)
+
+        with mock.patch.object(ProofSizeLimitHandler, 'receive_data_chunk', counting):
+            response = self.post(1024 * 1024)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('too large', response.json()['error'])
+        # Stopped at the first chunk past the limit, not after the whole megabyte
+        self.assertLess(sum(chunks), 1024 * 1024 // 2)
+        self.assertFalse(Donation.objects.exists())
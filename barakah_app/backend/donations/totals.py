@@ -0,0 +1,70 @@
+# donations/totals.py
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F, Sum
+from django.dispatch import Signal
+from campaigns.models import Campaign
+from .models import Donation
+
+# Only donations in this status count towards Campaign.current_amount
+COUNTED_STATUS = 'verified'
+
+# Sent with campaign_ids=[...] whenever stored campaign totals change
+campaign_totals_changed = Signal()
+
+def verified_contribution(payment_status, amount):
+    """Return how much a donation in the given state adds to its campaign total"""
+    if payment_status != COUNTED_STATUS or amount in (None, ''):
+        return Decimal('0')
+    return Decimal(str(amount))
+
+def apply_campaign_delta(campaign_id, delta):
+    """Atomically shift a campaign's current_amount by delta (no read, no full SUM)"""
+    if not campaign_id or not delta:
+        return 0
+    updated = Campaign.objects.filter(pk=campaign_id).update(
+        current_amount=F('current_amount') + delta
+    )
+    if updated:
+        campaign_totals_changed.send(sender=Campaign, campaign_ids=[campaign_id])
+    return updated
+
+def recompute_campaign_totals(campaign_ids=None, dry_run=False):
+    """
+    Reconcile Campaign.current_amount with the verified donations in bulk.
+
+    Runs one grouped aggregate for all requested campaigns and only writes the
+    campaigns whose stored total has drifted. Returns a list of
+    (campaign, old_amount, new_amount) tuples for the campaigns that changed.
+    """
+    donations = Donation.objects.filter(payment_status=COUNTED_STATUS)
+    campaigns = Campaign.objects.only('id', 'title', 'current_amount').order_by('pk')
+    if campaign_ids is not None:
+        donations = donations.filter(campaign_id__in=campaign_ids)
+        campaigns = campaigns.filter(pk__in=campaign_ids)
+
+    with transaction.atomic():
+        # Lock the campaign rows first so concurrent deltas queue up behind us
+        # instead of being overwritten by the recomputed totals
+        locked = list(campaigns.select_for_update())
+        totals = dict(
+            donations.order_by()
+            .values_list('campaign_id')
+            .annotate(total=Sum('amount'))
+        )
+
+        changed = []
+        for campaign in locked:
+            new_amount = totals.get(campaign.id) or Decimal('0')
+            if campaign.current_amount != new_amount:
+                changed.append((campaign, campaign.current_amount, new_amount))
+                campaign.current_amount = new_amount
+
+        if changed and not dry_run:
+            Campaign.objects.bulk_update(
+                [campaign for campaign, _, _ in changed], ['current_amount'], batch_size=500
+            )
+            campaign_totals_changed.send(
+                sender=Campaign, campaign_ids=[campaign.id for campaign, _, _ in changed]
+            )
+    return changed
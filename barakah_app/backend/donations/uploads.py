@@ -0,0 +1,143 @@
+# donations/uploads.py
+import hashlib
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .models import Donation, ProofUpload
+
+# Magic bytes -> (content type, extension)
+SIGNATURES = [
+    (b'\xff\xd8\xff', ('image/jpeg', 'jpg')),
+    (b'\x89PNG\r\n\x1a\n', ('image/png', 'png')),
+    (b'%PDF-', ('application/pdf', 'pdf')),
+]
+
+class ProofUploadError(Exception):
+    pass
+
+def too_large():
+    limit_mb = settings.PROOF_UPLOAD_MAX_SIZE // (1024 * 1024)
+    return ProofUploadError(f"Proof file is too large (max {limit_mb}MB)")
+
+class ProofSizeLimitHandler(FileUploadHandler):
+    """
+    Abort the request as soon as an uploaded file passes PROOF_UPLOAD_MAX_SIZE,
+    instead of spooling the whole file to disk and rejecting it afterwards.
+    Goes first in request.upload_handlers and passes chunks on unchanged.
+    """
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.PROOF_UPLOAD_MAX_SIZE:
+            raise too_large()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None  # The next handler builds the file
+
+def sniff_content_type(header):
+    """Identify the upload from its first bytes rather than trusting the client"""
+    for signature, kind in SIGNATURES:
+        if header.startswith(signature):
+            return kind
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return ('image/webp', 'webp')
+    return None
+
+def store_proof_upload(uploaded_file):
+    """
+    Validate a proof-of-transfer upload and store it once per distinct content.
+
+    Large uploads are already on disk (FILE_UPLOAD_MAX_MEMORY_SIZE), and the
+    file is hashed chunk by chunk, so memory use does not grow with its size.
+    Views receiving proofs install ProofSizeLimitHandler so oversized files
+    never get that far; the size check here is the backstop.
+    """
+    if uploaded_file.size > settings.PROOF_UPLOAD_MAX_SIZE:
+        raise too_large()
+
+    uploaded_file.seek(0)
+    kind = sniff_content_type(uploaded_file.read(16))
+    if kind is None:
+        raise ProofUploadError("Proof file must be a JPEG, PNG, WEBP image or a PDF")
+    content_type, ext = kind
+
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    sha256 = digest.hexdigest()
+
+    existing = ProofUpload.objects.filter(sha256=sha256).first()
+    if existing:
+        return existing
+
+    upload = ProofUpload(
+        sha256=sha256,
+        content_type=content_type,
+        original_size=uploaded_file.size,
+        size=uploaded_file.size,
+    )
+    uploaded_file.seek(0)
+    upload.file.save(f"proof.{ext}", uploaded_file, save=False)
+    try:
+        with transaction.atomic():
+            upload.save()
+    except IntegrityError:
+        # Same file uploaded concurrently; keep the row that won
+        upload.file.delete(save=False)
+        return ProofUpload.objects.get(sha256=sha256)
+    return upload
+
+def attach_proof(donation, uploaded_file):
+    """Point the donation at the (possibly shared) stored proof file"""
+    upload = store_proof_upload(uploaded_file)
+    donation.proof_upload = upload
+    donation.proof_file.name = upload.file.name
+    return upload
+
+def _encode_webp(image, max_side, quality):
+    image = image.copy()
+    image.thumbnail((max_side, max_side))
+    buffer = BytesIO()
+    image.save(buffer, 'WEBP', quality=quality, method=4)
+    return ContentFile(buffer.getvalue())
+
+def process_proof_upload(upload):
+    """Downscale and re-encode an image proof to WEBP and render its admin thumbnail"""
+    if not upload.content_type.startswith('image/'):
+        upload.status = 'processed'
+        upload.processed_at = timezone.now()
+        upload.save(update_fields=['status', 'processed_at'])
+        return upload
+
+    with upload.file.open('rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+
+        compact = _encode_webp(image, settings.PROOF_IMAGE_MAX_SIDE, settings.PROOF_IMAGE_QUALITY)
+        thumbnail = _encode_webp(image, settings.PROOF_THUMBNAIL_SIDE, 70)
+
+    original_name = upload.file.name
+    upload.file.save("proof.webp", compact, save=False)
+    upload.thumbnail.save("thumb.webp", thumbnail, save=False)
+    upload.content_type = 'image/webp'
+    upload.size = upload.file.size
+    upload.status = 'processed'
+    upload.processed_at = timezone.now()
+    upload.save()
+
+    # Every donation that shares this upload now points at the compact file
+    Donation.objects.filter(proof_upload=upload).update(proof_file=upload.file.name)
+    if original_name != upload.file.name:
+        upload.file.storage.delete(original_name)
+    return upload
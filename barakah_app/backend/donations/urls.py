@@ -1,10 +1,11 @@
 # donations/urls.py
 from django.urls import path
-from .views import DonationView, CampaignDonationsView, CreateDonationView, UpdateDonationView 
+from .views import DonationView, CampaignDonationsView, CampaignDonorFeedView, CreateDonationView, UpdateDonationView 
 
 urlpatterns = [
     path('donation/', DonationView.as_view(), name='donation'),
     path('campaign/<slug:slug>/donations/', CampaignDonationsView.as_view(), name='campaign-donations'),
+    path('campaign/<slug:slug>/donors/', CampaignDonorFeedView.as_view(), name='campaign-donor-feed'),
     path('<str:campaign_slug>/create-donation/', CreateDonationView.as_view(), name='create-donation'),
     path('<int:donation_id>/update-donation/', UpdateDonationView.as_view(), name='update-donation'),
 ]
\ No newline at end of file
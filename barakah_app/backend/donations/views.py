@@ -5,14 +5,24 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import viewsets
+from rest_framework import generics
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from campaigns.models import Campaign
 from .models import Donation
-from .serializers import DonationSerializer
+from .serializers import DonationSerializer, DonorFeedSerializer
+from .pagination import DonorFeedPagination
+from .uploads import ProofSizeLimitHandler, ProofUploadError, attach_proof, store_proof_upload
 import logging
 logger = logging.getLogger('donations')
 
+# Columns needed to render a donor feed row
+DONOR_FEED_FIELDS = ('id', 'donor_name', 'is_anonymous', 'amount', 'message', 'created_at')
+
+def donor_history(user):
+    """The user's donations newest first with their campaigns joined, one query however many there are"""
+    return Donation.objects.filter(donor=user).select_related('campaign')
+
 class DonationViewSet(viewsets.ModelViewSet):
     queryset = Donation.objects.filter(payment_status='pending')
     serializer_class = DonationSerializer
@@ -32,7 +42,7 @@ class DonationView(APIView):
 
     def get(self, request):
         user = request.user
-        donation_items = Donation.objects.filter(donor=user)
+        donation_items = donor_history(user)
         serializer = DonationSerializer(donation_items, many=True)
         return Response(serializer.data)
     
@@ -60,26 +70,43 @@ class CampaignDonationsView(APIView):
             logger.info(f"Fetching donations for campaign: {slug}")  # Log campaign_slug
 
             # Get the campaign
-            campaign = get_object_or_404(Campaign, slug=slug)
-            logger.info(f"Campaign found: {campaign.title}")  # Log campaign title
+            campaign = get_object_or_404(Campaign.objects.only('id'), slug=slug)
 
             # Filter only verified donations
             donations = Donation.objects.filter(
                 campaign=campaign,
                 payment_status='verified'  # Only include verified donations
-            )
-            logger.info(f"Found {donations.count()} verified donations")  # Log the number of donations
+            ).only(*DONOR_FEED_FIELDS)
 
             # Serialize the donations
-            serializer = DonationSerializer(donations, many=True, context={'request': request})
+            serializer = DonorFeedSerializer(donations, many=True)
 
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except Exception as e:
             logger.error(f"Error fetching donations: {str(e)}", exc_info=True)  # Log the full error with traceback
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class CampaignDonorFeedView(generics.ListAPIView):
+    """Cursor-paginated list of verified donors of a campaign, newest first"""
+    serializer_class = DonorFeedSerializer
+    pagination_class = DonorFeedPagination
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        campaign = get_object_or_404(Campaign.objects.only('id'), slug=self.kwargs['slug'])
+        return Donation.objects.filter(
+            campaign=campaign,
+            payment_status='verified'
+        ).only(*DONOR_FEED_FIELDS)
         
-class UpdateDonationView(APIView):
+class ProofUploadMixin:
+    """Install the proof size limit before anything (CSRF, request.data) parses the body"""
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers.insert(0, ProofSizeLimitHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
+
+class UpdateDonationView(ProofUploadMixin, APIView):
     def post(self, request, donation_id):  # Accept donation_id as a parameter
         try:
             logger.info(f"Donation ID: {donation_id}")
@@ -105,7 +132,7 @@ class UpdateDonationView(APIView):
             donation.payment_status = 'verified'
 
             if proof_file:
-                donation.proof_file = proof_file
+                attach_proof(donation, proof_file)
 
             donation.save()
 
@@ -115,13 +142,15 @@ class UpdateDonationView(APIView):
                 'donation_id': donation.id
             }, status=status.HTTP_200_OK)
 
+        except ProofUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class CreateDonationView(APIView):
+class CreateDonationView(ProofUploadMixin, APIView):
     permission_classes = [AllowAny]  # Allow both authenticated and unauthenticated users
 
     def post(self, request, campaign_slug):
@@ -165,6 +194,9 @@ class CreateDonationView(APIView):
             # Check if the user is authenticated
             donor = authenticated_user if authenticated_user else None
 
+            # Validate and store the proof before creating the donation
+            proof_upload = store_proof_upload(proof_file) if proof_file else None
+
             # Create a new donation
             donation = Donation.objects.create(
                 campaign=campaign,
@@ -177,12 +209,12 @@ class CreateDonationView(APIView):
                 source_account=source_account,
                 transfer_date=transfer_date,
                 payment_status='pending',  # Set initial status as pending
-                donor=donor  # Associate the donation with the logged-in user (if any)
+                donor=donor,  # Associate the donation with the logged-in user (if any)
+                proof_upload=proof_upload,
+                proof_file=proof_upload.file.name if proof_upload else None,
             )
 
-            if proof_file:
-                donation.proof_file = proof_file
-                donation.save()
+            if proof_upload:
                 logger.debug(f"Proof of payment uploaded: {donation.proof_file.url}")
 
             logger.debug(f"Donation created: {donation.id}")  # Log the donation
@@ -193,6 +225,8 @@ class CreateDonationView(APIView):
                 'donation_id': donation.id
             }, status=status.HTTP_201_CREATED)
 
+        except ProofUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error creating donation: {str(e)}")  # Log the error
             return Response({
@@ -0,0 +1,6 @@
+# home/apps.py
+from django.apps import AppConfig
+
+class HomeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'home'
@@ -0,0 +1,50 @@
+# home/views.py
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from caching.responses import cache_response
+from campaigns.models import Campaign
+from campaigns.serializers import CampaignSummarySerializer
+from courses.models import Course
+from courses.serializers import CourseSummarySerializer
+from products.models import Product
+from products.serializers import ProductSummarySerializer
+
+FEATURED_LIMIT = 4
+LIST_LIMIT = 12
+
+CAMPAIGN_FIELDS = (
+    'id', 'title', 'slug', 'category', 'thumbnail', 'target_amount', 'current_amount',
+    'deadline', 'is_featured', 'is_active', 'created_at',
+)
+
+class HomeView(APIView):
+    """
+    Everything the home page needs in one response: featured campaigns,
+    products and courses plus the first page of each list. Six small LIMIT
+    queries, cached as a unit and served with an ETag for conditional GET.
+    """
+    permission_classes = [AllowAny]
+
+    @cache_response('home')
+    def get(self, request):
+        campaigns = Campaign.objects.filter(is_active=True).only(*CAMPAIGN_FIELDS)
+        products = Product.objects.filter(is_active=True).only(*ProductSummarySerializer.Meta.fields)
+        # Same rows as /api/courses/, which lists inactive courses too
+        courses = Course.objects.only(*CourseSummarySerializer.Meta.fields)
+
+        def serialize(serializer_class, queryset):
+            return serializer_class(queryset, many=True, context={'request': request}).data
+
+        # Featured rows and the product and course lists come in the list
+        # endpoints' own order, the page sorts what it shows
+        return Response({
+            'featured_campaigns': serialize(CampaignSummarySerializer, campaigns.filter(is_featured=True)[:FEATURED_LIMIT]),
+            'campaigns': serialize(
+                CampaignSummarySerializer, campaigns.order_by('-current_amount')[:LIST_LIMIT]
+            ),
+            'featured_products': serialize(ProductSummarySerializer, products.filter(is_featured=True)[:FEATURED_LIMIT]),
+            'products': serialize(ProductSummarySerializer, products[:LIST_LIMIT]),
+            'featured_courses': serialize(CourseSummarySerializer, courses.filter(is_featured=True)[:FEATURED_LIMIT]),
+            'courses': serialize(CourseSummarySerializer, courses[:LIST_LIMIT]),
+        })
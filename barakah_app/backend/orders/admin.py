@@ -1,6 +1,6 @@
 # Orders/admin.py
 from django.contrib import admin
-from .models import Order
+from .models import Order, StockReservation
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -23,4 +23,11 @@ class OrderAdmin(admin.ModelAdmin):
         self.message_user(request, f"{queryset.count()} Orders have been shipped.")
 
     ship_selected_orders.short_description = "Ship Selected Orders"
-    deliver_selected_orders.short_description = "Deliver Selected Orders"
\ No newline at end of file
+    deliver_selected_orders.short_description = "Deliver Selected Orders"
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ('order', 'product', 'quantity', 'status', 'expires_at')
+    list_filter = ('status', )
+    raw_id_fields = ('order', 'product')
+    readonly_fields = ('order', 'product', 'quantity', 'status', 'created_at', 'expires_at')
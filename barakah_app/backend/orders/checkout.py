@@ -0,0 +1,51 @@
+# orders/checkout.py
+from django.db import transaction
+from django.db.models import Prefetch
+from carts.models import Cart
+from coupons.engine import check_coupon
+from coupons.redemption import coupon_discount, redeem_coupon
+from .models import Order, OrderItem
+from .stock import reserve_stock
+
+def create_order_from_cart(user, coupon_code=None):
+    """
+    Turn the user's cart into an order in one transaction: one read of the
+    cart joined with its products, one INSERT for the order, one bulk INSERT
+    for the items, the stock reservation, the coupon redemption and one
+    DELETE for the cart. Returns None for an empty cart.
+    """
+    # Unknown or out-of-window coupons fail here, before any query
+    coupon = check_coupon(coupon_code) if coupon_code else None
+
+    with transaction.atomic():
+        # Lock the cart rows (not the products) so a double submit cannot
+        # turn the same cart into two orders
+        cart_items = list(
+            Cart.objects.filter(user=user)
+            .select_related('product')
+            .select_for_update(of=('self',))
+            .order_by('pk')
+        )
+        if not cart_items:
+            return None
+
+        items, total_price = [], 0
+        for cart_item in cart_items:
+            price = cart_item.total_price()  # Product is already joined, no extra query
+            items.append(OrderItem(product=cart_item.product, quantity=cart_item.quantity, price=price))
+            total_price += price
+
+        discount = coupon_discount(coupon, total_price) if coupon else 0
+        order = Order.objects.create(user=user, total_price=total_price - discount)
+        for item in items:
+            item.order = order
+        OrderItem.objects.bulk_create(items)
+        reserve_stock(order, items)  # Raises OutOfStock and rolls the whole checkout back
+        if coupon:
+            redeem_coupon(order, coupon, discount)  # Raises CouponRejected, same rollback
+
+        Cart.objects.filter(pk__in=[cart_item.pk for cart_item in cart_items]).delete()
+
+    return Order.objects.prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.select_related('product'))
+    ).get(pk=order.pk)
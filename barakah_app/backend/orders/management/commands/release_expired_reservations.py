@@ -0,0 +1,61 @@
+# orders/management/commands/release_expired_reservations.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from coupons.redemption import release_redemptions
+from orders.models import Order, StockReservation
+from orders.stock import commit_reservations, release_reservations
+from payments.notifications import ORDER_CANCELLED, ORDER_PENDING
+from transactions.ledger import order_entry, record_events
+
+class Command(BaseCommand):
+    help = (
+        "Cancel orders still unpaid when their stock reservation expires and put "
+        "the stock and coupon uses back; reservations of orders that moved on are kept as sold"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be released')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        totals = {'cancelled': 0, 'released': 0, 'committed': 0}
+        last_pk = 0
+        while True:
+            # Keyset over the order ids of expired live reservations
+            order_ids = sorted(set(
+                StockReservation.objects.filter(status='reserved', expires_at__lte=now, order_id__gt=last_pk)
+                .order_by('order_id')
+                .values_list('order_id', flat=True)[:options['batch_size']]
+            ))
+            if not order_ids:
+                break
+            last_pk = order_ids[-1]
+
+            with transaction.atomic():
+                orders = list(Order.objects.select_for_update().filter(pk__in=order_ids).order_by('pk'))
+                unpaid = [order for order in orders if order.status == ORDER_PENDING]
+                # Paid or fulfilled by hand (bank transfer, admin actions): the stock is sold
+                moved_on = [order.pk for order in orders if order.status != ORDER_PENDING]
+                if options['dry_run']:
+                    totals['cancelled'] += len(unpaid)
+                    totals['committed'] += len(moved_on)
+                    continue
+
+                Order.objects.filter(pk__in=[order.pk for order in unpaid]).update(
+                    status=ORDER_CANCELLED, updated_at=now
+                )
+                for order in unpaid:
+                    order.status = ORDER_CANCELLED
+                record_events([order_entry(order, 'reconciliation', gateway_status='expire') for order in unpaid])
+                totals['cancelled'] += len(unpaid)
+                totals['committed'] += commit_reservations(moved_on)
+                totals['released'] += release_reservations([order.pk for order in unpaid])
+                release_redemptions([order.pk for order in unpaid])
+
+        prefix = '[dry run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{totals['cancelled']} orders cancelled, {totals['released']} reservations released, "
+            f"{totals['committed']} kept for orders that were paid or fulfilled"
+        ))
@@ -1,8 +1,17 @@
 # orders/models.py
+import secrets
 from django.db import models
 from accounts.models import User
 from products.models import Product
 
+# No 0/O or 1/I, order numbers get read out and typed in by hand
+ORDER_CODE_ALPHABET = '23456789ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+def generate_order_number(user_id):
+    """ORD-{user id}-{6 random chars}; does not depend on the row id, so no second write is needed"""
+    code = ''.join(secrets.choice(ORDER_CODE_ALPHABET) for _ in range(6))
+    return f"ORD-{user_id:03d}-{code}"
+
 class Order(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -11,16 +20,17 @@ class Order(models.Model):
     status = models.CharField(max_length=50, default='Pending')  # e.g., Pending, Shipped, Delivered
     order_number = models.CharField(max_length=20, unique=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # A customer's order history, newest first (cursor pagination)
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_history_idx'),
+        ]
+
     def save(self, *args, **kwargs):
-        # Check if the object is being saved for the first time
-        if not self.pk:  # `pk` is None if the object is not yet saved
-            super().save(*args, **kwargs)  # Save the object to generate the `id`
-        
-        # Generate the order number if it doesn't exist
+        # Generate the order number up front so a new order is a single INSERT
         if not self.order_number:
-            self.order_number = f"ORD-{self.user.id:03d}-{self.id:04d}"  # Example: ORD-123-0001
-            kwargs['force_insert'] = False  # Ensure the update is not treated as an insert
-            super().save(*args, **kwargs)  # Save again to update the `order_number`
+            self.order_number = generate_order_number(self.user_id)  # Example: ORD-123-7KQ2MX
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Order {self.order_number} by {self.user.username}"
@@ -32,4 +42,34 @@ class OrderItem(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
 
     def __str__(self):
-        return f"{self.quantity} x {self.product.title} in Order {self.order.id}"
\ No newline at end of file
+        return f"{self.quantity} x {self.product.title} in Order {self.order.id}"
+
+class StockReservation(models.Model):
+    """
+    Stock taken from a product for a pending order. Released back to the
+    product if the payment fails or the reservation expires (see orders/stock.py).
+    """
+    STATUS_CHOICES = [
+        ('reserved', 'Reserved'),
+        ('committed', 'Committed'),
+        ('released', 'Released'),
+    ]
+
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='reservations')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reservations')
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='reserved')
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # The expiry sweep only looks at live reservations
+            models.Index(
+                fields=['expires_at'], name='reservation_live_expiry_idx',
+                condition=models.Q(status='reserved'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} for order {self.order_id} ({self.status})"
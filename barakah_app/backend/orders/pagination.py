@@ -0,0 +1,9 @@
+# orders/pagination.py
+from rest_framework.pagination import CursorPagination
+
+class OrderHistoryPagination(CursorPagination):
+    """Newest-first cursor pages over a user's orders, served by order_user_history_idx"""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
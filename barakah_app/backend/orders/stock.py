@@ -0,0 +1,71 @@
+# orders/stock.py
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from caching.signals import invalidate_on_commit
+from products.models import Product
+from .models import StockReservation
+
+class OutOfStock(Exception):
+    def __init__(self, product):
+        super().__init__(f"Not enough stock for {product.title}")
+        self.product = product
+
+def reserve_stock(order, items):
+    """
+    Take stock for the order's items; call inside the checkout transaction.
+
+    Each product is decremented with a conditional UPDATE (stock >= qty), so
+    two checkouts can never both take the last unit. Products are updated in
+    primary-key order, so concurrent multi-item checkouts lock rows in the
+    same order and cannot deadlock. Raises OutOfStock, which rolls back
+    everything taken so far together with the order.
+    """
+    quantities, products = defaultdict(int), {}
+    for item in items:
+        quantities[item.product_id] += item.quantity
+        products[item.product_id] = item.product
+
+    for product_id in sorted(quantities):
+        taken = Product.objects.filter(pk=product_id, stock__gte=quantities[product_id]).update(
+            stock=F('stock') - quantities[product_id]
+        )
+        if not taken:
+            raise OutOfStock(products[product_id])
+
+    expires_at = timezone.now() + timedelta(minutes=settings.STOCK_RESERVATION_MINUTES)
+    StockReservation.objects.bulk_create([
+        StockReservation(order=order, product_id=product_id, quantity=quantity, expires_at=expires_at)
+        for product_id, quantity in quantities.items()
+    ])
+
+    # Product pages and carts show the stock; refresh them once something sells out
+    if Product.objects.filter(pk__in=quantities, stock=0).exists():
+        invalidate_on_commit('products', 'home', 'carts')
+
+def release_reservations(order_ids):
+    """Give the stock of live reservations back to the products; safe to call twice"""
+    with transaction.atomic():
+        reservations = list(
+            StockReservation.objects.select_for_update()
+            .filter(order_id__in=order_ids, status='reserved')
+            .values_list('id', 'product_id', 'quantity')
+        )
+        if not reservations:
+            return 0
+
+        quantities = defaultdict(int)
+        for _, product_id, quantity in reservations:
+            quantities[product_id] += quantity
+        StockReservation.objects.filter(pk__in=[pk for pk, _, _ in reservations]).update(status='released')
+        for product_id in sorted(quantities):
+            Product.objects.filter(pk=product_id).update(stock=F('stock') + quantities[product_id])
+        invalidate_on_commit('products', 'home', 'carts')
+    return len(reservations)
+
+def commit_reservations(order_ids):
+    """The orders are paid (or fulfilled by hand): the stock is sold for good"""
+    return StockReservation.objects.filter(order_id__in=order_ids, status='reserved').update(status='committed')
@@ -1,3 +1,159 @@
-from django.test import TestCase
+# orders/tests.py
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, tag
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import User
+from carts.models import Cart
+from coupons.models import Coupon, CouponRedemption
+from payments.notifications import ORDER_PAID
+from products.models import Product
+from .checkout import create_order_from_cart
+from .models import Order, OrderItem, StockReservation
+from .stock import OutOfStock
 
-# Create your tests here.
+class OrderHistoryQueryTests(TestCase):
+    """A history page costs the same queries however many items its orders hold"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='buyer', email='buyer@example.com')
+        products = [
+            Product.objects.create(
+                title=f'Product {i}', slug=f'product-{i}', description='-', category='sembako',
+                thumbnail='product_images/test.jpg', price=10000, stock=100,
+            )
+            for i in range(6)
+        ]
+        # 25 orders of 1 to 6 items: one full page of 20 and a second page of 5
+        for i in range(25):
+            order = Order.objects.create(user=cls.user, total_price=10000)
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, product=product, quantity=1, price=product.price)
+                for product in products[:i % 6 + 1]
+            ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_first_and_second_page_take_two_queries_each(self):
+        with self.assertNumQueries(2):  # The orders, then all their items with product titles
+            first = self.client.get('/api/orders/', secure=True).json()
+        self.assertEqual(len(first['results']), 20)
+        self.assertIsNone(first['previous'])
+
+        with self.assertNumQueries(2):
+            second = self.client.get(first['next'], secure=True).json()
+        self.assertEqual(len(second['results']), 5)
+        self.assertIsNone(second['next'])
+
+        seen = [order['id'] for order in first['results'] + second['results']]
+        self.assertEqual(seen, list(Order.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+        self.assertEqual(
+            sum(len(order['items']) for order in first['results'] + second['results']),
+            OrderItem.objects.count(),
+        )
+
+class DeleteOrderTests(TestCase):
+    """Deleting an order gives its coupon use back only while it is unpaid"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.user = User.objects.create(username='buyer', email='buyer@example.com')
+        cls.coupon = Coupon.objects.create(
+            code='RAMADAN10', discount=10, valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=1),
+            max_uses=1, uses=1,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def order_with_coupon(self, **fields):
+        order = Order.objects.create(user=self.user, total_price=90000, **fields)
+        CouponRedemption.objects.create(coupon=self.coupon, user=self.user, order=order, amount=10000)
+        return order
+
+    def delete(self, order):
+        return self.client.delete('/api/orders/create-order/', {'id': order.id}, format='json', secure=True)
+
+    def test_pending_order_releases_its_coupon_use(self):
+        order = self.order_with_coupon()
+        self.assertEqual(self.delete(order).status_code, 204)
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.uses, 0)
+        self.assertFalse(CouponRedemption.objects.exists())
+
+    def test_paid_order_cannot_be_deleted(self):
+        order = self.order_with_coupon(status=ORDER_PAID)
+        self.assertEqual(self.delete(order).status_code, 409)
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.uses, 1)
+        self.assertTrue(Order.objects.filter(pk=order.pk).exists())
+
+    def test_deleting_an_order_elsewhere_keeps_the_use(self):
+        order = self.order_with_coupon(status=ORDER_PAID)
+        order.delete()
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.uses, 1)
+        self.assertIsNone(CouponRedemption.objects.get().order_id)
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """Simultaneous checkouts of one SKU sell exactly the stock on hand, never more"""
+
+    def checkout_in_parallel(self, checkouts, stock):
+        """Returns each buyer's result and the wall-clock seconds from the barrier to the last checkout"""
+        product = Product.objects.create(
+            title='Paket sembako', slug='paket-sembako', description='-', category='sembako',
+            thumbnail='product_images/test.jpg', price=100000, stock=stock,
+        )
+        users = User.objects.bulk_create([
+            User(username=f'buyer-{i}', email=f'buyer-{i}@example.com') for i in range(checkouts)
+        ])
+        Cart.objects.bulk_create([Cart(user=user, product=product, quantity=1) for user in users])
+        barrier = threading.Barrier(len(users), action=lambda: started.append(time.perf_counter()))
+        started = []
+
+        def checkout(user):
+            try:
+                barrier.wait()  # Everyone hits the SKU at the same moment
+                create_order_from_cart(user)
+                return 'ordered'
+            except OutOfStock:
+                return 'out_of_stock'
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            results = list(pool.map(checkout, users))
+        elapsed = time.perf_counter() - started[0]
+
+        product.refresh_from_db()
+        self.assertEqual(results.count('ordered'), stock)
+        self.assertEqual(results.count('out_of_stock'), checkouts - stock)
+        self.assertEqual(product.stock, 0)
+        self.assertEqual(Order.objects.count(), stock)
+        self.assertEqual(sum(StockReservation.objects.values_list('quantity', flat=True)), stock)
+        # Losing buyers keep their carts, winners' carts were turned into orders
+        self.assertEqual(Cart.objects.count(), checkouts - stock)
+        return elapsed
+
+    def test_no_oversell(self):
+        self.checkout_in_parallel(checkouts=20, stock=7)
+
+    @tag('slow')
+    def test_flash_sale_throughput(self):
+        """200 buyers at once for 50 packages; skip with --exclude-tag slow"""
+        checkouts = 200
+        elapsed = self.checkout_in_parallel(checkouts=checkouts, stock=50)
+        sys.stderr.write(
+            f"\n{checkouts} simultaneous checkouts in {elapsed:.2f}s "
+            f"({checkouts / elapsed:.0f} checkouts/s on {connection.vendor})\n"
+        )
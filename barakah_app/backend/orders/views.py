@@ -4,54 +4,53 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
+from coupons.engine import CouponRejected
+from coupons.redemption import release_redemptions
+from payments.notifications import ORDER_PENDING
 from .models import Order, OrderItem
-from carts.models import Cart # Assuming you have a Cart and CartItem model
+from .checkout import create_order_from_cart
+from .pagination import OrderHistoryPagination
+from .stock import OutOfStock, release_reservations
 from .serializers import OrderSerializer, OrderItemSerializer
 
+def order_history(user):
+    """
+    The user's orders with their items and product titles, two queries per
+    page however many orders or items there are
+    """
+    return Order.objects.filter(user=user).prefetch_related(
+        Prefetch(
+            'items',
+            queryset=OrderItem.objects.select_related('product').only(
+                'id', 'order_id', 'product_id', 'quantity', 'price', 'product__title'
+            ),
+        )
+    )
+
 class CreateOrderView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        orders = Order.objects.filter(user=user)
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        paginator = OrderHistoryPagination()
+        page = paginator.paginate_queryset(order_history(request.user), request, view=self)
+        serializer = OrderSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
-        user = request.user
-
-        # Fetch all cart items for the user
-        cart_items = Cart.objects.filter(user=user)
-
-        if not cart_items.exists():
-            return Response({'message': 'Cart is empty'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Create a new order
-        order = Order.objects.create(user=user, total_price=0)  # Initialize total_price as 0
-
-        total_price = 0
-        for cart_item in cart_items:
-            product = cart_item.product
-            quantity = cart_item.quantity
-            price = cart_item.total_price()  # Use the total_price method from the Cart model
-
-            # Create an OrderItem for each cart item
-            OrderItem.objects.create(
-                order=order,
-                product=product,
-                quantity=quantity,
-                price=price
+        # Create the order from the cart and clear the cart, all in one transaction
+        try:
+            order = create_order_from_cart(request.user, request.data.get('coupon'))
+        except OutOfStock as e:
+            return Response(
+                {'message': str(e), 'product': e.product.slug}, status=status.HTTP_409_CONFLICT
             )
-
-            total_price += price
-
-        # Update the total price of the order
-        order.total_price = total_price
-        order.save()
-
-        # Clear the cart after the order is created
-        cart_items.delete()
+        except CouponRejected as e:
+            return Response({'message': str(e), 'reason': e.reason}, status=status.HTTP_400_BAD_REQUEST)
+        if order is None:
+            return Response({'message': 'Cart is empty'}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = OrderSerializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -59,15 +58,26 @@ class CreateOrderView(APIView):
     def delete(self, request):
         user = request.user
         order_id = request.data.get('id')
-        order = get_object_or_404(Order, user=user, id=order_id)
-        order.delete()
+        with transaction.atomic():
+            order = get_object_or_404(Order.objects.select_for_update(), user=user, id=order_id)
+            # Paid orders keep their committed stock and coupon uses, so only unpaid ones can go
+            if order.status != ORDER_PENDING:
+                return Response(
+                    {'message': 'Only unpaid orders can be deleted'}, status=status.HTTP_409_CONFLICT
+                )
+            # Put the reserved stock and coupon uses back before the order goes
+            release_reservations([order.id])
+            release_redemptions([order.id])
+            order.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 class OrderListView(generics.ListAPIView):
     serializer_class = OrderSerializer
+    pagination_class = OrderHistoryPagination
+    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return order_history(self.request.user)
 
 class OrderDetailView(generics.RetrieveAPIView):
     serializer_class = OrderItemSerializer
@@ -1,3 +1,16 @@
+# payments/admin.py
 from django.contrib import admin
+from .models import PaymentNotification, SnapToken
 
-# Register your models here.
+@admin.register(PaymentNotification)
+class PaymentNotificationAdmin(admin.ModelAdmin):
+    list_display = ('order_id', 'kind', 'transaction_status', 'fraud_status', 'received_at', 'processed_at')
+    list_filter = ('kind', 'transaction_status')
+    search_fields = ('order_id', )
+    readonly_fields = ('kind', 'order_id', 'transaction_status', 'fraud_status', 'payload', 'received_at', 'processed_at')
+
+@admin.register(SnapToken)
+class SnapTokenAdmin(admin.ModelAdmin):
+    list_display = ('order_id', 'idempotency_key', 'created_at', 'expires_at')
+    search_fields = ('order_id', 'idempotency_key')
+    raw_id_fields = ('donation', )
@@ -0,0 +1,114 @@
+# payments/fake_midtrans.py
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STATUS_PATH = re.compile(r'^/v2/(?P<order_id>[^/]+)/status$')
+
+class FakeMidtransHandler(BaseHTTPRequestHandler):
+    """Answers the Snap and Core API endpoints used by payments/gateway.py"""
+
+    def do_POST(self):
+        if self.misbehave():
+            return
+        if self.path != '/snap/v1/transactions':
+            return self.reply(404, {'error_messages': ['Not found']})
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            order_id = str(payload['transaction_details']['order_id'])
+            gross_amount = payload['transaction_details']['gross_amount']
+        except (ValueError, KeyError, TypeError):
+            return self.reply(400, {'error_messages': ['transaction_details is required']})
+
+        with self.server.lock:
+            if order_id in self.server.transactions:
+                return self.reply(400, {'error_messages': ['transaction_details.order_id sudah digunakan']})
+            token = uuid.uuid4().hex
+            self.server.transactions[order_id] = {
+                'order_id': order_id,
+                'gross_amount': f'{gross_amount}.00',
+                'transaction_status': self.server.transaction_status,
+                'fraud_status': 'accept',
+                'status_code': '200',
+            }
+        host, port = self.server.server_address[:2]
+        self.reply(201, {'token': token, 'redirect_url': f'http://{host}:{port}/snap/v2/vtweb/{token}'})
+
+    def do_GET(self):
+        if self.misbehave():
+            return
+        match = STATUS_PATH.match(self.path)
+        if not match:
+            return self.reply(404, {'error_messages': ['Not found']})
+        with self.server.lock:
+            transaction = self.server.transactions.get(match['order_id'])
+        if transaction is None:
+            # Like the real Core API: HTTP 200 with the error in the body
+            return self.reply(200, {'status_code': '404', 'status_message': "Transaction doesn't exist."})
+        self.reply(200, transaction)
+
+    def misbehave(self):
+        """Apply the server's latency/error settings, returns True if an error was sent"""
+        with self.server.lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self.reply(503, {'error_messages': ['Service unavailable']})
+            return True
+        return False
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class FakeMidtransServer(ThreadingHTTPServer):
+    """
+    Local stand-in for Midtrans. `latency` delays every answer, `error_rate` is the
+    share of requests answered with HTTP 503, so timeouts, retries and the circuit
+    breaker can be exercised without touching the sandbox.
+    """
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency=0.0, error_rate=0.0,
+                 transaction_status='settlement', verbose=False):
+        super().__init__(address, FakeMidtransHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.transaction_status = transaction_status
+        self.verbose = verbose
+        self.transactions = {}
+        self.requests = 0  # Every request received, retries included
+        self.lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Clients that timed out hang up before the (deliberately slow) answer
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+def start_fake_server(**options):
+    """Start a FakeMidtransServer on a background thread, call .shutdown() when done"""
+    server = FakeMidtransServer(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
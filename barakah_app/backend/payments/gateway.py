@@ -0,0 +1,261 @@
+# payments/gateway.py
+import base64
+import logging
+import threading
+import time
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+SNAP_BASE_URLS = {
+    'sandbox': 'https://app.sandbox.midtrans.com',
+    'production': 'https://app.midtrans.com',
+}
+API_BASE_URLS = {
+    'sandbox': 'https://api.sandbox.midtrans.com',
+    'production': 'https://api.midtrans.com',
+}
+
+# Upstream answers that mean "Midtrans is struggling", not "your request is wrong"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class MidtransError(Exception):
+    """Midtrans rejected the request or answered with something unusable"""
+
+    def __init__(self, message, status_code=None, body=None, sent=True):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+        self.sent = sent  # False if the request never reached Midtrans
+
+    @property
+    def definitely_not_processed(self):
+        """Midtrans cannot have acted on the request: it was never sent, or got a 4xx"""
+        return not self.sent or (self.status_code is not None and 400 <= self.status_code < 500)
+
+class MidtransUnavailable(MidtransError):
+    """Midtrans could not be reached in time, or the circuit breaker is open"""
+
+def never_connected(error):
+    """True if a requests error happened before any connection was made, so nothing was sent"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+class CircuitBreaker:
+    """
+    Per-process breaker: after `failure_threshold` consecutive failures every call
+    fails fast for `reset_timeout` seconds, then a single trial call decides
+    whether to close again or stay open.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return
+        raise MidtransUnavailable(
+            'Payment gateway is temporarily unavailable, please try again shortly', sent=False,
+        )
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def release_trial(self):
+        """Free the half-open trial slot if the call ended without a success or failure"""
+        with self._lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(f"Midtrans circuit opened after {self.failures} consecutive failures")
+                self.opened_at = self.clock()
+
+class MidtransClient:
+    """
+    Thin Midtrans client on a pooled requests.Session.
+
+    Every call has connect and read timeouts. Connection failures are retried for
+    every method, since nothing reached Midtrans yet. Read timeouts and 429/5xx
+    answers are only retried for GET, because a Snap transaction POST is not
+    idempotent. Calls go through a CircuitBreaker so a Midtrans outage fails fast
+    instead of tying up every worker.
+    """
+
+    def __init__(self, server_key, sandbox=True, snap_base_url=None, api_base_url=None,
+                 connect_timeout=3.05, read_timeout=10, max_retries=2, backoff=0.3,
+                 pool_size=10, breaker=None):
+        environment = 'sandbox' if sandbox else 'production'
+        self.snap_base_url = (snap_base_url or SNAP_BASE_URLS[environment]).rstrip('/')
+        self.api_base_url = (api_base_url or API_BASE_URLS[environment]).rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        # Upper bound on one call including every retry and backoff sleep
+        self.max_call_duration = (max_retries + 1) * (connect_timeout + read_timeout) + sum(
+            backoff * 2 ** attempt + backoff for attempt in range(1, max_retries + 1)
+        )
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=30)
+
+        retry = Retry(
+            total=max_retries, connect=max_retries, read=max_retries, status=max_retries,
+            other=0, redirect=0,
+            allowed_methods=frozenset({'GET'}),
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=backoff, backoff_jitter=backoff,
+            # A Retry-After header could hold a worker far past max_call_duration
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        auth = base64.b64encode(f'{server_key}:'.encode()).decode()
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+            'Authorization': f'Basic {auth}',
+        })
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            server_key=settings.MIDTRANS_SERVER_KEY,
+            sandbox=settings.MIDTRANS_SANDBOX,
+            snap_base_url=settings.MIDTRANS_SNAP_BASE_URL,
+            api_base_url=settings.MIDTRANS_API_BASE_URL,
+            connect_timeout=settings.MIDTRANS_CONNECT_TIMEOUT,
+            read_timeout=settings.MIDTRANS_READ_TIMEOUT,
+            max_retries=settings.MIDTRANS_MAX_RETRIES,
+            backoff=settings.MIDTRANS_RETRY_BACKOFF,
+            pool_size=settings.MIDTRANS_POOL_SIZE,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.MIDTRANS_CIRCUIT_FAILURES,
+                reset_timeout=settings.MIDTRANS_CIRCUIT_RESET,
+            ),
+        )
+
+    def create_transaction(self, payload):
+        """Create a Snap transaction, returns {'token': ..., 'redirect_url': ...}"""
+        return self._request('POST', f'{self.snap_base_url}/snap/v1/transactions', json=payload)
+
+    def transaction_status(self, order_id):
+        """Fetch the current status of a transaction from the Core API"""
+        return self._request('GET', f'{self.api_base_url}/v2/{order_id}/status')
+
+    # Async variants for ASGI views. The blocking call runs in a worker thread
+    # (not the shared sync thread) so it still uses the pool, timeouts and breaker
+    async def acreate_transaction(self, payload):
+        return await sync_to_async(self.create_transaction, thread_sensitive=False)(payload)
+
+    async def atransaction_status(self, order_id):
+        return await sync_to_async(self.transaction_status, thread_sensitive=False)(order_id)
+
+    def _request(self, method, url, **kwargs):
+        self.breaker.before_call()
+        try:
+            response = self._send(method, url, **kwargs)
+        finally:
+            # Whatever went wrong, a half-open trial must not stay claimed forever
+            self.breaker.release_trial()
+
+        try:
+            body = response.json()
+        except ValueError:
+            raise MidtransError(
+                f'Unexpected response from payment gateway (HTTP {response.status_code})',
+                status_code=response.status_code, body=response.text,
+            )
+
+        # The Core API reports errors in the body with HTTP 200
+        try:
+            status_code = int(body.get('status_code', response.status_code)) if isinstance(body, dict) else response.status_code
+        except (TypeError, ValueError):
+            raise MidtransError(
+                f'Unexpected status_code from payment gateway: {body.get("status_code")!r}',
+                status_code=response.status_code, body=body,
+            )
+        if response.status_code >= 400 or status_code >= 400:
+            messages = body.get('error_messages') or body.get('status_message') if isinstance(body, dict) else None
+            raise MidtransError(
+                f'Payment gateway rejected the request: {messages or response.status_code}',
+                status_code=status_code, body=body,
+            )
+        return body
+
+    def _send(self, method, url, **kwargs):
+        """Make the HTTP call and report to the breaker whether Midtrans is up"""
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            self.breaker.record_failure()
+            logger.error(f"Midtrans {method} {url} failed after {time.monotonic() - started:.2f}s: {e}")
+            raise MidtransUnavailable(
+                'Payment gateway could not be reached in time',
+                sent=not never_connected(e),
+            ) from e
+
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+            raise MidtransUnavailable(
+                f'Payment gateway error (HTTP {response.status_code})',
+                status_code=response.status_code, body=response.text,
+            )
+        # Midtrans answered, so it is up even if it rejects this particular request
+        self.breaker.record_success()
+        return response
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Process-wide client, so every request shares one connection pool and breaker"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MidtransClient.from_settings()
+    return _client
+
+def reset_client():
+    """Drop the shared client (e.g. after changing settings in tests)"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+        _client = None
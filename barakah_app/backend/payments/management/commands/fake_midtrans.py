@@ -0,0 +1,35 @@
+# payments/management/commands/fake_midtrans.py
+from django.core.management.base import BaseCommand
+from payments.fake_midtrans import FakeMidtransServer
+
+class Command(BaseCommand):
+    help = (
+        "Run a local fake Midtrans (Snap + Core API status) for development and load tests. "
+        "Point MIDTRANS_SNAP_BASE_URL and MIDTRANS_API_BASE_URL at it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8089)
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before every answer')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with HTTP 503 (0-1)')
+        parser.add_argument(
+            '--transaction-status', default='settlement',
+            help='transaction_status reported for created transactions',
+        )
+
+    def handle(self, *args, **options):
+        server = FakeMidtransServer(
+            (options['host'], options['port']),
+            latency=options['latency'],
+            error_rate=options['error_rate'],
+            transaction_status=options['transaction_status'],
+            verbose=options['verbosity'] > 1,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Fake Midtrans listening on {server.base_url}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,25 @@
+# payments/management/commands/process_payment_notifications.py
+import time
+from django.core.management.base import BaseCommand
+from payments.notifications import process_notification_batch
+
+class Command(BaseCommand):
+    help = "Drain the Midtrans notification inbox and apply payment status changes in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new notifications instead of exiting when done',
+        )
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            processed, counts = process_notification_batch(options['batch_size'])
+            if processed:
+                self.stdout.write(f"{processed} notifications: {counts}")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
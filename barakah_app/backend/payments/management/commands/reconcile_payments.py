@@ -0,0 +1,157 @@
+# payments/management/commands/reconcile_payments.py
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from donations.models import Donation
+from orders.models import Order
+from payments.gateway import MidtransError, MidtransUnavailable, get_client
+from payments.notifications import ORDER_PENDING, apply_gateway_outcomes, gateway_outcome
+from transactions.models import LedgerEntry, PaymentState
+
+# Ledger events that only exist for payments that went through Midtrans ('imported'
+# and 'manual' are written for bank transfers too)
+GATEWAY_EVENTS = ['created', 'snap_failed', 'notification', 'status_check', 'reconciliation']
+
+class Command(BaseCommand):
+    help = (
+        "Ask Midtrans for the status of stale pending donations and orders whose "
+        "webhook never arrived, and apply the outcomes in bulk"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=15, metavar='MINUTES',
+            help='Only check payments pending for at least this long',
+        )
+        parser.add_argument(
+            '--expire-after', type=int, default=24, metavar='HOURS',
+            help='Reject payments Midtrans has no transaction for once they are this old (Snap tokens last 24h)',
+        )
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument(
+            '--workers', type=int, default=settings.MIDTRANS_POOL_SIZE,
+            help='Concurrent status requests (defaults to the HTTP pool size)',
+        )
+        parser.add_argument('--kind', choices=['donation', 'order'], action='append', dest='kinds')
+        parser.add_argument('--dry-run', action='store_true', help='Query Midtrans but write nothing')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        self.options = options
+        self.expire_before = now - timedelta(hours=options['expire_after'])
+        self.latencies = []
+        self.stats = {'checked': 0, 'unchanged': 0, 'not_found': 0, 'errors': 0}
+        self.applied = {}
+        started = time.monotonic()
+
+        cutoff = now - timedelta(minutes=options['older_than'])
+        kinds = options['kinds'] or ['donation', 'order']
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1)) as pool:
+            self.pool = pool
+            try:
+                if 'donation' in kinds:
+                    donations = Donation.objects.filter(
+                        payment_method='midtrans', payment_status='pending', created_at__lt=cutoff,
+                    ).values_list('id', 'campaign_id', 'created_at')
+                    for batch in self.batches(donations):
+                        self.reconcile('donation', {
+                            f'D{pk}-C{campaign_id}': created for pk, campaign_id, created in batch
+                        })
+                if 'order' in kinds:
+                    # Orders carry no payment method, so only sweep the ones Midtrans has seen
+                    gateway_history = LedgerEntry.objects.filter(
+                        source_type='order', source_id=OuterRef('pk'), event__in=GATEWAY_EVENTS,
+                    )
+                    gateway_state = PaymentState.objects.filter(
+                        source_type='order', source_id=OuterRef('pk'),
+                    ).exclude(gateway_status='')
+                    orders = Order.objects.filter(
+                        Exists(gateway_history) | Exists(gateway_state),
+                        status=ORDER_PENDING, created_at__lt=cutoff,
+                    ).values_list('id', 'order_number', 'created_at')
+                    for batch in self.batches(orders):
+                        self.reconcile('order', {order_number: created for _, order_number, created in batch})
+            except MidtransUnavailable as e:
+                self.stderr.write(self.style.ERROR(f"Stopping early, Midtrans is unavailable: {e}"))
+
+        self.summary(time.monotonic() - started)
+
+    def batches(self, queryset):
+        """Keyset pagination on the primary key, which is the first value of every row"""
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:self.options['batch_size']])
+            if not batch:
+                return
+            yield batch
+            last_pk = batch[-1][0]
+
+    def fetch_status(self, order_id):
+        started = time.monotonic()
+        try:
+            return order_id, get_client().transaction_status(order_id), None
+        except MidtransUnavailable:
+            raise
+        except MidtransError as e:
+            return order_id, None, e
+        finally:
+            self.latencies.append(time.monotonic() - started)
+
+    def reconcile(self, kind, created_at_by_order_id):
+        outcomes = {}
+        try:
+            for order_id, status_response, error in self.pool.map(self.fetch_status, created_at_by_order_id):
+                self.stats['checked'] += 1
+                if error is not None:
+                    if error.status_code == 404:
+                        self.stats['not_found'] += 1
+                        # The payer never opened Snap, or the token expired before they paid
+                        if created_at_by_order_id[order_id] < self.expire_before:
+                            outcomes[order_id] = ('failed', {'status_code': '404'})
+                    else:
+                        self.stats['errors'] += 1
+                        self.stderr.write(f"{order_id}: {error}")
+                    continue
+
+                outcome = gateway_outcome(status_response.get('transaction_status'), status_response.get('fraud_status'))
+                if outcome:
+                    outcomes[order_id] = (outcome, status_response)
+                else:
+                    self.stats['unchanged'] += 1
+        finally:
+            # Also keep what was learned before Midtrans became unavailable mid-batch
+            self.apply(kind, outcomes)
+
+    def apply(self, kind, outcomes):
+        if not outcomes:
+            return
+        if self.options['dry_run']:
+            counts = {}
+            for outcome, _ in outcomes.values():
+                counts[f'{outcome} (dry run)'] = counts.get(f'{outcome} (dry run)', 0) + 1
+        else:
+            counts = apply_gateway_outcomes(kind, outcomes, 'reconciliation')
+        for status, count in counts.items():
+            self.applied[f'{kind} {status}'] = self.applied.get(f'{kind} {status}', 0) + count
+
+    def summary(self, elapsed):
+        stats = self.stats
+        self.stdout.write(
+            f"Checked {stats['checked']} payments in {elapsed:.1f}s "
+            f"({stats['checked'] / elapsed if elapsed else 0:.1f}/s): "
+            f"{stats['unchanged']} still pending, {stats['not_found']} unknown to Midtrans, {stats['errors']} errors"
+        )
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(
+                f"Midtrans latency: median {statistics.median(latencies) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms"
+            )
+        for name, count in sorted(self.applied.items()):
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"{sum(self.applied.values())} payments reconciled."))
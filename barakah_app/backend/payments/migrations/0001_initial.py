@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('donation', 'Donation'), ('order', 'Order')], max_length=20)),
+                ('order_id', models.CharField(max_length=64)),
+                ('transaction_status', models.CharField(max_length=30)),
+                ('fraud_status', models.CharField(blank=True, max_length=30)),
+                ('payload', models.JSONField()),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['id'], name='payment_notification_inbox_idx')],
+            },
+        ),
+    ]
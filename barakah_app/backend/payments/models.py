@@ -1,3 +1,51 @@
+# payments/models.py
 from django.db import models
 
-# Create your models here.
+class PaymentNotification(models.Model):
+    """
+    Append-only inbox of Midtrans HTTP notifications.
+
+    The webhook only verifies the signature and inserts a row; the
+    `process_payment_notifications` command applies them in batches.
+    """
+    KIND_CHOICES = [
+        ('donation', 'Donation'),
+        ('order', 'Order'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    order_id = models.CharField(max_length=64)  # Midtrans order_id, e.g. D12-C3 or ORD-001-0001
+    transaction_status = models.CharField(max_length=30)
+    fraud_status = models.CharField(max_length=30, blank=True)
+    payload = models.JSONField()  # Raw notification body, kept for auditing and replays
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # The worker only ever scans the unprocessed tail of the inbox
+            models.Index(
+                fields=['id'], name='payment_notification_inbox_idx',
+                condition=models.Q(processed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.order_id}: {self.transaction_status}"
+
+class SnapToken(models.Model):
+    """
+    Snap token issued for a donation, reused for repeated "pay" clicks that
+    carry the same Idempotency-Key until it expires.
+    """
+    idempotency_key = models.CharField(max_length=64, unique=True)
+    fingerprint = models.CharField(max_length=64)  # SHA-256 of the request that first used the key
+    donation = models.ForeignKey('donations.Donation', on_delete=models.CASCADE, related_name='snap_tokens')
+    order_id = models.CharField(max_length=64)  # Midtrans order_id
+    token = models.CharField(max_length=64, blank=True)  # Empty while the Snap call is in flight
+    redirect_url = models.URLField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.order_id} ({self.idempotency_key})"
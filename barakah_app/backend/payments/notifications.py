@@ -0,0 +1,212 @@
+# payments/notifications.py
+import hashlib
+import hmac
+import logging
+import re
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from coupons.redemption import release_redemptions
+from donations.models import Donation
+from donations.totals import COUNTED_STATUS, apply_campaign_delta
+from orders.models import Order
+from orders.stock import commit_reservations, release_reservations
+from transactions.ledger import donation_entry, order_entry, record_events
+from .models import PaymentNotification
+from .status import forget_transaction_statuses
+
+logger = logging.getLogger(__name__)
+
+# Donation order ids are generated as D{donation_id}-C{campaign_id}
+DONATION_ORDER_ID = re.compile(r'^D(?P<donation_id>\d+)-C(?P<campaign_id>\d+)$')
+
+FAILED_STATUSES = ('cancel', 'deny', 'expire', 'failure')
+
+# Order.status values used for gateway outcomes; fulfilment statuses are never touched
+ORDER_PENDING, ORDER_PAID, ORDER_CANCELLED = 'Pending', 'Paid', 'Cancelled'
+
+def verify_signature(payload):
+    """Check Midtrans' signature_key: SHA512(order_id + status_code + gross_amount + server key)"""
+    raw = ''.join(str(payload.get(field, '')) for field in ('order_id', 'status_code', 'gross_amount'))
+    expected = hashlib.sha512((raw + settings.MIDTRANS_SERVER_KEY).encode()).hexdigest()
+    return hmac.compare_digest(expected, str(payload.get('signature_key', '')))
+
+def record_notification(kind, payload):
+    """Append a verified notification to the inbox, nothing else happens in the request"""
+    return PaymentNotification.objects.create(
+        kind=kind,
+        order_id=str(payload.get('order_id', ''))[:64],
+        transaction_status=str(payload.get('transaction_status', ''))[:30],
+        fraud_status=str(payload.get('fraud_status') or '')[:30],
+        payload=payload,
+    )
+
+def gateway_outcome(transaction_status, fraud_status):
+    """'paid', 'failed' or None (still in flight / nothing to apply)"""
+    if transaction_status == 'settlement':
+        return 'paid'
+    if transaction_status == 'capture':
+        return 'paid' if fraud_status == 'accept' else None
+    if transaction_status in FAILED_STATUSES:
+        return 'failed'
+    return None
+
+def latest_outcomes(notifications):
+    """
+    Collapse a batch to one outcome per (kind, order_id).
+
+    Midtrans retries and sends one notification per status change, so a burst
+    holds many rows per order; the newest row that carries an outcome wins.
+    """
+    outcomes = {}
+    for notification in sorted(notifications, key=lambda n: n.pk):
+        outcome = gateway_outcome(notification.transaction_status, notification.fraud_status)
+        if outcome:
+            outcomes[(notification.kind, notification.order_id)] = (outcome, notification.payload)
+    return outcomes
+
+def apply_donation_outcomes(outcomes, now):
+    """Bulk-apply gateway outcomes to donations, returns {'verified': n, 'rejected': n}"""
+    wanted = {}
+    for order_id, (outcome, payload) in outcomes.items():
+        match = DONATION_ORDER_ID.match(order_id)
+        if match:
+            wanted[int(match['donation_id'])] = (outcome, payload)
+        else:
+            logger.warning(f"Ignoring notification with unknown donation order_id: {order_id}")
+
+    to_verify, to_reject, deltas = [], [], defaultdict(Decimal)
+    # Locked so the statuses read here are still the ones the deltas are computed from
+    donations = (
+        Donation.objects.filter(pk__in=wanted).order_by('pk').select_for_update()
+        .values_list('id', 'campaign_id', 'amount', 'payment_status')
+    )
+    for donation_id, campaign_id, amount, payment_status in donations:
+        outcome, payload = wanted[donation_id]
+        if outcome == 'paid':
+            try:
+                paid = Decimal(str(payload.get('gross_amount')))
+            except InvalidOperation:
+                paid = None
+            if paid != amount:
+                logger.error(f"Donation {donation_id}: paid {payload.get('gross_amount')} but pledged {amount}, not verifying")
+                continue
+            if payment_status != COUNTED_STATUS:
+                to_verify.append(donation_id)
+                deltas[campaign_id] += amount
+        elif payment_status == 'pending':
+            # Never un-verify: a failure after a settlement is a stale retry
+            to_reject.append(donation_id)
+
+    verified = Donation.objects.filter(pk__in=to_verify).update(payment_status=COUNTED_STATUS, updated_at=now)
+    rejected = Donation.objects.filter(pk__in=to_reject).update(payment_status='rejected', updated_at=now)
+    # Bulk updates skip the Donation signals, so shift the totals here; only
+    # recompute_campaign_totals re-aggregates, for drift repair
+    for campaign_id, delta in sorted(deltas.items()):
+        apply_campaign_delta(campaign_id, delta)
+    return {'verified': verified, 'rejected': rejected}
+
+def apply_order_outcomes(outcomes, now):
+    """
+    Bulk-apply gateway outcomes to orders still waiting for payment. Paid
+    orders keep their reserved stock, failed ones give it and their coupon
+    use back.
+    """
+    paid = [order_id for order_id, (outcome, _) in outcomes.items() if outcome == 'paid']
+    failed = [order_id for order_id, (outcome, _) in outcomes.items() if outcome == 'failed']
+    pending = Order.objects.filter(status=ORDER_PENDING)
+    paid_ids = list(pending.filter(order_number__in=paid).values_list('id', flat=True))
+    failed_ids = list(pending.filter(order_number__in=failed).values_list('id', flat=True))
+
+    counts = {
+        'paid': pending.filter(pk__in=paid_ids).update(status=ORDER_PAID, updated_at=now),
+        'cancelled': pending.filter(pk__in=failed_ids).update(status=ORDER_CANCELLED, updated_at=now),
+    }
+    commit_reservations(paid_ids)
+    release_reservations(failed_ids)
+    release_redemptions(failed_ids)
+    return counts
+
+def record_gateway_events(kind, events, event):
+    """
+    Append one ledger entry per (order_id, transaction_status, payload) event,
+    snapshotting the payment's status after the batch was applied.
+    """
+    if kind == 'donation':
+        ids = {}
+        for order_id, _, _ in events:
+            match = DONATION_ORDER_ID.match(order_id)
+            if match:
+                ids[order_id] = int(match['donation_id'])
+        donations = Donation.objects.filter(pk__in=ids.values()).only(
+            'id', 'campaign_id', 'payment_method', 'payment_status', 'amount'
+        ).in_bulk()
+        sources = {order_id: donations.get(pk) for order_id, pk in ids.items()}
+        make_entry = donation_entry
+    else:
+        sources = Order.objects.filter(order_number__in=[order_id for order_id, _, _ in events]).only(
+            'id', 'order_number', 'status', 'total_price'
+        ).in_bulk(field_name='order_number')
+        make_entry = order_entry
+
+    entries = []
+    for order_id, transaction_status, payload in events:
+        source = sources.get(order_id)
+        if source is not None:
+            entries.append(make_entry(source, event, gateway_status=transaction_status, payload=payload))
+    return record_events(entries)
+
+def apply_gateway_outcomes(kind, outcomes, event):
+    """Apply outcomes from a status check or reconciliation and record them in the ledger"""
+    apply_outcomes = apply_donation_outcomes if kind == 'donation' else apply_order_outcomes
+    with transaction.atomic():
+        counts = apply_outcomes(outcomes, timezone.now())
+        record_gateway_events(kind, [
+            (order_id, payload.get('transaction_status', ''), payload)
+            for order_id, (_, payload) in outcomes.items()
+        ], event)
+    return counts
+
+def process_notification_batch(batch_size=500):
+    """
+    Drain up to batch_size unprocessed notifications in one transaction.
+
+    Rows are claimed with SKIP LOCKED where supported, so several workers can
+    drain the inbox side by side. Returns (rows processed, per-kind counts).
+    """
+    with transaction.atomic():
+        notifications = list(
+            PaymentNotification.objects.filter(processed_at__isnull=True)
+            .order_by('pk')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        if not notifications:
+            return 0, {}
+
+        outcomes = latest_outcomes(notifications)
+        now = timezone.now()
+        counts = {
+            'donation': apply_donation_outcomes(
+                {order_id: value for (kind, order_id), value in outcomes.items() if kind == 'donation'}, now
+            ),
+            'order': apply_order_outcomes(
+                {order_id: value for (kind, order_id), value in outcomes.items() if kind == 'order'}, now
+            ),
+        }
+
+        # Every distinct gateway event goes to the ledger, Midtrans' retries only once
+        events = {}
+        for n in notifications:
+            events.setdefault((n.kind, n.order_id, n.transaction_status, n.fraud_status), n)
+        for kind in ('donation', 'order'):
+            record_gateway_events(kind, [
+                (n.order_id, n.transaction_status, n.payload) for n in events.values() if n.kind == kind
+            ], 'notification')
+
+        PaymentNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(processed_at=now)
+        # Status polls must not keep answering 'pending' from the cache after this
+        settled = [order_id for _, order_id in outcomes]
+        transaction.on_commit(lambda: forget_transaction_statuses(settled))
+    return len(notifications), counts
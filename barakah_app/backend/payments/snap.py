@@ -0,0 +1,123 @@
+# payments/snap.py
+import hashlib
+import time
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from donations.models import Donation
+from transactions.ledger import donation_entry, record_event
+from .gateway import MidtransError, get_client
+from .models import SnapToken
+
+# Stop handing out a token a little before Midtrans expires it
+EXPIRY_MARGIN = timedelta(minutes=2)
+
+class IdempotencyConflict(Exception):
+    def __init__(self, message, status=409):
+        super().__init__(message)
+        self.status = status
+
+def request_fingerprint(campaign, amount, donor_name, donor_phone):
+    raw = f'{campaign.pk}|{amount}|{donor_name}|{donor_phone}'
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def wait_for_token(snap_token):
+    """Another request holds the key and is still talking to Midtrans; wait for its token"""
+    deadline = time.monotonic() + settings.MIDTRANS_CONNECT_TIMEOUT + settings.MIDTRANS_READ_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        snap_token = SnapToken.objects.select_related('donation').filter(pk=snap_token.pk).first()
+        if snap_token is None:
+            break  # The other request failed and released the key
+        if snap_token.token:
+            return snap_token
+    raise IdempotencyConflict('Payment is still being prepared, please try again')
+
+def issue_donation_token(idempotency_key, campaign, amount, donor_name, donor_phone):
+    """
+    Return (snap_token, reused) for a Midtrans donation.
+
+    A repeated request with the same Idempotency-Key gets the stored token of
+    its pending donation back without touching Midtrans or inserting another
+    Donation. Only an expired or failed attempt gets a fresh donation and token.
+    """
+    fingerprint = request_fingerprint(campaign, amount, donor_name, donor_phone)
+    idempotency_key = idempotency_key or uuid.uuid4().hex
+
+    existing = SnapToken.objects.select_related('donation').filter(idempotency_key=idempotency_key).first()
+    if existing:
+        if existing.fingerprint != fingerprint:
+            raise IdempotencyConflict('Idempotency-Key was already used for a different donation', status=422)
+        if not existing.token:
+            existing = wait_for_token(existing)
+        if existing.donation.payment_status == 'verified':
+            raise IdempotencyConflict('This donation has already been paid')
+        if existing.donation.payment_status == 'pending' and existing.expires_at > timezone.now():
+            return existing, True
+
+    try:
+        with transaction.atomic():
+            donation = Donation.objects.create(
+                campaign=campaign,
+                donor_name=donor_name,
+                donor_phone=donor_phone,
+                amount=amount,
+                payment_method='midtrans',
+                payment_status='pending'
+            )
+            record_event(donation_entry(donation, 'created'))
+            order_id = f'D{donation.id}-C{campaign.id}'
+
+            if existing:
+                # Expired or rejected attempt: move the key over to the new donation,
+                # unless a concurrent request already did
+                claimed = SnapToken.objects.filter(pk=existing.pk, token=existing.token).update(
+                    donation=donation, order_id=order_id, token='', redirect_url='', expires_at=None,
+                )
+                if not claimed:
+                    raise IntegrityError('Idempotency-Key claimed by a concurrent request')
+                snap_token = SnapToken.objects.get(pk=existing.pk)
+            else:
+                snap_token = SnapToken.objects.create(
+                    idempotency_key=idempotency_key, fingerprint=fingerprint,
+                    donation=donation, order_id=order_id,
+                )
+    except IntegrityError:
+        # Lost the race for this key: serve the winner's token instead
+        winner = SnapToken.objects.select_related('donation').filter(idempotency_key=idempotency_key).first()
+        if winner is None:
+            raise IdempotencyConflict('Payment is still being prepared, please try again')
+        if not winner.token:
+            winner = wait_for_token(winner)
+        return winner, True
+
+    issued_at = timezone.now()
+    try:
+        response = get_client().create_transaction({
+            'transaction_details': {'order_id': order_id, 'gross_amount': amount},
+            'customer_details': {'first_name': donor_name, 'phone': donor_phone},
+            'expiry': {'unit': 'minutes', 'duration': settings.MIDTRANS_SNAP_EXPIRY_MINUTES},
+        })
+    except Exception as e:
+        # Release the key so the client can retry
+        with transaction.atomic():
+            SnapToken.objects.filter(pk=snap_token.pk).delete()
+            if isinstance(e, MidtransError) and e.definitely_not_processed:
+                # No transaction exists at Midtrans, so this donation can never be paid
+                rejected = Donation.objects.filter(pk=donation.pk, payment_status='pending').update(
+                    payment_status='rejected', updated_at=timezone.now(),
+                )
+                if rejected:
+                    donation.payment_status = 'rejected'
+                    record_event(donation_entry(donation, 'snap_failed', payload={'error': str(e)}))
+            # Otherwise the donation stays pending: if Midtrans did create the
+            # transaction, reconcile_payments picks it up
+        raise
+
+    snap_token.token = response['token']
+    snap_token.redirect_url = response['redirect_url']
+    snap_token.expires_at = issued_at + timedelta(minutes=settings.MIDTRANS_SNAP_EXPIRY_MINUTES) - EXPIRY_MARGIN
+    snap_token.save(update_fields=['token', 'redirect_url', 'expires_at'])
+    return snap_token, False
@@ -0,0 +1,59 @@
+# payments/status.py
+import math
+import time
+from django.conf import settings
+from django.core.cache import cache
+from .gateway import MidtransError, get_client
+
+# The Core API knows nothing of a transaction until the donor picks a payment
+# method in Snap, and answers 404 until then; that is still just pending
+NOT_FOUND_STATUS = {'status_code': '404', 'transaction_status': 'pending'}
+
+def status_key(order_id):
+    return f'payments:status:{order_id}'
+
+def lock_key(order_id):
+    return f'payments:status-lock:{order_id}'
+
+def cached_transaction_status(order_id):
+    """
+    Midtrans transaction status for order_id, fetched at most once per
+    PAYMENT_STATUS_CACHE_TTL seconds.
+
+    Concurrent polls for the same order are coalesced: the first caller takes a
+    short cache lock and asks Midtrans, the others wait for its answer to land
+    in the cache. Returns None if that answer does not arrive in time, so the
+    caller can fall back to the locally stored status. Polls only coalesce
+    across workers through a shared cache (see CACHES in settings).
+    """
+    key = status_key(order_id)
+    status = cache.get(key)
+    if status is not None:
+        return status
+
+    client = get_client()
+    # Held for as long as the fetch can take, retries and backoff included
+    if cache.add(lock_key(order_id), 1, timeout=math.ceil(client.max_call_duration)):
+        try:
+            try:
+                status = client.transaction_status(order_id)
+            except MidtransError as e:
+                if e.status_code != 404:
+                    raise
+                status = NOT_FOUND_STATUS
+            cache.set(key, status, timeout=settings.PAYMENT_STATUS_CACHE_TTL)
+            return status
+        finally:
+            cache.delete(lock_key(order_id))
+
+    deadline = time.monotonic() + settings.PAYMENT_STATUS_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        status = cache.get(key)
+        if status is not None:
+            return status
+    return None
+
+def forget_transaction_statuses(order_ids):
+    """Drop the cached statuses, e.g. once a webhook has settled the payments"""
+    cache.delete_many([status_key(order_id) for order_id in order_ids])
@@ -1,3 +1,264 @@
-from django.test import TestCase
+# payments/tests.py
+from datetime import timedelta
+from decimal import Decimal
+import threading
+import time
+from io import StringIO
+from unittest import mock
+import requests
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from accounts.models import User
+from campaigns.models import Campaign
+from donations.models import Donation
+from orders.models import Order
+from transactions.ledger import order_entry, record_event
+from .fake_midtrans import start_fake_server
+from .gateway import CircuitBreaker, MidtransClient, MidtransError, MidtransUnavailable, reset_client
+from .notifications import ORDER_PAID, ORDER_PENDING, apply_donation_outcomes
 
-# Create your tests here.
+class ApplyDonationOutcomesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.campaign = Campaign.objects.create(
+            title='Bantu yatim', slug='bantu-yatim', category='yatim',
+            thumbnail='campaign_images/test.jpg', target_amount=1000000, current_amount=50000,
+        )
+        cls.donations = [
+            Donation.objects.create(
+                campaign=cls.campaign, amount=amount, donor_name='Hamba Allah', donor_phone='0811',
+                payment_method='midtrans',
+            )
+            for amount in (10000, 25000, 40000)
+        ]
+
+    def outcome(self, donation, outcome, gross_amount=None):
+        payload = {'gross_amount': str(gross_amount or donation.amount)}
+        return f'D{donation.id}-C{self.campaign.id}', (outcome, payload)
+
+    def test_verified_amounts_are_added_as_one_delta(self):
+        first, second, third = self.donations
+        outcomes = dict([self.outcome(first, 'paid'), self.outcome(second, 'paid'), self.outcome(third, 'failed')])
+        with self.assertNumQueries(4):  # Read, two status UPDATEs, one campaign UPDATE
+            counts = apply_donation_outcomes(outcomes, timezone.now())
+        self.assertEqual(counts, {'verified': 2, 'rejected': 1})
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.current_amount, Decimal('85000'))
+
+    def test_repeated_settlement_is_counted_once(self):
+        outcomes = dict([self.outcome(self.donations[0], 'paid')])
+        apply_donation_outcomes(outcomes, timezone.now())
+        apply_donation_outcomes(outcomes, timezone.now())
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.current_amount, Decimal('60000'))
+
+    def test_amount_mismatch_is_not_verified(self):
+        outcomes = dict([self.outcome(self.donations[0], 'paid', gross_amount=1)])
+        apply_donation_outcomes(outcomes, timezone.now())
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.current_amount, Decimal('50000'))
+
+class MidtransClientTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=lambda: self.now)
+        self.client = MidtransClient('server-key', max_retries=0, breaker=self.breaker)
+
+    def respond(self, content, status_code=200):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        return mock.patch.object(self.client.session, 'request', return_value=response)
+
+    def test_unexpected_error_releases_the_half_open_trial(self):
+        self.breaker.record_failure()
+        self.now = 31
+        with mock.patch.object(self.client.session, 'request', side_effect=TypeError('not serializable')):
+            with self.assertRaises(TypeError):
+                self.client.transaction_status('D1-C1')
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.trial_running)
+        with self.respond(b'{"status_code": "200", "transaction_status": "settlement"}'):
+            self.client.transaction_status('D1-C1')  # The next call gets the trial
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_malformed_status_code_is_a_midtrans_error(self):
+        with self.respond(b'{"status_code": "abc"}'):
+            with self.assertRaises(MidtransError):
+                self.client.transaction_status('D1-C1')
+
+    def test_body_status_code_404_is_reported(self):
+        with self.respond(b'{"status_code": "404", "status_message": "Transaction doesn\'t exist."}'):
+            with self.assertRaises(MidtransError) as raised:
+                self.client.transaction_status('D1-C1')
+        self.assertEqual(raised.exception.status_code, 404)
+
+class MidtransClientSocketTests(SimpleTestCase):
+    """Timeouts, retries and the breaker against the fake Midtrans server over real sockets"""
+
+    def setUp(self):
+        self.server = start_fake_server()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.now = 0
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: self.now)
+
+    def midtrans(self, **options):
+        options = {'max_retries': 2, 'backoff': 0, 'read_timeout': 1, **options}
+        client = MidtransClient(
+            'server-key', snap_base_url=self.server.base_url, api_base_url=self.server.base_url,
+            breaker=self.breaker, **options,
+        )
+        self.addCleanup(client.session.close)
+        return client
+
+    def test_failing_status_check_is_retried(self):
+        self.server.error_rate = 1
+        with self.assertRaises(MidtransUnavailable) as raised:
+            self.midtrans().transaction_status('D1-C1')
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(self.server.requests, 3)  # The first try and two retries
+
+    def test_failing_snap_request_is_not_retried(self):
+        self.server.error_rate = 1
+        with self.assertRaises(MidtransUnavailable):
+            self.midtrans().create_transaction({'transaction_details': {'order_id': 'D1-C1', 'gross_amount': 10000}})
+        self.assertEqual(self.server.requests, 1)
+
+    def test_slow_answer_times_out(self):
+        self.server.latency = 0.5
+        started = time.monotonic()
+        with self.assertRaises(MidtransUnavailable) as raised:
+            self.midtrans(max_retries=1, read_timeout=0.1).transaction_status('D1-C1')
+        self.assertTrue(raised.exception.sent)  # It may have reached Midtrans
+        self.assertLess(time.monotonic() - started, 0.5 * 2)  # Gave up without waiting for an answer
+        self.assertEqual(self.server.requests, 2)
+
+    def test_breaker_opens_then_lets_one_trial_through(self):
+        client = self.midtrans(max_retries=0)
+        self.server.error_rate = 1
+        for _ in range(2):
+            with self.assertRaises(MidtransUnavailable):
+                client.transaction_status('D1-C1')
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        with self.assertRaises(MidtransUnavailable) as raised:
+            client.transaction_status('D1-C1')
+        self.assertFalse(raised.exception.sent)
+        self.assertEqual(self.server.requests, 2)  # Failed fast without a request
+
+        # Once reset_timeout passes, one slow trial goes out and everyone else still fails fast
+        self.now = 31
+        self.server.error_rate = 0
+        self.server.latency = 0.3
+        self.server.transactions['D1-C1'] = {'order_id': 'D1-C1', 'status_code': '200', 'transaction_status': 'pending'}
+        trial = threading.Thread(target=client.transaction_status, args=('D1-C1',))
+        trial.start()
+        while self.server.requests < 3:
+            time.sleep(0.01)
+        with self.assertRaises(MidtransUnavailable) as raised:
+            client.transaction_status('D1-C1')
+        self.assertFalse(raised.exception.sent)
+        trial.join()
+
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+class CheckDonationPaymentStatusTests(TestCase):
+    def test_legacy_raw_midtrans_status_is_answered(self):
+        campaign = Campaign.objects.create(
+            title='Bantu yatim', slug='bantu-yatim', category='yatim',
+            thumbnail='campaign_images/test.jpg', target_amount=1000000,
+        )
+        donation = Donation.objects.create(
+            campaign=campaign, amount=10000, donor_name='Hamba Allah', donor_phone='0811',
+            payment_method='midtrans',
+        )
+        # Rows written before payment_status was normalized hold the raw Midtrans status
+        Donation.objects.filter(pk=donation.pk).update(payment_status='settlement')
+        response = self.client.get(
+            '/api/payments/check-donation-payment-status/', {'order_id': f'D{donation.id}-C{campaign.id}'}, secure=True,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'success')
+
+class ReconcilePaymentsCommandTests(TestCase):
+    """reconcile_payments against the fake Midtrans server, over real HTTP"""
+
+    def setUp(self):
+        self.server = start_fake_server()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        settings = override_settings(MIDTRANS_API_BASE_URL=self.server.base_url, MIDTRANS_MAX_RETRIES=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        reset_client()  # Pick up the fake server's URL
+        self.addCleanup(reset_client)
+
+        self.campaign = Campaign.objects.create(
+            title='Bantu yatim', slug='bantu-yatim', category='yatim',
+            thumbnail='campaign_images/test.jpg', target_amount=1000000, current_amount=0,
+        )
+        self.user = User.objects.create(username='buyer', email='buyer@example.com')
+
+    def donation(self, amount, age, midtrans=None):
+        donation = Donation.objects.create(
+            campaign=self.campaign, amount=amount, donor_name='Hamba Allah', donor_phone='0811',
+            payment_method='midtrans',
+        )
+        Donation.objects.filter(pk=donation.pk).update(created_at=timezone.now() - age)
+        order_id = f'D{donation.id}-C{self.campaign.id}'
+        if midtrans:
+            self.server.transactions[order_id] = dict(midtrans, order_id=order_id, status_code='200')
+        return donation
+
+    def order(self, midtrans, seen_by_midtrans=True):
+        order = Order.objects.create(user=self.user, total_price=90000)
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        if seen_by_midtrans:
+            record_event(order_entry(order, 'notification', gateway_status='pending'))
+        self.server.transactions[order.order_number] = dict(
+            midtrans, order_id=order.order_number, gross_amount='90000.00', status_code='200',
+        )
+        return order
+
+    def reconcile(self):
+        stdout = StringIO()
+        call_command('reconcile_payments', stdout=stdout, stderr=StringIO())
+        return stdout.getvalue()
+
+    def assertStatuses(self, expected):
+        self.assertEqual(
+            {donation: Donation.objects.get(pk=donation.pk).payment_status for donation in expected}, expected,
+        )
+
+    def test_outcomes_are_applied(self):
+        settled = self.donation(10000, timedelta(hours=1), {'transaction_status': 'settlement', 'gross_amount': '10000.00'})
+        expired = self.donation(25000, timedelta(hours=1), {'transaction_status': 'expire', 'gross_amount': '25000.00'})
+        abandoned = self.donation(40000, timedelta(hours=25))
+        opening = self.donation(40000, timedelta(hours=1))  # Unknown to Midtrans, but may still be paid
+        underpaid = self.donation(50000, timedelta(hours=1), {'transaction_status': 'settlement', 'gross_amount': '1000.00'})
+        fresh = self.donation(60000, timedelta(minutes=5), {'transaction_status': 'settlement', 'gross_amount': '60000.00'})
+
+        output = self.reconcile()
+
+        self.assertStatuses({
+            settled: 'verified', expired: 'rejected', abandoned: 'rejected',
+            opening: 'pending', underpaid: 'pending', fresh: 'pending',
+        })
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.current_amount, Decimal('10000'))
+        self.assertIn('Checked 5 payments', output)
+        self.assertIn('2 unknown to Midtrans', output)
+
+    def test_only_orders_midtrans_has_seen_are_swept(self):
+        paid = self.order({'transaction_status': 'settlement'})
+        bank_transfer = self.order({'transaction_status': 'settlement'}, seen_by_midtrans=False)
+
+        self.reconcile()
+
+        paid.refresh_from_db()
+        bank_transfer.refresh_from_db()
+        self.assertEqual(paid.status, ORDER_PAID)
+        self.assertEqual(bank_transfer.status, ORDER_PENDING)
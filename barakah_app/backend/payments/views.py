@@ -2,21 +2,33 @@
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.http import JsonResponse
-from django.conf import settings
-from midtransclient import Snap
 from donations.models import Donation
 from campaigns.models import Campaign
 from orders.models import Order
+from .gateway import MidtransUnavailable, get_client
+from .notifications import (
+    DONATION_ORDER_ID, ORDER_CANCELLED, ORDER_PENDING, apply_gateway_outcomes, gateway_outcome,
+    record_notification, verify_signature,
+)
+from .snap import IdempotencyConflict, issue_donation_token
+from .status import cached_transaction_status
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize Midtrans Snap client
-snap = Snap(
-    is_production=not settings.MIDTRANS_SANDBOX,  # Use sandbox if MIDTRANS_SANDBOX is True
-    server_key=settings.MIDTRANS_SERVER_KEY,
-    client_key=settings.MIDTRANS_CLIENT_KEY
-)
+# What the payment pending page polls for: 'pending', 'success' or 'failed'
+DONATION_POLL_STATUSES = {
+    'pending': 'pending', 'verified': 'success', 'rejected': 'failed',
+    # Raw Midtrans statuses that older rows stored in payment_status
+    'success': 'success', 'settlement': 'success', 'capture': 'success',
+    'deny': 'failed', 'cancel': 'failed', 'expire': 'failed', 'failure': 'failed',
+}
+ORDER_POLL_STATUSES = {ORDER_PENDING: 'pending', ORDER_CANCELLED: 'failed'}
+
+def gateway_unavailable(error):
+    """Midtrans is slow or down: tell the client to retry instead of a generic 500"""
+    logger.warning(f"Midtrans unavailable: {error}")
+    return JsonResponse({'error': str(error)}, status=503, headers={'Retry-After': '30'})
 
 class GenerateDonationMidtransTokenView(APIView):
     def post(self, request):
@@ -43,44 +55,26 @@ class GenerateDonationMidtransTokenView(APIView):
             except Campaign.DoesNotExist:
                 return JsonResponse({'error': 'Campaign not found'}, status=404)
 
-            # Create a donation record
-            donation = Donation.objects.create(
-                campaign=campaign,
-                donor_name=donor_name,
-                donor_phone=donor_phone,
-                amount=amount,
-                payment_method='midtrans',
-                payment_status='pending'
-            )
-
-            logger.info(f"Donation: {donation}")
+            # Double clicks and retries send the same key and get the same token back
+            idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotencyKey')
+            if idempotency_key and len(idempotency_key) > 64:
+                return JsonResponse({'error': 'Idempotency-Key is too long'}, status=400)
 
-            # Prepare transaction details for Midtrans
-            transaction_details = {
-                'order_id': f'D{donation.id}-C{campaign.id}',  # Unique order ID
-                'gross_amount': amount,
-            }
+            snap_token, reused = issue_donation_token(idempotency_key, campaign, amount, donor_name, donor_phone)
+            logger.info(f"Midtrans token for {snap_token.order_id} ({'reused' if reused else 'new'})")
 
-            customer_details = {
-                'first_name': donor_name,
-                'phone': donor_phone,
-            }
-
-            logger.info(f"Transaction details: {transaction_details}")
-            logger.info(f"Customer details: {customer_details}")
-
-            # Generate payment token
-            transaction = snap.create_transaction({
-                'transaction_details': transaction_details,
-                'customer_details': customer_details,
-            })
-            logger.info(f"Midtrans token: {transaction['token']}")
-
-            return JsonResponse({
-                'token': transaction['token'],
-                'redirect_url': transaction['redirect_url'],  # Redirect URL for Midtrans
-                'order_id': transaction_details['order_id'],  # Return order ID for reference
+            response = JsonResponse({
+                'token': snap_token.token,
+                'redirect_url': snap_token.redirect_url,  # Redirect URL for Midtrans
+                'order_id': snap_token.order_id,  # Return order ID for reference
             })
+            if reused:
+                response['Idempotent-Replayed'] = 'true'
+            return response
+        except IdempotencyConflict as e:
+            return JsonResponse({'error': str(e)}, status=e.status)
+        except MidtransUnavailable as e:
+            return gateway_unavailable(e)
         except Exception as e:
             logger.error(f"Error generating Midtrans token: {str(e)}")
             return JsonResponse({'error': str(e)}, status=500)
@@ -132,7 +126,7 @@ class GenerateOrderMidtransTokenView(APIView):
             logger.info(f"Customer details: {customer_details}")
 
             # Generate payment token
-            transaction = snap.create_transaction({
+            transaction = get_client().create_transaction({
                 'transaction_details': transaction_details,
                 'customer_details': customer_details,
             })
@@ -143,90 +137,76 @@ class GenerateOrderMidtransTokenView(APIView):
                 'redirect_url': transaction['redirect_url'],  # Redirect URL for Midtrans
                 'order_id': transaction_details['order_id'],  # Return order ID for reference
             })
+        except MidtransUnavailable as e:
+            return gateway_unavailable(e)
         except Exception as e:
             logger.error(f"Error generating Midtrans token: {str(e)}")
             return JsonResponse({'error': str(e)}, status=500)
         
-class MidtransDonationNotificationView(APIView):
-    def post(self, request):
-        try:
-            data = request.data  # Use request.data for parsed JSON
-            order_id = data.get('order_id')
-            transaction_status = data.get('transaction_status')
-            fraud_status = data.get('fraud_status')
-
-            # Extract donation ID from order_id
-            donation_id = order_id.split('-')[1]  # Format: DNT-{donation_id}-CPG-{campaign_id}
-
-            # Update donation status based on notification
-            donation = Donation.objects.get(id=donation_id)
-            if transaction_status == 'capture':
-                if fraud_status == 'accept':
-                    donation.payment_status = 'success'
-            elif transaction_status == 'settlement':
-                donation.payment_status = 'success'
-            elif transaction_status in ['cancel', 'deny', 'expire']:
-                donation.payment_status = 'failed'
-            donation.save()
-
-            return JsonResponse({'status': 'ok'})
-        except Donation.DoesNotExist:
-            logger.error(f"Donation not found for order_id: {order_id}")
-            return JsonResponse({'error': 'Donation not found'}, status=404)
-        except Exception as e:
-            logger.error(f"Error processing Midtrans notification: {str(e)}")
-            return JsonResponse({'error': str(e)}, status=500)
+class MidtransNotificationView(APIView):
+    """
+    Fast-ack webhook: verify the signature, append the raw notification to the
+    inbox and answer 200 straight away. `manage.py process_payment_notifications`
+    applies the status changes in batches.
+    """
+    authentication_classes = []
+    permission_classes = []
+    kind = None
 
-class MidtransOrderNotificationView(APIView):
     def post(self, request):
-        try:
-            data = request.data  # Use request.data for parsed JSON
-            order_id = data.get('order_id')
-            transaction_status = data.get('transaction_status')
-            fraud_status = data.get('fraud_status')
+        payload = request.data
+        if not isinstance(payload, dict) or not payload.get('order_id') or not payload.get('transaction_status'):
+            return JsonResponse({'error': 'Invalid notification'}, status=400)
+        if not verify_signature(payload):
+            logger.warning(f"Rejected Midtrans notification with a bad signature for order_id: {payload.get('order_id')}")
+            return JsonResponse({'error': 'Invalid signature'}, status=403)
 
-            # Update order status based on notification
-            try:
-                order = Order.objects.get(order_id=order_id)
-            except Order.DoesNotExist:
-                logger.error(f"Order not found for order_id: {order_id}")
-                return JsonResponse({'error': 'Order not found'}, status=404)
-
-            if transaction_status == 'capture':
-                if fraud_status == 'accept':
-                    order.payment_status = 'success'
-            elif transaction_status == 'settlement':
-                order.payment_status = 'success'
-            elif transaction_status in ['cancel', 'deny', 'expire']:
-                order.payment_status = 'failed'
-            order.save()
-
-            return JsonResponse({'status': 'ok'})
-        except Exception as e:
-            logger.error(f"Error processing Midtrans notification: {str(e)}")
-            return JsonResponse({'error': str(e)}, status=500)
+        record_notification(self.kind, dict(payload))
+        return JsonResponse({'status': 'ok'})
+
+class MidtransDonationNotificationView(MidtransNotificationView):
+    kind = 'donation'
+
+class MidtransOrderNotificationView(MidtransNotificationView):
+    kind = 'order'
         
+def polled_outcome(order_id):
+    """Gateway outcome for a still-pending payment, from the shared status cache"""
+    status_response = cached_transaction_status(order_id)
+    if status_response is None:
+        return None, None
+    transaction_status = status_response.get('transaction_status')
+    outcome = gateway_outcome(transaction_status, status_response.get('fraud_status'))
+    return transaction_status, (outcome, status_response) if outcome else None
+
 class CheckDonationPaymentStatusView(APIView):
+    """
+    Polled by the payment pending page. A donation the webhook already settled
+    is answered from the database; otherwise Midtrans is asked through a
+    short-TTL, coalesced cache and the donation is only written on a transition.
+    """
     def get(self, request):
         try:
             transaction_id = request.GET.get('order_id')
             if not transaction_id:
                 return JsonResponse({'error': 'Order ID is required'}, status=400)
 
-            # Check transaction status from Midtrans
-            status_response = snap.transactions.status(transaction_id)
-            transaction_status = status_response.get('transaction_status')
-
-            # Extract donation ID from order_id
-            donation_id = transaction_id.split('-')[1]  # Format: DNT-{donation_id}-CPG-{campaign_id}
+            match = DONATION_ORDER_ID.match(transaction_id)
+            if not match:
+                return JsonResponse({'error': 'Donation not found'}, status=404)
+            donation = Donation.objects.only('amount', 'payment_method', 'payment_status').get(id=match['donation_id'])
 
-            # Update donation status in database
-            donation = Donation.objects.get(id=donation_id)
-            donation.payment_status = transaction_status
-            donation.save()
+            transaction_status = None
+            if donation.payment_status == 'pending':
+                transaction_status, outcome = polled_outcome(transaction_id)
+                if outcome:
+                    apply_gateway_outcomes('donation', {transaction_id: outcome}, 'status_check')
+                    donation.refresh_from_db(fields=['payment_status'])
 
             return JsonResponse({
-                'status': transaction_status,
+                'status': DONATION_POLL_STATUSES.get(donation.payment_status, 'pending'),
+                'payment_status': donation.payment_status,
+                'transaction_status': transaction_status,
                 'order_id': transaction_id,
                 'amount': donation.amount,
                 'payment_method': donation.payment_method,
@@ -234,6 +214,8 @@ class CheckDonationPaymentStatusView(APIView):
         except Donation.DoesNotExist:
             logger.error(f"Donation not found for order_id: {transaction_id}")
             return JsonResponse({'error': 'Donation not found'}, status=404)
+        except MidtransUnavailable as e:
+            return gateway_unavailable(e)
         except Exception as e:
             logger.error(f"Error checking payment status: {str(e)}")
             return JsonResponse({'error': str(e)}, status=500)
@@ -245,27 +227,28 @@ class CheckOrderPaymentStatusView(APIView):
             if not transaction_id:
                 return JsonResponse({'error': 'Order ID is required'}, status=400)
 
-            # Check transaction status from Midtrans
-            status_response = snap.transactions.status(transaction_id)
-            transaction_status = status_response.get('transaction_status')
-
-            # Extract donation ID from order_id
-            order_id = transaction_id.split('-')[1]  # Format: DNT-{donation_id}-CPG-{campaign_id}
+            order = Order.objects.only('total_price', 'status').get(order_number=transaction_id)
 
-            # Update donation status in database
-            donation = Donation.objects.get(id=order_id)
-            donation.payment_status = transaction_status
-            donation.save()
+            transaction_status = None
+            if order.status == ORDER_PENDING:
+                transaction_status, outcome = polled_outcome(transaction_id)
+                if outcome:
+                    apply_gateway_outcomes('order', {transaction_id: outcome}, 'status_check')
+                    order.refresh_from_db(fields=['status'])
 
             return JsonResponse({
-                'status': transaction_status,
+                'status': ORDER_POLL_STATUSES.get(order.status, 'success'),
+                'order_status': order.status,
+                'transaction_status': transaction_status,
                 'order_id': transaction_id,
-                'amount': donation.amount,
-                'payment_method': donation.payment_method,
+                'amount': order.total_price,
+                'payment_method': 'midtrans',
             })
-        except Donation.DoesNotExist:
+        except Order.DoesNotExist:
             logger.error(f"Order not found for order_id: {transaction_id}")
-            return JsonResponse({'error': 'Donation not found'}, status=404)
+            return JsonResponse({'error': 'Order not found'}, status=404)
+        except MidtransUnavailable as e:
+            return gateway_unavailable(e)
         except Exception as e:
             logger.error(f"Error checking payment status: {str(e)}")
-            return JsonResponse({'error': str(e)}, status=500)        
\ No newline at end of file
+            return JsonResponse({'error': str(e)}, status=500)
@@ -1,9 +1,21 @@
 from django.contrib import admin
 from .models import Product
 
+RATING_FIELDS = ('rating_avg', 'rating_count', 'rating_sum')
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
-    list_display = ('title', 'category', 'is_featured', 'is_active', 'price')
+    list_display = ('title', 'category', 'is_featured', 'is_active', 'price', 'rating_avg', 'rating_count')
     list_filter = ('category', 'is_featured', 'is_active')
     search_fields = ('title', 'description')
-    date_hierarchy = 'created_at'  # Add a date filter for the deadline
\ No newline at end of file
+    date_hierarchy = 'created_at'  # Add a date filter for the deadline
+    readonly_fields = RATING_FIELDS
+
+    def save_model(self, request, obj, form, change):
+        if change:
+            # Leave the rating aggregates to concurrent review writes
+            obj.save(update_fields=[
+                field.name for field in obj._meta.concrete_fields if field.name not in ('id', *RATING_FIELDS)
+            ])
+        else:
+            obj.save()
@@ -42,6 +42,59 @@ class Product(models.Model):
     is_featured = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Review aggregates, kept up to date by reviews/ratings.py
+    rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)  # Lets rating_avg move incrementally
+
+    class Meta:
+        indexes = [
+            # Catalog listings sorted or filtered by rating
+            models.Index(
+                fields=['-rating_avg', '-rating_count'], name='product_active_rating_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title}"   
+
+class ProductPairCount(models.Model):
+    """
+    Number of orders containing both products, with product_a <= product_b.
+    The diagonal (product_a == product_b) holds the product's own order count.
+    Kept so build_related_products can add new orders without rescanning history.
+    """
+    product_a = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    product_b = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    orders = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product_a', 'product_b'], name='product_pair_unique'),
+        ]
+
+class RelatedProduct(models.Model):
+    """One entry of a product's "frequently bought together" list"""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='related_products')
+    related = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()  # 1 is the strongest
+    score = models.FloatField()  # Cosine similarity of the two products' sets of orders
+    orders = models.PositiveIntegerField()  # Orders containing both
+
+    class Meta:
+        constraints = [
+            # Also the index behind /api/products/<slug>/related/
+            models.UniqueConstraint(fields=['product', 'rank'], name='related_product_rank_unique'),
+        ]
+
+class RecommendationBuild(models.Model):
+    """One run of build_related_products; the latest row is the watermark for the next"""
+    last_order_id = models.PositiveBigIntegerField(default=0)  # Orders up to here are counted
+    full = models.BooleanField(default=False)
+    orders_added = models.PositiveIntegerField(default=0)
+    products_updated = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{'Full' if self.full else 'Incremental'} build up to order {self.last_order_id}"
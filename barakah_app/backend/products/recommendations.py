@@ -0,0 +1,143 @@
+# products/recommendations.py
+from datetime import timedelta
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from caching.signals import invalidate_on_commit
+from orders.models import Order, OrderItem
+from payments.notifications import ORDER_CANCELLED
+from .models import Product, ProductPairCount, RecommendationBuild, RelatedProduct
+
+# Orders younger than this may still have a checkout transaction in flight
+# with a lower id; leave them for the next run so the watermark never skips one
+SETTLE_TIME = timedelta(minutes=5)
+
+def order_batches(after_order_id, batch_size, size):
+    """
+    Yield (last_order_id, order_ids, product_ids) for the distinct products of
+    each batch of settled orders after the watermark, keyset-paginated on the
+    order id. Products created after the run started (id >= size) wait for the next one.
+    """
+    settled = Order.objects.filter(created_at__lt=timezone.now() - SETTLE_TIME)
+    last = after_order_id
+    while True:
+        batch = list(settled.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return
+        pairs = np.array(
+            OrderItem.objects.filter(order_id__gt=last, order_id__lte=batch[-1], product_id__lt=size)
+            .exclude(order__status=ORDER_CANCELLED)
+            .values_list('order_id', 'product_id')
+            .distinct(),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        yield batch[-1], pairs[:, 0], pairs[:, 1]
+        last = batch[-1]
+
+def basket_cooccurrence(order_ids, product_ids, size):
+    """Product x product counts of orders containing both; the diagonal counts orders per product"""
+    _, rows = np.unique(order_ids, return_inverse=True)
+    baskets = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, product_ids)), shape=(rows.max() + 1, size)
+    )
+    return (baskets.T @ baskets).tocsr()
+
+def stored_cooccurrence(size):
+    """Rebuild the symmetric count matrix from ProductPairCount"""
+    rows = np.array(ProductPairCount.objects.values_list('product_a', 'product_b', 'orders'), dtype=np.int64)
+    rows = rows.reshape(-1, 3)
+    upper = sparse.csr_matrix((rows[:, 2], (rows[:, 0], rows[:, 1])), shape=(size, size))
+    return (upper + upper.T - sparse.diags(upper.diagonal())).tocsr()
+
+def similarity(counts, active, min_orders):
+    """
+    Cosine similarity C_ij / sqrt(n_i * n_j) for pairs bought together at
+    least min_orders times, with inactive products and the diagonal removed
+    """
+    pairs = counts.multiply(counts >= min_orders).tocsr()
+    pairs.setdiag(0)
+    pairs = pairs.multiply(active[np.newaxis, :]).tocsr()  # Never recommend inactive products
+    pairs.eliminate_zeros()
+    norms = np.sqrt(counts.diagonal().astype(np.float64))
+    norms[norms == 0] = 1
+    inverse = sparse.diags(1 / norms)
+    return (inverse @ pairs @ inverse).tocsr(), pairs
+
+def top_k(scores, pairs, product_ids, k):
+    """RelatedProduct rows for the given products, best k first"""
+    entries = []
+    for product_id in product_ids:
+        start, end = scores.indptr[product_id], scores.indptr[product_id + 1]
+        if start == end:
+            continue
+        columns, values = scores.indices[start:end], scores.data[start:end]
+        # Ties go to the pair bought together most often
+        together = np.asarray(pairs[product_id, columns].todense()).ravel()
+        best = np.lexsort((-together, -values))[:k]
+        entries.extend(
+            RelatedProduct(
+                product_id=product_id, related_id=int(columns[i]), rank=rank,
+                score=float(values[i]), orders=int(together[i]),
+            )
+            for rank, i in enumerate(best, start=1)
+        )
+    return entries
+
+def build_related_products(full=False, top=10, min_orders=2, batch_size=5000):
+    """
+    Count which products are bought together and store each product's top
+    related products.
+
+    Incremental runs only stream the orders added since the last build and
+    rewrite the lists whose scores those orders can change: the products in
+    the new orders and everything paired with them. Orders cancelled after
+    they were counted stay counted until the next full run.
+    """
+    size = (Product.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+    previous = None if full else RecommendationBuild.objects.order_by('-pk').first()
+    watermark = previous.last_order_id if previous else 0
+    full = previous is None
+
+    delta = sparse.csr_matrix((size, size), dtype=np.int64)
+    orders_added = 0
+    for watermark, order_ids, product_ids in order_batches(watermark, batch_size, size):
+        if len(order_ids):
+            delta = delta + basket_cooccurrence(order_ids, product_ids, size)
+            orders_added += len(np.unique(order_ids))
+
+    counts = delta if full else stored_cooccurrence(size) + delta
+    active = np.zeros(size)
+    active[list(Product.objects.filter(is_active=True).values_list('pk', flat=True))] = 1
+    scores, pairs = similarity(counts, active, min_orders)
+
+    if full:
+        affected = np.flatnonzero(np.diff(counts.indptr))
+    else:
+        touched = np.flatnonzero(delta.diagonal())
+        affected = np.union1d(touched, counts[touched].indices)
+
+    with transaction.atomic():
+        changed = sparse.triu(counts if full else counts.multiply(delta != 0)).tocoo()
+        if full:
+            ProductPairCount.objects.all().delete()
+            RelatedProduct.objects.all().delete()
+        ProductPairCount.objects.bulk_create(
+            [
+                ProductPairCount(product_a_id=int(a), product_b_id=int(b), orders=int(n))
+                for a, b, n in zip(changed.row, changed.col, changed.data)
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['product_a', 'product_b'],
+            update_fields=['orders'],
+        )
+        RelatedProduct.objects.filter(product_id__in=affected.tolist()).delete()
+        RelatedProduct.objects.bulk_create(top_k(scores, pairs, affected, top), batch_size=1000)
+        build = RecommendationBuild.objects.create(
+            last_order_id=watermark, full=full, orders_added=orders_added, products_updated=len(affected),
+        )
+        if len(affected):
+            invalidate_on_commit('products')
+    return build
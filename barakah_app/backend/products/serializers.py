@@ -1,9 +1,25 @@
 # campaigns/serializers.py
 from rest_framework import serializers
-from .models import Product
+from .models import Product, RelatedProduct
 
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ['rating_sum']
+        read_only_fields = ['rating_avg', 'rating_count']  # Maintained from reviews
 
+class ProductSummarySerializer(serializers.ModelSerializer):
+    """Product card for listings such as the home page"""
+    class Meta:
+        model = Product
+        fields = [
+            'id', 'title', 'slug', 'category', 'thumbnail', 'price', 'discount',
+            'unit', 'stock', 'is_featured', 'rating_avg', 'rating_count',
+        ]
+
+class RelatedProductSerializer(serializers.ModelSerializer):
+    product = ProductSummarySerializer(source='related', read_only=True)
+
+    class Meta:
+        model = RelatedProduct
+        fields = ['rank', 'score', 'orders', 'product']
@@ -1,3 +1,34 @@
+# products/tests.py
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from .models import Product
 
-# Create your tests here.
+class MinRatingFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for slug, rating in (('beras', '4.50'), ('minyak', '3.00')):
+            Product.objects.create(
+                title=slug, slug=slug, description='-', category='sembako',
+                thumbnail='product_images/test.jpg', price=10000, rating_avg=rating, rating_count=2,
+            )
+
+    def setUp(self):
+        cache.clear()  # Product lists are cached per query string
+        self.client = APIClient()
+
+    def slugs(self, min_rating):
+        response = self.client.get('/api/products/', {'min_rating': min_rating}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return sorted(product['slug'] for product in response.json()['results'])
+
+    def test_filters_by_average(self):
+        self.assertEqual(self.slugs('4'), ['beras'])
+
+    def test_out_of_range_is_clamped(self):
+        self.assertEqual(self.slugs('-3'), ['beras', 'minyak'])
+        self.assertEqual(self.slugs('1e10'), [])
+
+    def test_non_finite_and_garbage_are_ignored(self):
+        for value in ('NaN', 'sNaN', 'Infinity', '-Infinity', 'abc'):
+            self.assertEqual(self.slugs(value), ['beras', 'minyak'])
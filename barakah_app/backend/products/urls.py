@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import ProductViewSet, ProductDetailView
+from .views import ProductViewSet, ProductDetailView, RelatedProductsView
 
 # Endpoint untuk list dan create product
 product_list = ProductViewSet.as_view({
@@ -19,4 +19,5 @@ urlpatterns = [
     path('', product_list, name='product-list'),  # List dan create
     path('<int:pk>/', product_detail, name='product-detail-id'),  # Detail berdasarkan ID
     path('<slug:slug>/', ProductDetailView.as_view(), name='product-detail-slug'),  # Detail berdasarkan slug
+    path('<slug:slug>/related/', RelatedProductsView.as_view(), name='product-related'),  # Sering dibeli bersamaan
 ]
\ No newline at end of file
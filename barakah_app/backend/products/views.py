@@ -1,29 +1,65 @@
 # products/views.py
+from decimal import Decimal, InvalidOperation
 from rest_framework import viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from .models import Product
-from .serializers import ProductSerializer
+from search.mixins import RankedSearchMixin
+from caching.responses import cache_response
+from .models import Product, RelatedProduct
+from .serializers import ProductSerializer, RelatedProductSerializer
+
+MIN_RATING, MAX_RATING = Decimal('0'), Decimal('5')
     
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(RankedSearchMixin, viewsets.ModelViewSet):
+    search_kind = 'product'
     queryset = Product.objects.filter(is_active=True)
     serializer_class = ProductSerializer
     
     def get_queryset(self):
         queryset = Product.objects.filter(is_active=True)
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(description__icontains=search)
-            )
+
+        # Both served by product_active_rating_idx
+        min_rating = self.request.query_params.get('min_rating')
+        if min_rating:
+            try:
+                min_rating = Decimal(min_rating)
+            except InvalidOperation:
+                min_rating = None
+            # NaN and Infinity parse but cannot be compared with a DecimalField
+            if min_rating is not None and min_rating.is_finite():
+                queryset = queryset.filter(rating_avg__gte=min(max(min_rating, MIN_RATING), MAX_RATING))
+        if self.request.query_params.get('ordering') == 'rating':
+            queryset = queryset.order_by('-rating_avg', '-rating_count', '-id')
         return queryset
 
+    @cache_response('products')
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response('products')
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 class ProductDetailView(APIView):
+    @cache_response('products')
     def get(self, request, slug):
         product = get_object_or_404(Product, slug=slug)
         serializer = ProductSerializer(product)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class RelatedProductsView(APIView):
+    """Frequently bought together, precomputed by build_related_products"""
+    @cache_response('products')
+    def get(self, request, slug):
+        # One query: the product's slug index joined to its ranked list
+        related = list(
+            RelatedProduct.objects.filter(product__slug=slug, related__is_active=True)
+            .select_related('related')
+            .order_by('rank')
+        )
+        if not related:
+            get_object_or_404(Product.objects.only('id'), slug=slug)
+        serializer = RelatedProductSerializer(related, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,6 @@
+# reports/apps.py
+from django.apps import AppConfig
+
+class ReportsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'reports'
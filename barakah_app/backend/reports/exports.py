@@ -0,0 +1,135 @@
+# reports/exports.py
+import csv
+import tempfile
+from django.db.models import Count
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from donations.models import Donation
+from orders.models import Order
+
+BATCH_SIZE = 2000
+
+def keyset_batches(queryset, batch_size=BATCH_SIZE):
+    """
+    Yield rows in primary-key order, one short query per batch.
+    Unlike a server-side cursor, nothing stays open on the database
+    between batches while the client is still downloading.
+    """
+    last_pk = None
+    queryset = queryset.order_by('pk')
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(batch[:batch_size])
+        if not rows:
+            return
+        yield from rows
+        last_pk = rows[-1].pk
+
+def _local(value):
+    return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+DONATION_COLUMNS = [
+    ('ID', lambda d: d.id),
+    ('Created at', lambda d: _local(d.created_at)),
+    ('Campaign', lambda d: d.campaign.title),
+    ('Campaign slug', lambda d: d.campaign.slug),
+    ('Donor account', lambda d: d.donor.username if d.donor else ''),
+    ('Donor name', lambda d: d.donor_name),
+    ('Donor phone', lambda d: d.donor_phone),
+    ('Donor email', lambda d: d.donor_email or ''),
+    ('Amount', lambda d: d.amount),
+    ('Payment method', lambda d: d.payment_method),
+    ('Payment status', lambda d: d.payment_status),
+    ('Source bank', lambda d: d.source_bank or ''),
+    ('Source account', lambda d: d.source_account or ''),
+    ('Account name', lambda d: d.account_name or ''),
+    ('Transfer date', lambda d: d.transfer_date or ''),
+]
+
+ORDER_COLUMNS = [
+    ('ID', lambda o: o.id),
+    ('Order number', lambda o: o.order_number),
+    ('Created at', lambda o: _local(o.created_at)),
+    ('Customer', lambda o: o.user.username),
+    ('Customer email', lambda o: o.user.email),
+    ('Items', lambda o: o.item_count),
+    ('Total price', lambda o: o.total_price),
+    ('Status', lambda o: o.status),
+]
+
+def filter_donations(params):
+    queryset = Donation.objects.select_related('campaign', 'donor')
+    if params.get('campaign'):
+        queryset = queryset.filter(campaign__slug=params['campaign'])
+    if params.get('status'):
+        queryset = queryset.filter(payment_status=params['status'])
+    if params.get('payment_method'):
+        queryset = queryset.filter(payment_method=params['payment_method'])
+    if params.get('date_from'):
+        queryset = queryset.filter(created_at__date__gte=params['date_from'])
+    if params.get('date_to'):
+        queryset = queryset.filter(created_at__date__lte=params['date_to'])
+    return queryset
+
+def filter_orders(params):
+    queryset = Order.objects.select_related('user').annotate(item_count=Count('items'))
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    if params.get('date_from'):
+        queryset = queryset.filter(created_at__date__gte=params['date_from'])
+    if params.get('date_to'):
+        queryset = queryset.filter(created_at__date__lte=params['date_to'])
+    return queryset
+
+# Spreadsheet apps run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def spreadsheet_safe(value):
+    """Defuse user-entered text that a spreadsheet would evaluate (e.g. =HYPERLINK(...))"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def export_row(obj, columns):
+    return [spreadsheet_safe(value(obj)) for _, value in columns]
+
+class Echo:
+    """File-like object whose write() just hands the line back to csv.writer"""
+    def write(self, value):
+        return value
+
+def csv_response(queryset, columns, filename):
+    writer = csv.writer(Echo())
+
+    def rows():
+        yield writer.writerow([header for header, _ in columns])
+        for obj in keyset_batches(queryset):
+            yield writer.writerow(export_row(obj, columns))
+
+    response = StreamingHttpResponse(rows(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+def xlsx_response(queryset, columns, filename):
+    """
+    XLSX is a zip archive, so it cannot be sent before it is complete.
+    openpyxl's write-only mode spools rows to disk, keeping memory flat,
+    and the finished file is streamed from a temporary file.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(filename)
+    sheet.append([header for header, _ in columns])
+    for obj in keyset_batches(queryset):
+        sheet.append(export_row(obj, columns))
+
+    spool = tempfile.TemporaryFile()
+    workbook.save(spool)
+    spool.seek(0)
+    return FileResponse(
+        spool,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
@@ -0,0 +1,28 @@
+# reports/tests.py
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+
+class ExportDateValidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        return self.client.get('/api/reports/donations/export/', params, secure=True)
+
+    def test_malformed_and_impossible_dates_are_rejected(self):
+        for value in ('yesterday', '2024-02-30', '2024-13-01'):
+            response = self.export(date_from=value)
+            self.assertEqual(response.status_code, 400, value)
+            self.assertEqual(response.json(), {'error': 'date_from must be YYYY-MM-DD'})
+        self.assertEqual(self.export(date_to='2024-02-30').json(), {'error': 'date_to must be YYYY-MM-DD'})
+
+    def test_valid_range_is_exported(self):
+        response = self.export(date_from='2024-02-01', date_to='2024-02-29')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
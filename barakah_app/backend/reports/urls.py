@@ -0,0 +1,8 @@
+# reports/urls.py
+from django.urls import path
+from .views import DonationExportView, OrderExportView
+
+urlpatterns = [
+    path('donations/export/', DonationExportView.as_view(), name='donation-export'),
+    path('orders/export/', OrderExportView.as_view(), name='order-export'),
+]
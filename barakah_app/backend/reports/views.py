@@ -0,0 +1,53 @@
+# reports/views.py
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .exports import (
+    DONATION_COLUMNS, ORDER_COLUMNS, csv_response, filter_donations, filter_orders, xlsx_response
+)
+
+FILE_TYPES = {
+    'csv': csv_response,
+    'xlsx': xlsx_response,
+}
+
+class ExportView(APIView):
+    """Stream a filtered finance export as CSV (default) or XLSX (?filetype=xlsx)"""
+    permission_classes = [IsAdminUser]
+    name = None
+    columns = None
+    filters = None  # params -> queryset, e.g. filter_donations
+
+    def filter_queryset(self, params):
+        return self.filters(params)
+
+    def get(self, request):
+        params = request.query_params.dict()
+        filetype = params.pop('filetype', 'csv')
+        if filetype not in FILE_TYPES:
+            return Response({'error': 'filetype must be csv or xlsx'}, status=status.HTTP_400_BAD_REQUEST)
+
+        for field in ('date_from', 'date_to'):
+            if params.get(field):
+                try:
+                    params[field] = parse_date(params[field])
+                except ValueError:  # Well formed but not a real date, e.g. 2024-02-30
+                    params[field] = None
+                if params[field] is None:
+                    return Response({'error': f'{field} must be YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+        filename = f"{self.name}-{timezone.localdate():%Y%m%d}"
+        return FILE_TYPES[filetype](self.filter_queryset(params), self.columns, filename)
+
+class DonationExportView(ExportView):
+    name = 'donations'
+    columns = DONATION_COLUMNS
+    filters = staticmethod(filter_donations)
+
+class OrderExportView(ExportView):
+    name = 'orders'
+    columns = ORDER_COLUMNS
+    filters = staticmethod(filter_orders)
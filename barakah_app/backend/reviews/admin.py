@@ -1,3 +1,36 @@
+# reviews/admin.py
 from django.contrib import admin
+from django.db import transaction
+from .models import Review
+from .ratings import apply_rating_delta, recompute_product_ratings
 
-# Register your models here.
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ('product', 'user', 'rating', 'created_at')
+    list_filter = ('rating', )
+    raw_id_fields = ('user', 'product')
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a review to another product would skew both products' ratings
+        return ('user', 'product') if obj else ()
+
+    def save_model(self, request, obj, form, change):
+        # Moderation edits move the product's rating like API edits do
+        old_rating = form.initial.get('rating') if change else None
+        with transaction.atomic():
+            obj.save()
+            if change:
+                apply_rating_delta(obj.product_id, 0, obj.rating - old_rating)
+            else:
+                apply_rating_delta(obj.product_id, 1, obj.rating)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            obj.delete()
+            apply_rating_delta(obj.product_id, -1, -obj.rating)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            product_ids = list(queryset.values_list('product_id', flat=True).distinct())
+            queryset.delete()
+        recompute_product_ratings(product_ids)
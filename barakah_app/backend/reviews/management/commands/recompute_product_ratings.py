@@ -0,0 +1,32 @@
+# reviews/management/commands/recompute_product_ratings.py
+from django.core.management.base import BaseCommand
+from products.models import Product
+from reviews.ratings import recompute_product_ratings
+
+class Command(BaseCommand):
+    help = "Recompute Product.rating_avg and rating_count from the reviews and fix any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product', action='append', dest='slugs', metavar='SLUG',
+            help='Only reconcile the product with this slug (can be repeated)',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report the drift without writing anything',
+        )
+
+    def handle(self, *args, **options):
+        product_ids = None
+        if options['slugs']:
+            product_ids = list(
+                Product.objects.filter(slug__in=options['slugs']).values_list('id', flat=True)
+            )
+
+        changed = recompute_product_ratings(product_ids, dry_run=options['dry_run'])
+
+        for product, (old_count, old_avg), (new_count, new_avg) in changed:
+            self.stdout.write(f"{product.title}: {old_avg} ({old_count}) -> {new_avg} ({new_count})")
+
+        verb = 'would be updated' if options['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(f"{len(changed)} product ratings {verb}."))
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:09
+
+import django.core.validators
+from django.conf import settings
+from decimal import ROUND_HALF_UP, Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def clamp_ratings(apps, schema_editor):
+    # Ratings outside 1..5 could only come from writes that skipped the
+    # serializer; clamp them and refresh the affected products' aggregates
+    Review = apps.get_model('reviews', 'Review')
+    Product = apps.get_model('products', 'Product')
+    out_of_range = Review.objects.filter(Q(rating__lt=1) | Q(rating__gt=5))
+    product_ids = set(out_of_range.values_list('product_id', flat=True))
+    if not product_ids:
+        return
+    Review.objects.filter(rating__lt=1).update(rating=1)
+    Review.objects.filter(rating__gt=5).update(rating=5)
+    totals = (
+        Review.objects.filter(product_id__in=product_ids).order_by()
+        .values_list('product_id').annotate(count=Count('pk'), total=Sum('rating'))
+    )
+    for product_id, count, total in totals:
+        Product.objects.filter(pk=product_id).update(
+            rating_count=count, rating_sum=total,
+            rating_avg=(Decimal(total) / count).quantize(Decimal('0.01'), ROUND_HALF_UP),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_related_products'),
+        ('reviews', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(clamp_ratings, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='review',
+            name='rating',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.CheckConstraint(condition=models.Q(('rating__gte', 1), ('rating__lte', 5)), name='review_rating_range'),
+        ),
+    ]
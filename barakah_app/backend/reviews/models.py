@@ -1,4 +1,5 @@
 # reviews/models.py
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from accounts.models import User
 from products.models import Product
@@ -6,9 +7,15 @@ from products.models import Product
 class Review(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviews')
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='reviews')
-    rating = models.PositiveIntegerField()  # e.g., 1 to 5
+    rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # Also enforced for writes that skip validation; Product.rating_avg only fits 0..9.99
+            models.CheckConstraint(condition=models.Q(rating__gte=1, rating__lte=5), name='review_rating_range'),
+        ]
+
     def __str__(self):
-        return f"Review by {self.user.username} for {self.product.name}"
\ No newline at end of file
+        return f"Review by {self.user.username} for {self.product.title}"
\ No newline at end of file
@@ -0,0 +1,76 @@
+# reviews/ratings.py
+from decimal import ROUND_HALF_UP, Decimal
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.dispatch import Signal
+from products.models import Product
+from .models import Review
+
+CENT = Decimal('0.01')
+
+# Sent with product_ids=[...] whenever stored rating aggregates change
+product_ratings_changed = Signal()
+
+def rating_average(total, count):
+    """SQL expression for total / count rounded half up to the cent, 0 without reviews"""
+    return Coalesce(
+        # Divide as floats: SQLite turns decimal expressions into CAST(... AS NUMERIC),
+        # which keeps 13 / 3 an integer. Round() goes back to numeric on PostgreSQL.
+        Round(Cast(total, FloatField()) / NullIf(count, 0), 2),
+        Value(0),
+        output_field=DecimalField(max_digits=3, decimal_places=2),
+    )
+
+def apply_rating_delta(product_id, count_delta, sum_delta):
+    """Atomically shift a product's rating aggregates (no read, no full aggregate)"""
+    if not product_id or not (count_delta or sum_delta):
+        return 0
+    # Every F() in one UPDATE reads the old row, so the average uses the shifted values explicitly
+    updated = Product.objects.filter(pk=product_id).update(
+        rating_count=F('rating_count') + count_delta,
+        rating_sum=F('rating_sum') + sum_delta,
+        rating_avg=rating_average(F('rating_sum') + sum_delta, F('rating_count') + count_delta),
+    )
+    if updated:
+        product_ratings_changed.send(sender=Product, product_ids=[product_id])
+    return updated
+
+def recompute_product_ratings(product_ids=None, dry_run=False):
+    """
+    Reconcile the stored rating aggregates with the reviews in bulk.
+
+    One grouped aggregate for all requested products; only products whose
+    stored values drifted are written. Returns (product, old, new) tuples
+    of (count, average) for the products that changed.
+    """
+    reviews = Review.objects.all()
+    products = Product.objects.only('id', 'title', 'rating_count', 'rating_sum', 'rating_avg').order_by('pk')
+    if product_ids is not None:
+        reviews = reviews.filter(product_id__in=product_ids)
+        products = products.filter(pk__in=product_ids)
+
+    with transaction.atomic():
+        # Lock the products first so concurrent deltas queue up behind us
+        locked = list(products.select_for_update())
+        totals = {
+            product_id: (count, total)
+            for product_id, count, total in reviews.order_by()
+            .values_list('product_id')
+            .annotate(count=Count('pk'), total=Sum('rating'))
+        }
+
+        changed = []
+        for product in locked:
+            count, total = totals.get(product.id, (0, 0))
+            average = (Decimal(total) / count).quantize(CENT, ROUND_HALF_UP) if count else Decimal('0')
+            if (product.rating_count, product.rating_sum, product.rating_avg) != (count, total, average):
+                changed.append((product, (product.rating_count, product.rating_avg), (count, average)))
+                product.rating_count, product.rating_sum, product.rating_avg = count, total, average
+
+        if changed and not dry_run:
+            Product.objects.bulk_update(
+                [product for product, _, _ in changed], ['rating_count', 'rating_sum', 'rating_avg'], batch_size=500
+            )
+            product_ratings_changed.send(sender=Product, product_ids=[product.id for product, _, _ in changed])
+    return changed
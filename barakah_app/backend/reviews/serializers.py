@@ -5,4 +5,5 @@ from .models import Review
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
-        fields = ['id', 'rating', 'comment', 'created_at']
\ No newline at end of file
+        fields = ['id', 'rating', 'comment', 'created_at']
+        extra_kwargs = {'rating': {'min_value': 1, 'max_value': 5}}
\ No newline at end of file
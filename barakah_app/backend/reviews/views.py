@@ -1,10 +1,14 @@
 # reviews/views.py
+from django.db import transaction
 from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from .models import Review
+from .ratings import apply_rating_delta
 from .serializers import ReviewSerializer
 
 class ReviewListView(generics.ListCreateAPIView):
     serializer_class = ReviewSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
         product_id = self.kwargs.get('product_id')
@@ -12,10 +16,24 @@ class ReviewListView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         product_id = self.kwargs.get('product_id')
-        serializer.save(user=self.request.user, product_id=product_id)
+        with transaction.atomic():
+            review = serializer.save(user=self.request.user, product_id=product_id)
+            apply_rating_delta(review.product_id, 1, review.rating)
 
 class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ReviewSerializer
+    permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Review.objects.filter(user=self.request.user)
\ No newline at end of file
+        return Review.objects.filter(user=self.request.user)
+
+    def perform_update(self, serializer):
+        old_rating = serializer.instance.rating
+        with transaction.atomic():
+            review = serializer.save()
+            apply_rating_delta(review.product_id, 0, review.rating - old_rating)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            apply_rating_delta(instance.product_id, -1, -instance.rating)
@@ -0,0 +1,9 @@
+# search/apps.py
+from django.apps import AppConfig
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        import search.signals  # Keep search documents in sync with their source rows
@@ -0,0 +1,136 @@
+# search/backends.py
+import re
+from django.db import connection
+from django.db.models import Q
+from .models import SearchDocument
+
+TABLE = SearchDocument._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+
+_token = re.compile(r'\w+', re.UNICODE)
+
+def tokenize(query):
+    """Split user input into lowercase word tokens (drops all query syntax)"""
+    return _token.findall((query or '').lower())[:10]
+
+def scope_sql(scope):
+    """SQL and params of a values('pk') queryset, for an `object_id IN (...)` clause"""
+    sql, params = scope.query.sql_with_params()
+    return sql, list(params)
+
+class PostgresBackend:
+    """Generated tsvector column + GIN index, ranked with ts_rank"""
+
+    def _tsquery(self, tokens):
+        # Prefix match every word: 'sembako beras' -> 'sembako:* & beras:*'
+        return ' & '.join(f'{token}:*' for token in tokens)
+
+    def count(self, kind, tokens, scope):
+        scope, scope_params = scope_sql(scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {TABLE} "
+                f"WHERE kind = %s AND is_active AND search_vector @@ to_tsquery('simple', %s) "
+                f"AND object_id IN ({scope})",
+                [kind, self._tsquery(tokens), *scope_params],
+            )
+            return cursor.fetchone()[0]
+
+    def ids(self, kind, tokens, scope, offset, limit):
+        scope, scope_params = scope_sql(scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT object_id FROM {TABLE}, to_tsquery('simple', %s) query "
+                f"WHERE kind = %s AND is_active AND search_vector @@ query AND object_id IN ({scope}) "
+                f"ORDER BY ts_rank(search_vector, query) DESC, object_id DESC "
+                f"LIMIT %s OFFSET %s",
+                [self._tsquery(tokens), kind, *scope_params, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+class SQLiteBackend:
+    """FTS5 external-content table, ranked with bm25 (title weighted over body)"""
+
+    def _match(self, tokens):
+        # Quote every word so user input can never be parsed as FTS5 syntax
+        return ' AND '.join(f'"{token}"*' for token in tokens)
+
+    def count(self, kind, tokens, scope):
+        scope, scope_params = scope_sql(scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {FTS_TABLE} f JOIN {TABLE} d ON d.id = f.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s AND d.is_active AND d.object_id IN ({scope})",
+                [self._match(tokens), kind, *scope_params],
+            )
+            return cursor.fetchone()[0]
+
+    def ids(self, kind, tokens, scope, offset, limit):
+        scope, scope_params = scope_sql(scope)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT d.object_id FROM {FTS_TABLE} f JOIN {TABLE} d ON d.id = f.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s AND d.is_active AND d.object_id IN ({scope}) "
+                f"ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), d.object_id DESC "
+                f"LIMIT %s OFFSET %s",
+                [self._match(tokens), kind, *scope_params, limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+class FallbackBackend:
+    """Any other database: substring match on the stripped documents, unranked"""
+
+    def _queryset(self, kind, tokens, scope):
+        queryset = SearchDocument.objects.filter(kind=kind, is_active=True, object_id__in=scope)
+        for token in tokens:
+            queryset = queryset.filter(Q(title__icontains=token) | Q(body__icontains=token))
+        return queryset
+
+    def count(self, kind, tokens, scope):
+        return self._queryset(kind, tokens, scope).count()
+
+    def ids(self, kind, tokens, scope, offset, limit):
+        queryset = self._queryset(kind, tokens, scope).order_by('-object_id')
+        return list(queryset.values_list('object_id', flat=True)[offset:offset + limit])
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    if connection.vendor == 'sqlite':
+        return SQLiteBackend()
+    return FallbackBackend()
+
+class RankedResults:
+    """
+    Lazy, sliceable search result list.
+
+    Django's Paginator only calls count() and slices it, so each page costs
+    one COUNT on the index, one ranked id lookup and one in_bulk() fetch.
+    Both index queries are limited to the rows of `queryset`, so the view's
+    filters (e.g. min_rating) apply to the count and the ranking alike.
+    """
+
+    def __init__(self, queryset, kind, query):
+        self.queryset = queryset
+        self.scope = queryset.order_by().prefetch_related(None).values('pk')
+        self.kind = kind
+        self.tokens = tokenize(query)
+        self.backend = get_backend()
+
+    def count(self):
+        if not self.tokens:
+            return 0
+        return self.backend.count(self.kind, self.tokens, self.scope)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError('RankedResults only supports slicing')
+        offset = index.start or 0
+        if not self.tokens or index.stop is None or index.stop <= offset:
+            return []
+        ids = self.backend.ids(self.kind, self.tokens, self.scope, offset, index.stop - offset)
+        objects = self.queryset.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
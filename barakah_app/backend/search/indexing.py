@@ -0,0 +1,68 @@
+# search/indexing.py
+import html
+import re
+from django.apps import apps
+from django.db import transaction
+from django.utils.html import strip_tags
+from .models import SearchDocument
+
+# kind -> model label of the rows that get indexed
+INDEXED_MODELS = {
+    'campaign': 'campaigns.Campaign',
+    'product': 'products.Product',
+}
+
+_whitespace = re.compile(r'\s+')
+
+def to_search_text(value):
+    """Turn rich text (CKEditor HTML) into plain, single-spaced text"""
+    text = html.unescape(strip_tags(value or ''))
+    return _whitespace.sub(' ', text).strip()
+
+def kind_for_model(model):
+    label = model._meta.label
+    for kind, model_label in INDEXED_MODELS.items():
+        if model_label == label:
+            return kind
+    return None
+
+def document_fields(instance):
+    return {
+        'title': to_search_text(instance.title),
+        'body': to_search_text(instance.description),
+        'is_active': instance.is_active,
+    }
+
+def index_object(instance):
+    """Create or refresh the search document for a campaign/product"""
+    kind = kind_for_model(type(instance))
+    SearchDocument.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults=document_fields(instance)
+    )
+
+def unindex_object(instance):
+    kind = kind_for_model(type(instance))
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+def rebuild_index(kinds=None, batch_size=500):
+    """Re-create the search documents of the given kinds from scratch"""
+    counts = {}
+    for kind in kinds or INDEXED_MODELS:
+        model = apps.get_model(INDEXED_MODELS[kind])
+        with transaction.atomic():
+            SearchDocument.objects.filter(kind=kind).delete()
+
+            batch = []
+            count = 0
+            rows = model.objects.only('id', 'title', 'description', 'is_active')
+            for instance in rows.iterator(chunk_size=batch_size):
+                batch.append(SearchDocument(kind=kind, object_id=instance.pk, **document_fields(instance)))
+                if len(batch) >= batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                SearchDocument.objects.bulk_create(batch)
+                count += len(batch)
+        counts[kind] = count
+    return counts
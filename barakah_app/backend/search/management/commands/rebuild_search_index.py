@@ -0,0 +1,17 @@
+# search/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from search.indexing import INDEXED_MODELS, rebuild_index
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents for campaigns and products"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind', action='append', dest='kinds', choices=list(INDEXED_MODELS),
+            help='Only rebuild this kind of document (can be repeated)',
+        )
+
+    def handle(self, *args, **options):
+        counts = rebuild_index(options['kinds'])
+        for kind, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {kind} documents."))
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+from search.indexing import to_search_text
+
+
+def backfill(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    sources = {
+        'campaign': apps.get_model('campaigns', 'Campaign'),
+        'product': apps.get_model('products', 'Product'),
+    }
+    for kind, model in sources.items():
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    kind=kind,
+                    object_id=row.pk,
+                    title=to_search_text(row.title),
+                    body=to_search_text(row.description),
+                    is_active=row.is_active,
+                )
+                for row in model.objects.all().iterator(chunk_size=500)
+            ],
+            batch_size=500,
+        )
+
+
+def clear(apps, schema_editor):
+    apps.get_model('search', 'SearchDocument').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('campaigns', '0004_alter_campaign_slug'),
+        ('products', '0004_alter_product_slug'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, clear),
+    ]
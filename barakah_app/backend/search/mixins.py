@@ -0,0 +1,27 @@
+# search/mixins.py
+from .backends import RankedResults
+from .pagination import SearchPagination
+
+class RankedSearchMixin:
+    """
+    Serve ?search= from the full-text index instead of icontains scans.
+    Plain listings and search results share one page-number paginated
+    shape ({count, next, previous, results}); search results are ranked.
+    """
+    search_kind = None
+    pagination_class = SearchPagination
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Plain listings have no order of their own, pages need a stable one
+        return queryset if queryset.ordered else queryset.order_by('pk')
+
+    def list(self, request, *args, **kwargs):
+        query = request.query_params.get('search', '').strip()
+        if not query:
+            return super().list(request, *args, **kwargs)
+
+        results = RankedResults(self.filter_queryset(self.get_queryset()), self.search_kind, query)
+        page = self.paginate_queryset(results)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
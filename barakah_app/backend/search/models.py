@@ -0,0 +1,31 @@
+# search/models.py
+from django.db import models
+
+class SearchDocument(models.Model):
+    """
+    HTML-stripped, searchable copy of a campaign or product.
+
+    The full-text index itself is database specific and lives outside the
+    ORM (see migrations/0001_initial.py): a generated tsvector column with a
+    GIN index on PostgreSQL, and an FTS5 virtual table kept in sync by
+    triggers on SQLite.
+    """
+    KIND_CHOICES = [
+        ('campaign', 'Campaign'),
+        ('product', 'Product'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} - {self.title}"
@@ -0,0 +1,21 @@
+# search/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from campaigns.models import Campaign
+from products.models import Product
+from .indexing import index_object, unindex_object
+
+@receiver(post_save, sender=Campaign)
+@receiver(post_save, sender=Product)
+def update_search_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refresh the search document when searchable fields may have changed"""
+    if raw:
+        return
+    if update_fields is not None and not {'title', 'description', 'is_active'} & set(update_fields):
+        return
+    index_object(instance)
+
+@receiver(post_delete, sender=Campaign)
+@receiver(post_delete, sender=Product)
+def delete_search_document(sender, instance, **kwargs):
+    unindex_object(instance)
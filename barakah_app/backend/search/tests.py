@@ -0,0 +1,61 @@
+# search/tests.py
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from products.models import Product
+
+class ProductSearchTests(TestCase):
+    """Ranked full-text search on /api/products/ (FTS5 on SQLite)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        def product(slug, title, description='-', rating='4.00'):
+            return Product.objects.create(
+                title=title, slug=slug, description=description, category='sembako',
+                thumbnail='product_images/test.jpg', price=10000, rating_avg=rating, rating_count=1,
+            )
+
+        cls.in_title = product('beras-premium', 'Beras premium 5 kg')
+        cls.in_description = product('paket-sembako', 'Paket sembako', '<p>Berisi <b>beras</b>, minyak dan gula</p>')
+        cls.low_rated = product('beras-medium', 'Beras medium', rating='2.00')
+        for i in range(22):
+            product(f'kurma-{i}', f'Kurma ajwa {i}')
+
+    def setUp(self):
+        cache.clear()  # Product lists are cached per query string
+        self.client = APIClient()
+
+    def get(self, **params):
+        response = self.client.get('/api/products/', params, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_title_matches_rank_first(self):
+        body = self.get(search='beras')
+        self.assertEqual(
+            [product['slug'] for product in body['results']],
+            ['beras-medium', 'beras-premium', 'paket-sembako'],
+        )
+
+    def test_filters_apply_to_results_and_count(self):
+        body = self.get(search='beras', min_rating='3')
+        self.assertEqual(body['count'], 2)
+        self.assertEqual([product['slug'] for product in body['results']], ['beras-premium', 'paket-sembako'])
+
+    def test_search_is_paginated(self):
+        first = self.get(search='kurma')
+        self.assertEqual(first['count'], 22)
+        self.assertEqual(len(first['results']), 20)
+        self.assertIsNone(first['previous'])
+
+        second = self.client.get(first['next'], secure=True).json()
+        self.assertEqual(len(second['results']), 2)
+        self.assertIsNone(second['next'])
+        slugs = {product['slug'] for product in first['results'] + second['results']}
+        self.assertEqual(slugs, {f'kurma-{i}' for i in range(22)})
+
+    def test_listing_has_the_same_shape(self):
+        searched, listed = self.get(search='beras'), self.get()
+        self.assertEqual(set(searched), set(listed))
+        self.assertEqual(listed['count'], Product.objects.count())
+        self.assertEqual(len(listed['results']), 20)
@@ -1,3 +1,28 @@
+# transactions/admin.py
 from django.contrib import admin
+from .models import LedgerEntry, PaymentState
 
-# Register your models here.
+class ReadOnlyAdmin(admin.ModelAdmin):
+    # The ledger is append-only and the state table is derived from it
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(LedgerEntry)
+class LedgerEntryAdmin(ReadOnlyAdmin):
+    list_display = ('created_at', 'source_type', 'source_id', 'gateway_order_id', 'event', 'gateway_status', 'status', 'amount', 'actor')
+    list_filter = ('source_type', 'event', 'status')
+    search_fields = ('gateway_order_id', )
+    list_select_related = ('actor', )
+    date_hierarchy = 'created_at'
+
+@admin.register(PaymentState)
+class PaymentStateAdmin(ReadOnlyAdmin):
+    list_display = ('source_type', 'source_id', 'gateway_order_id', 'status', 'gateway_status', 'amount', 'updated_at')
+    list_filter = ('source_type', 'status')
+    search_fields = ('gateway_order_id', )
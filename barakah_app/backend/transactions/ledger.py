@@ -0,0 +1,52 @@
+# transactions/ledger.py
+from django.db import transaction
+from .models import LedgerEntry, PaymentState
+
+STATE_FIELDS = ['gateway_order_id', 'status', 'gateway_status', 'amount', 'last_entry', 'updated_at']
+
+def donation_entry(donation, event, **fields):
+    """Unsaved LedgerEntry for a Donation (or any object with its fields)"""
+    gateway_order_id = f'D{donation.id}-C{donation.campaign_id}' if donation.payment_method == 'midtrans' else ''
+    return LedgerEntry(
+        source_type='donation', source_id=donation.id, gateway_order_id=gateway_order_id,
+        event=event, status=donation.payment_status, amount=donation.amount, **fields
+    )
+
+def order_entry(order, event, **fields):
+    """Unsaved LedgerEntry for an Order; Midtrans knows orders by their order_number"""
+    return LedgerEntry(
+        source_type='order', source_id=order.id, gateway_order_id=order.order_number,
+        event=event, status=order.status, amount=order.total_price, **fields
+    )
+
+def record_events(entries):
+    """
+    Append entries to the ledger and move PaymentState to the newest entry per
+    payment, with one bulk INSERT and one bulk upsert. Must run in the same
+    transaction as the status change the entries describe.
+    """
+    if not entries:
+        return []
+    with transaction.atomic():
+        created = LedgerEntry.objects.bulk_create(entries)
+        latest = {}
+        for entry in created:
+            latest[(entry.source_type, entry.source_id)] = entry
+        PaymentState.objects.bulk_create(
+            [state_from(entry) for entry in latest.values()],
+            update_conflicts=True,
+            unique_fields=['source_type', 'source_id'],
+            update_fields=STATE_FIELDS,
+        )
+    return created
+
+def record_event(entry):
+    return record_events([entry])[0]
+
+def state_from(entry):
+    return PaymentState(
+        source_type=entry.source_type, source_id=entry.source_id,
+        gateway_order_id=entry.gateway_order_id, status=entry.status,
+        gateway_status=entry.gateway_status, amount=entry.amount,
+        last_entry=entry, updated_at=entry.created_at,
+    )
@@ -0,0 +1,55 @@
+# transactions/management/commands/rebuild_payment_state.py
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from donations.models import Donation
+from orders.models import Order
+from transactions.ledger import STATE_FIELDS, donation_entry, order_entry, record_events, state_from
+from transactions.models import LedgerEntry, PaymentState
+
+class Command(BaseCommand):
+    help = "Rebuild PaymentState from the latest ledger entry of every payment"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help="First add an 'imported' entry for donations and orders that have no ledger history yet",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['backfill']:
+            donations = Donation.objects.only('id', 'campaign_id', 'payment_method', 'payment_status', 'amount')
+            orders = Order.objects.only('id', 'order_number', 'status', 'total_price')
+            imported = self.backfill('donation', donations, donation_entry, batch_size)
+            imported += self.backfill('order', orders, order_entry, batch_size)
+            self.stdout.write(f"{imported} payments imported into the ledger.")
+
+        latest_ids = list(
+            LedgerEntry.objects.order_by()
+            .values('source_type', 'source_id')
+            .annotate(last_id=Max('id'))
+            .values_list('last_id', flat=True)
+        )
+        for start in range(0, len(latest_ids), batch_size):
+            entries = LedgerEntry.objects.filter(pk__in=latest_ids[start:start + batch_size])
+            PaymentState.objects.bulk_create(
+                [state_from(entry) for entry in entries],
+                update_conflicts=True,
+                unique_fields=['source_type', 'source_id'],
+                update_fields=STATE_FIELDS,
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(latest_ids)} payment states rebuilt."))
+
+    def backfill(self, source_type, queryset, make_entry, batch_size):
+        imported, last_pk = 0, 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+            if not batch:
+                return imported
+            last_pk = batch[-1].pk
+            known = set(
+                PaymentState.objects.filter(source_type=source_type, source_id__in=[obj.pk for obj in batch])
+                .values_list('source_id', flat=True)
+            )
+            imported += len(record_events([make_entry(obj, 'imported') for obj in batch if obj.pk not in known]))
@@ -0,0 +1,66 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('donation', 'Donation'), ('order', 'Order')], max_length=20)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('gateway_order_id', models.CharField(blank=True, max_length=64)),
+                ('event', models.CharField(choices=[('created', 'Created'), ('notification', 'Gateway notification'), ('status_check', 'Status check'), ('reconciliation', 'Reconciliation'), ('manual', 'Manual verification'), ('imported', 'Imported')], max_length=20)),
+                ('gateway_status', models.CharField(blank=True, max_length=30)),
+                ('status', models.CharField(max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'ledger entries',
+            },
+        ),
+        migrations.CreateModel(
+            name='PaymentState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('donation', 'Donation'), ('order', 'Order')], max_length=20)),
+                ('source_id', models.PositiveBigIntegerField()),
+                ('gateway_order_id', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('status', models.CharField(max_length=20)),
+                ('gateway_status', models.CharField(blank=True, max_length=30)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('updated_at', models.DateTimeField()),
+                ('last_entry', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='transactions.ledgerentry')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['source_type', 'source_id', 'created_at'], name='ledger_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['gateway_order_id'], name='ledger_gateway_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentstate',
+            index=models.Index(fields=['source_type', 'status', 'updated_at'], name='payment_state_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='paymentstate',
+            constraint=models.UniqueConstraint(fields=('source_type', 'source_id'), name='unique_payment_state'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ledgerentry',
+            name='event',
+            field=models.CharField(choices=[('created', 'Created'), ('snap_failed', 'Snap request failed'), ('notification', 'Gateway notification'), ('status_check', 'Status check'), ('reconciliation', 'Reconciliation'), ('manual', 'Manual verification'), ('imported', 'Imported')], max_length=20),
+        ),
+    ]
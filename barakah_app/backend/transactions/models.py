@@ -1,3 +1,76 @@
+# transactions/models.py
 from django.db import models
+from accounts.models import User
 
-# Create your models here.
+SOURCE_CHOICES = [
+    ('donation', 'Donation'),
+    ('order', 'Order'),
+]
+
+class LedgerEntry(models.Model):
+    """
+    Immutable record of one payment event: a gateway notification, a status
+    check, a reconciliation or a manual verification. Rows are only ever
+    inserted (see transactions/ledger.py); PaymentState holds the latest one.
+    """
+    EVENT_CHOICES = [
+        ('created', 'Created'),
+        ('snap_failed', 'Snap request failed'),
+        ('notification', 'Gateway notification'),
+        ('status_check', 'Status check'),
+        ('reconciliation', 'Reconciliation'),
+        ('manual', 'Manual verification'),
+        ('imported', 'Imported'),
+    ]
+
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+    gateway_order_id = models.CharField(max_length=64, blank=True)  # Midtrans order_id, empty for manual transfers
+    event = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    gateway_status = models.CharField(max_length=30, blank=True)  # Midtrans transaction_status, if any
+    status = models.CharField(max_length=20)  # Donation.payment_status / Order.status after the event
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    payload = models.JSONField(default=dict, blank=True)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'ledger entries'
+        indexes = [
+            models.Index(fields=['source_type', 'source_id', 'created_at'], name='ledger_source_idx'),
+            models.Index(fields=['gateway_order_id'], name='ledger_gateway_order_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Ledger entries are append-only")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Ledger entries are append-only")
+
+    def __str__(self):
+        return f"{self.source_type} #{self.source_id} {self.event}: {self.status}"
+
+class PaymentState(models.Model):
+    """Current state of every payment, materialized from its latest LedgerEntry"""
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.PositiveBigIntegerField()
+    gateway_order_id = models.CharField(max_length=64, blank=True, db_index=True)
+    status = models.CharField(max_length=20)
+    gateway_status = models.CharField(max_length=30, blank=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    last_entry = models.ForeignKey(LedgerEntry, on_delete=models.PROTECT, related_name='+')
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source_type', 'source_id'], name='unique_payment_state'),
+        ]
+        indexes = [
+            # Open payments per type, oldest first, for reconciliation sweeps
+            models.Index(fields=['source_type', 'status', 'updated_at'], name='payment_state_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source_type} #{self.source_id}: {self.status}"
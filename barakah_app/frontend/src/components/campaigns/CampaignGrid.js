@@ -12,7 +12,7 @@ const CampaignGrid = () => {
     const fetchCampaigns = async () => {
       try {
         const response = await axios.get('http://localhost:8000/api/campaigns/');
-        setCampaigns(response.data);
+        setCampaigns(response.data.results);
         setLoading(false);
       } catch (err) {
         setError('Failed to fetch campaigns');
@@ -60,6 +60,7 @@ const CrowdfundingCampaignDetail = () => {
   const { slug } = useParams();
   const [campaign, setCampaign] = useState(null);
   const [donations, setDonations] = useState([]);
+  const [donationsNext, setDonationsNext] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [activeTab, setActiveTab] = useState('description');
@@ -74,8 +75,9 @@ const CrowdfundingCampaignDetail = () => {
         const campaignResponse = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/campaigns/${slug}/`);
         setCampaign(campaignResponse.data);
 
-        const donationsResponse = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/donations/campaign/${slug}/donations/`);
-        setDonations(donationsResponse.data);
+        const donationsResponse = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/donations/campaign/${slug}/donors/`);
+        setDonations(donationsResponse.data.results);
+        setDonationsNext(donationsResponse.data.next);
       } catch (err) {
         console.error('Error fetching campaign details:', err);
         setError('Failed to load campaign details');
@@ -102,6 +104,16 @@ const CrowdfundingCampaignDetail = () => {
   const isExpired = isCampaignExpired(campaign.deadline);
   const deadlineText = formatDeadline(campaign.deadline);
 
+  const loadMoreDonations = async () => {
+    try {
+      const response = await axios.get(donationsNext);
+      setDonations((prev) => [...prev, ...response.data.results]);
+      setDonationsNext(response.data.next);
+    } catch (err) {
+      console.error('Error fetching more donations:', err);
+    }
+  };
+
   const toggleDescription = () => {
     setShowFullDescription(!showFullDescription);
   };
@@ -212,7 +224,8 @@ const CrowdfundingCampaignDetail = () => {
             className={`py-2 px-4 text-sm font-medium ${activeTab === 'donations' ? 'text-green-600 border-b-2 border-green-600' : 'text-gray-500'}`}
             onClick={() => setActiveTab('donations')}
           >
-            Donatur ({donations.length})
+            {/* The feed below is paged; the campaign detail embeds every verified donation */}
+            Donatur ({campaign.donations ? campaign.donations.length : donations.length})
           </button>
           <button
             className={`py-2 px-4 text-sm font-medium ${activeTab === 'updates' ? 'text-green-600 border-b-2 border-green-600' : 'text-gray-500'}`}
@@ -254,8 +267,8 @@ const CrowdfundingCampaignDetail = () => {
             <div className="bg-white p-4 rounded-lg shadow">
               <ul>
                 {donations.length > 0 ? (
-                  donations.map((donation, index) => (
-                    <li key={index} className="border-b py-2 px-4">
+                  donations.map((donation) => (
+                    <li key={donation.id} className="border-b py-2 px-4">
                       <div className="flex justify-between items-center">
                         <p className="text-gray-700">
                           <strong>{donation.donor_name}</strong>
@@ -277,6 +290,14 @@ const CrowdfundingCampaignDetail = () => {
                   <li className="py-2 px-4 text-gray-500">Belum ada donasi yang terverifikasi.</li>
                 )}
               </ul>
+              {donationsNext && (
+                <button
+                  onClick={loadMoreDonations}
+                  className="text-green-600 mt-2 text-sm"
+                >
+                  Tampilkan Lebih Banyak
+                </button>
+              )}
             </div>
           )}
 
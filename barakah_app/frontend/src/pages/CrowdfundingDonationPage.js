@@ -1,5 +1,5 @@
 // pages/CrowdfundingDonationPage.js
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import Header from '../components/layout/Header';
@@ -13,6 +13,11 @@ const getCsrfToken = () => {
     ?.split('=')[1];
   return cookieValue;
 };
+
+// Fresh Idempotency-Key for a new Midtrans payment attempt
+const newIdempotencyKey = () =>
+  window.crypto?.randomUUID ? window.crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
 // Define category-based additional amounts
 const categoryAdditionalAmounts = {
   dhuafa: { value: 100 },
@@ -34,6 +39,8 @@ const CrowdfundingDonationPage = () => {
   const [selectedBank, setSelectedBank] = useState('');
   const [campaign, setCampaign] = useState(null);
   const [loading, setLoading] = useState(true);
+  // One key per payment attempt, so repeated clicks reuse the same Snap token
+  const paymentAttemptRef = useRef({ key: null, data: null });
   const [formData, setFormData] = useState({
     fullName: '',
     hideIdentity: false,
@@ -249,6 +256,11 @@ const CrowdfundingDonationPage = () => {
 
     // If Midtrans is selected, handle payment via Midtrans
     if (selectedBank === 'midtrans') {
+      const attemptData = JSON.stringify(paymentData);
+      if (paymentAttemptRef.current.data !== attemptData) {
+        paymentAttemptRef.current = { key: newIdempotencyKey(), data: attemptData };
+      }
+
       try {
         // Fetch payment token from backend
         const response = await axios.post(
@@ -257,6 +269,7 @@ const CrowdfundingDonationPage = () => {
             headers: {
               'Content-Type': 'application/json',
               'X-CSRFToken': csrfToken,
+              'Idempotency-Key': paymentAttemptRef.current.key,
             },
           }
         );
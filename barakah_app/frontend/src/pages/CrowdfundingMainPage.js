@@ -39,6 +39,7 @@ const CrowdfundingMainPage = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [nextPage, setNextPage] = useState(null);
   const [searchTimeout, setSearchTimeout] = useState(null);
   const [activeSlide, setActiveSlide] = useState(0);
   const sliderInterval = useRef(null);
@@ -51,7 +52,7 @@ const CrowdfundingMainPage = () => {
           `${process.env.REACT_APP_API_BASE_URL}/api/campaigns/`, 
           { params: { is_featured: true } } // Fetch only featured campaigns
         );
-        setFeaturedCampaigns(response.data.slice(0, 3)); // Take the first 3 featured campaigns
+        setFeaturedCampaigns(response.data.results.slice(0, 3)); // Take the first 3 featured campaigns
       } catch (err) {
         console.error('Error fetching featured campaigns:', err);
         setError('Failed to load featured campaigns');
@@ -69,7 +70,8 @@ const CrowdfundingMainPage = () => {
         `${process.env.REACT_APP_API_BASE_URL}/api/campaigns/`, 
         { params: { search } }
       );
-      setCampaigns(response.data); // Set regular campaigns (search results)
+      setCampaigns(response.data.results); // Listings and search results come one page at a time
+      setNextPage(response.data.next);
     } catch (err) {
       console.error('Error fetching campaigns:', err);
       setError('Failed to load campaigns');
@@ -78,6 +80,18 @@ const CrowdfundingMainPage = () => {
     }
   };
 
+  // Append the next page of the current listing or search
+  const loadMoreCampaigns = async () => {
+    try {
+      const response = await axios.get(nextPage);
+      setCampaigns((previous) => [...previous, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (err) {
+      console.error('Error fetching campaigns:', err);
+      setError('Failed to load campaigns');
+    }
+  };
+
   const handleSearch = (query) => {
     setSearchQuery(query);
 
@@ -283,6 +297,15 @@ const CrowdfundingMainPage = () => {
             })}
           </div>
         )}
+
+        {nextPage && !loading && (
+          <button
+            onClick={loadMoreCampaigns}
+            className="w-full bg-green-600 hover:bg-green-700 text-white py-2 rounded-md text-sm mt-4"
+          >
+            Muat Lebih Banyak
+          </button>
+        )}
   
         {error && (
           <div className="text-center py-4 text-red-500">
@@ -23,10 +23,14 @@ const formatIDR = (amount) => {
     }).format(amount);
   };
   
+// Remember what the server has, so only changed quantities are synced
+const withSavedQuantities = (items) => items.map((item) => ({ ...item, savedQuantity: item.quantity }));
+
 const EcommerceCartPage = () => {
     const navigate = useNavigate();
     const [cartItems, setCartItems] = useState([]);
     const [quantities, setQuantities] = useState({});
+    const [summary, setSummary] = useState(null);
 
     useEffect(() => {
         fetchCartItems();
@@ -47,11 +51,12 @@ const EcommerceCartPage = () => {
                 },
             });
     
-            setCartItems(response.data);
+            setCartItems(withSavedQuantities(response.data.items));
+            setSummary(response.data.summary);
     
             // Initialize quantities state
             const initialQuantities = {};
-            response.data.forEach(item => {
+            response.data.items.forEach(item => {
                 initialQuantities[item.product.id] = item.quantity;
             });
             setQuantities(initialQuantities);
@@ -130,13 +135,43 @@ const EcommerceCartPage = () => {
         });
     };
 
-    const handleCheckout = () => {
+    // Push every changed quantity to the server in one request
+    const syncCart = async () => {
+        const operations = cartItems
+            .filter((item) => item.quantity !== item.savedQuantity)
+            .map((item) => ({ product_id: item.product.id, quantity: item.quantity }));
+        if (operations.length === 0) {
+            return cartItems;
+        }
+
+        const user = JSON.parse(localStorage.getItem('user'));
+        const response = await axios.post(`${process.env.REACT_APP_API_BASE_URL}/api/carts/cart/batch/`, {
+            operations,
+        }, {
+            headers: {
+                Authorization: `Bearer ${user.access}`,
+                'X-CSRFToken': getCsrfToken(),
+            },
+        });
+        const items = withSavedQuantities(response.data.items);
+        setCartItems(items);
+        setSummary(response.data.summary);
+        return items;
+    };
+
+    const handleCheckout = async () => {
         if (cartItems.length === 0) {
             alert('Keranjang belanja kosong. Tambahkan produk sebelum melanjutkan ke pembayaran.');
             return;
         }
-    
-        navigate('/bayar-belanja', { state: { cartItems } }); // Pass the updated cartItems
+
+        try {
+            const items = await syncCart();
+            navigate('/bayar-belanja', { state: { cartItems: items } }); // Pass the synced cartItems
+        } catch (error) {
+            console.error('Error updating cart:', error);
+            alert('Gagal memperbarui keranjang. Silakan coba lagi.');
+        }
     };
 
     return (
@@ -170,8 +205,8 @@ const EcommerceCartPage = () => {
                                             <div className="justify-left">
                                                 <h3 className="text-sm font-semibold">{item.product.title}</h3>
                                                 <p className="text-gray-600 text-xs">stok{' '} {item.product.stock > 0 ? item.product.stock : 'habis'}</p>
-                                                <p className="text-gray-600 text-xs">Rp. {formatIDR(item.product.price)} / {item.product.unit}</p>
-                                                <p className="text-xs text-gray-600">Total Rp. {formatIDR(item.product.price * quantities[item.product.id])}</p>
+                                                <p className="text-gray-600 text-xs">Rp. {formatIDR(item.unit_price)} / {item.product.unit}</p>
+                                                <p className="text-xs text-gray-600">Total Rp. {formatIDR(item.unit_price * quantities[item.product.id])}</p>
                                             </div>    
                                         </span>
                                         <div className="flex flex-col items-center">
@@ -203,6 +238,15 @@ const EcommerceCartPage = () => {
                                 </li>
                             ))}
                         </ul>
+                        {summary && (
+                            <div className="mt-4 p-4 border rounded-lg shadow-sm text-sm">
+                                <p className="flex justify-between"><span>Subtotal</span><span>Rp. {formatIDR(summary.subtotal)}</span></p>
+                                {Number(summary.discount) > 0 && (
+                                    <p className="flex justify-between text-green-700"><span>Diskon</span><span>- Rp. {formatIDR(summary.discount)}</span></p>
+                                )}
+                                <p className="flex justify-between font-semibold"><span>Total</span><span>Rp. {formatIDR(summary.grand_total)}</span></p>
+                            </div>
+                        )}
                         <button
                             onClick={handleCheckout}
                             className="w-full bg-green-600 hover:bg-green-700 text-white py-3 rounded-lg font-medium mt-4"
@@ -180,7 +180,7 @@ const EcommerceCheckoutPage = () => {
       return;
     }
 
-    const totalAmount = cartItems.reduce((total, item) => total + (item.product.price * item.quantity), 0);
+    const totalAmount = cartItems.reduce((total, item) => total + (item.unit_price * item.quantity), 0);
 
     // Generate a random checkout number with 'CHK' prefix and user ID
     const user = JSON.parse(localStorage.getItem('user'));
@@ -284,8 +284,8 @@ const EcommerceCheckoutPage = () => {
                     <div className="justify-left">
                       <h3 className="text-sm font-semibold">{item.product.title}</h3>
                       <p className="text-xs text-gray-600">Jumlah Barang: {item.quantity}</p>
-                      <p className="text-xs text-gray-600">Harga satuan: Rp. {formatIDR(item.product.price)}</p>
-                      <p className="text-xs text-gray-600">Total: Rp. {formatIDR(item.product.price * item.quantity)}</p>
+                      <p className="text-xs text-gray-600">Harga satuan: Rp. {formatIDR(item.unit_price)}</p>
+                      <p className="text-xs text-gray-600">Total: Rp. {formatIDR(item.unit_price * item.quantity)}</p>
                     </div>
                   </span>
                 </div>
@@ -297,7 +297,7 @@ const EcommerceCheckoutPage = () => {
         {/* Total Price */}
         <h3 className="font-semibold">Total Biaya yang harus dibayar</h3>
         <div className="bg-white border border-transparent hover:bg-green-50/50 p-4 rounded-lg shadow-sm mb-6">
-          <p className="text-lg font-semibold">Rp. {formatIDR(cartItems.reduce((total, item) => total + (item.product.price * item.quantity), 0))}</p>
+          <p className="text-lg font-semibold">Rp. {formatIDR(cartItems.reduce((total, item) => total + (item.unit_price * item.quantity), 0))}</p>
         </div>
 
         {/* Payment Method */}
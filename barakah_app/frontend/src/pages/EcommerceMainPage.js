@@ -28,6 +28,7 @@ const EcommerceMainPage = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [nextPage, setNextPage] = useState(null);
   const [searchTimeout, setSearchTimeout] = useState(null);
   const [activeSlide, setActiveSlide] = useState(0);
   const sliderInterval = useRef(null);
@@ -41,7 +42,7 @@ const EcommerceMainPage = () => {
           `${process.env.REACT_APP_API_BASE_URL}/api/products/`, 
           { params: { is_featured: true } } // Fetch only featured products
         );
-        setfeaturedProducts(response.data.slice(0, 3)); // Take the first 3 featured products
+        setfeaturedProducts(response.data.results.slice(0, 3)); // Take the first 3 featured products
       } catch (err) {
         console.error('Error fetching featured products:', err);
         setError('Failed to load featured products');
@@ -59,7 +60,8 @@ const EcommerceMainPage = () => {
         `${process.env.REACT_APP_API_BASE_URL}/api/products/`, 
         { params: { search } }
       );
-      setProducts(response.data); // Set regular products (search results)
+      setProducts(response.data.results); // Listings and search results come one page at a time
+      setNextPage(response.data.next);
     } catch (err) {
       console.error('Error fetching products:', err);
       setError('Failed to load products');
@@ -68,6 +70,18 @@ const EcommerceMainPage = () => {
     }
   };
 
+  // Append the next page of the current listing or search
+  const loadMoreProducts = async () => {
+    try {
+      const response = await axios.get(nextPage);
+      setProducts((previous) => [...previous, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (err) {
+      console.error('Error fetching products:', err);
+      setError('Failed to load products');
+    }
+  };
+
   const handleSearch = (query) => {
     setSearchQuery(query);
 
@@ -323,6 +337,15 @@ const EcommerceMainPage = () => {
             })}
           </div>
         )}
+
+        {nextPage && !loading && (
+          <button
+            onClick={loadMoreProducts}
+            className="w-full bg-green-600 hover:bg-green-700 text-white py-2 rounded-md text-sm mt-4"
+          >
+            Muat Lebih Banyak
+          </button>
+        )}
   
         {error && (
           <div className="text-center py-4 text-red-500">
@@ -25,12 +25,14 @@ const formatDate = (dates) => {
 const EcommerceOrderHistoryPage = () => {
     const navigate = useNavigate();
     const [orders, setOrders] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
 
     useEffect(() => {
         fetchOrders();
     }, []);
 
-    const fetchOrders = async () => {
+    // Without a url this loads the first page; with the "next" cursor url it appends the following one
+    const fetchOrders = async (url = null) => {
         try {
             // Retrieve the user object from Local Storage
             const user = JSON.parse(localStorage.getItem('user'));
@@ -46,7 +48,7 @@ const EcommerceOrderHistoryPage = () => {
             console.log('User token:', user.access);
     
             // Make the API request with the token in the headers
-            const response = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/orders/`, {
+            const response = await axios.get(url || `${process.env.REACT_APP_API_BASE_URL}/api/orders/`, {
                 headers: {
                     Authorization: `Bearer ${user.access}`,  // Use "Bearer" for JWT tokens
                 },
@@ -55,8 +57,9 @@ const EcommerceOrderHistoryPage = () => {
             // Log the response for debugging
             console.log('Order items fetched:', response.data);
     
-            // Update the state with the fetched wishlist items
-            setOrders(response.data);
+            // Update the state with the fetched page of orders
+            setOrders((previous) => (url ? [...previous, ...response.data.results] : response.data.results));
+            setNextPage(response.data.next);
         } catch (error) {
             console.error('Error fetching order items:', error);
     
@@ -132,6 +135,14 @@ const EcommerceOrderHistoryPage = () => {
                     ))}
                     </ul>
                 )}
+            {nextPage && (
+                <button
+                    onClick={() => fetchOrders(nextPage)}
+                    className="w-full bg-green-600 hover:bg-green-700 text-white py-2 rounded-md text-sm mt-4"
+                >
+                    Muat Lebih Banyak
+                </button>
+            )}
             </div>
         <NavigationButton />
         </div>
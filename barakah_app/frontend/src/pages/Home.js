@@ -63,40 +63,25 @@ const Home = () => {
   const navigate = useNavigate();
      
   useEffect(() => {
-    const fetchFeaturedProducts = async () => {
+    // One request for everything on the home page (featured + top lists)
+    const fetchHome = async () => {
       try {
-        const response = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/products`);
-        const featuredProducts = response.data.filter(product => product.is_featured === true);
-        setfeaturedProducts(featuredProducts.slice(0, 4));
+        setLoading(true);
+        const response = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/home/`);
+        setFeaturedCampaigns(response.data.featured_campaigns);
+        setCampaigns(response.data.campaigns);
+        setfeaturedProducts(response.data.featured_products);
+        setProducts(response.data.products);
+        setFeaturedCourses(response.data.featured_courses);
+        setCourses(response.data.courses);
       } catch (err) {
-        console.error('Error fetching featured products:', err);
-        setError('Failed to load featured products');
+        console.error('Error fetching home page data:', err);
+        setError('Failed to load home page data');
+      } finally {
+        setLoading(false);
       }
     };
-    fetchFeaturedProducts();
-
-    const fetchFeaturedCampaigns = async () => {
-      try {
-        const response = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/campaigns`);
-        const featuredCampaigns = response.data.filter(campaign => campaign.is_featured === true);
-        setFeaturedCampaigns(featuredCampaigns.slice(0, 4));
-      } catch (error) {
-        console.error('Error fetching campaigns:', error);
-      }
-    };  
-    fetchFeaturedCampaigns();
-    
-    const fetchFeaturedCourses = async () => {
-      try {
-        const response = await axios.get(`${process.env.REACT_APP_API_BASE_URL}/api/courses`);
-        const featuredCourses = response.data.filter(course => course.is_featured === true);
-        setFeaturedCourses(featuredCourses.slice(0, 4));
-      } catch (err) {
-        console.error('Error fetching featured courses:', err);
-        setError('Failed to load featured courses');
-      }
-    };
-    fetchFeaturedCourses();
+    fetchHome();
   }, []);
 
    // Fetch regular products (based on search query)
@@ -107,7 +92,7 @@ const Home = () => {
         `${process.env.REACT_APP_API_BASE_URL}/api/products/`, 
         { params: { search } }
       );
-      setProducts(response.data); // Set regular products (search results)
+      setProducts(response.data.results); // First page of the search results
     } catch (err) {
       console.error('Error fetching products:', err);
       setError('Failed to load products');
@@ -124,7 +109,7 @@ const Home = () => {
         `${process.env.REACT_APP_API_BASE_URL}/api/campaigns/`, 
         { params: { search } }
       );
-      setCampaigns(response.data); // Set regular campaigns (search results)
+      setCampaigns(response.data.results); // First page of the search results
     } catch (err) {
       console.error('Error fetching campaigns:', err);
       setError('Failed to load campaigns');
@@ -167,10 +152,6 @@ const Home = () => {
   };
 
   useEffect(() => {
-    fetchCampaigns();
-    fetchProducts();
-    fetchCourses();
-    
     // Clean up function
     return () => {
       if (sliderInterval.current) {
@@ -14,7 +14,9 @@ const PaymentPendingPage = () => {
   // Fungsi untuk memeriksa status pembayaran
   const checkPaymentStatus = async () => {
     try {
-      const response = await fetch(`https://your-backend-url/api/check-payment-status?order_id=${orderId}`);
+      const response = await fetch(
+        `${process.env.REACT_APP_API_BASE_URL}/api/payments/check-donation-payment-status/?order_id=${orderId}`
+      );
       const data = await response.json();
       setPaymentStatus(data.status);
 